@@ -0,0 +1,144 @@
+"""The benchmark cases.
+
+Each case is a function that takes the size of the model and returns a
+function that runs the benchmark. Creating the model is not measured. The
+runner calls the case again for each run, so values that cadlib caches (e.g.
+transform matrices) are not carried over from one run to the next.
+"""
+
+import os
+
+from cadlib.csg import Union
+from cadlib.object.primitives import Cuboid, Frustum, Sphere
+from cadlib.scad import ScadFile
+from cadlib.transform.chained import Chained
+from cadlib.transform.generators import rotate, scale
+from cadlib.transform.primitives import RotateXyz, ScaleAxes, Translate
+from cadlib.util import Vector, X, Z
+from cadlib.util import matrix
+
+
+# The number of parts in each group of the synthetic model
+_group_size = 100
+
+
+def _part(index):
+    """A transformed primitive."""
+    primitive = [Sphere(1), Cuboid(1, 2, 3), Frustum([0, 0, 0], [0, 0, 2], 1, 0.5)][index % 3]
+    return primitive.rotate(xyz = [index % 90, 0, 45]).up(index % 7).right(index)
+
+def model(size):
+    """A synthetic model with size parts (transformed primitives), in groups
+    of 100, from each of which a cuboid is subtracted.
+
+    The Object tree has about 3 nodes per part (a primitive and 2 transforms).
+    """
+    return Union([Union([_part(index) for index in range(start, min(start + _group_size, size))])
+                  - Cuboid(10, 10, 10).right(start)
+                  for start in range(0, size, _group_size)])
+
+
+###########
+## Cases ##
+###########
+
+def vector_arithmetic(size):
+    vectors = [Vector(index, 2 * index, 3) for index in range(size)]
+
+    def run():
+        total = Vector(0, 0, 0)
+        for vector in vectors:
+            total = total + 2 * vector - vector.cross(X) / 2
+            total.dot(vector)
+        return total
+    return run
+
+def matrix_arithmetic(size):
+    transforms = [Translate([index, 1, 2]) * RotateXyz(index % 90, 30, 0) for index in range(16)]
+    matrices = [transform.to_matrix() for transform in transforms]
+    vector = Vector(1, 2, 3)
+
+    def run():
+        product = matrix.identity(4)
+        for index in range(size):
+            product = product * matrices[index % len(matrices)]
+            product.homogeneous_mul(vector)
+        return product
+    return run
+
+def chained_to_matrix(size):
+    transforms = [[Translate([index, 0, 0]), RotateXyz(0, 0, index % 360), ScaleAxes(1, 2, 1)][index % 3]
+                  for index in range(size)]
+    chained = Chained(transforms)
+
+    def run():
+        return chained.to_matrix()
+    return run
+
+def transform_generators(size):
+    def run():
+        for index in range(size // 5):
+            rotate(Z, index % 360)
+            rotate(frm = X, to = [1, index % 7 + 1, 1])
+            rotate(xyz = [index % 90, 10, 0])
+            scale(index % 3 + 1)
+            scale(xyz = [1, index % 3 + 1, 1])
+    return run
+
+def object_to_scad(size):
+    part = model(size)
+
+    def run():
+        return part.to_scad()
+    return run
+
+def scad_to_code(size):
+    scad = model(size).to_scad()
+
+    def run():
+        return scad.to_code()
+    return run
+
+def scad_file_write(size):
+    # Write to the null device, so the result doesn't depend on the disk
+    scad_file = ScadFile(model(size))
+
+    def run():
+        scad_file.write(os.devnull)
+    return run
+
+def sphere_batch_write(size):
+    # Like scad_file_write, but with the spheres in a single batch. Requires
+    # NumPy.
+    import numpy
+    from cadlib.object import SphereBatch
+
+    index = numpy.arange(size)
+    batch = SphereBatch(numpy.column_stack([index, index % 7, numpy.zeros(size)]), 1 + index % 3)
+    scad_file = ScadFile(batch)
+
+    def run():
+        scad_file.write(os.devnull)
+
+    return run
+
+def node_format(size):
+    tree = model(size).to_tree()
+
+    def run():
+        return tree.format()
+    return run
+
+
+# The cases by name, in the order in which they are run
+cases = {
+    "vector_arithmetic":    vector_arithmetic,
+    "matrix_arithmetic":    matrix_arithmetic,
+    "chained_to_matrix":    chained_to_matrix,
+    "transform_generators": transform_generators,
+    "object_to_scad":       object_to_scad,
+    "scad_to_code":         scad_to_code,
+    "scad_file_write":      scad_file_write,
+    "sphere_batch_write":   sphere_batch_write,
+    "node_format":          node_format,
+}
@@ -0,0 +1,173 @@
+"""Run the benchmarks and optionally compare them to a baseline.
+
+Usage (from the repository root):
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --baseline results.json --threshold 0.2
+
+Each case (see benchmarks.cases) is run for each size. The time is the
+minimum of several runs; the peak memory is measured with tracemalloc in a
+separate run, since tracing slows down the code. The results are written as
+JSON. If a baseline (the JSON output of an earlier run) is given, the results
+are compared to it, and the exit status is 1 if the time or peak memory of any
+case has increased by more than the threshold (a fraction of the baseline).
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from cadlib.util import matrix
+from cadlib.util.table import Table
+from benchmarks.cases import cases
+
+# 1M parts is not included by default: the SCAD cases need more than 5 GB of
+# memory at that size. Pass --sizes 1000000 to run it.
+default_sizes = [1000, 10000, 100000]
+
+
+def measure_time(case, size, repeat):
+    """Return the minimum time of repeat runs of the case, in seconds."""
+    times = []
+    for _ in range(repeat):
+        run = case(size)
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return min(times)
+
+def measure_memory(case, size):
+    """Return the peak memory allocated during a run of the case, in bytes."""
+    run = case(size)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def run_benchmarks(names, sizes, repeat, memory = True, log = None):
+    """Run the cases with the given names for all sizes and return the
+    results, as a list of dicts."""
+    results = []
+    for name in names:
+        for size in sizes:
+            result = {"case": name, "size": size, "time": measure_time(cases[name], size, repeat)}
+            if memory:
+                result["peak_memory"] = measure_memory(cases[name], size)
+            results.append(result)
+
+            if log is not None:
+                print(f"{name} ({size}): {result['time']:.4f} s", file = log)
+
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Compare the results to the baseline results.
+
+    Return a list of rows (case, size, quantity, baseline value, value, ratio,
+    regression) for all values that are present in both. A value is a
+    regression if it exceeds the baseline value by more than threshold (a
+    fraction of the baseline value).
+    """
+    baseline_values = {(result["case"], result["size"]): result for result in baseline}
+
+    rows = []
+    for result in results:
+        base = baseline_values.get((result["case"], result["size"]))
+        if base is None:
+            continue
+
+        for quantity in ["time", "peak_memory"]:
+            if quantity in result and quantity in base:
+                ratio = result[quantity] / base[quantity] if base[quantity] else 1
+                rows.append((result["case"], result["size"], quantity, base[quantity], result[quantity],
+                             ratio, ratio > 1 + threshold))
+    return rows
+
+def missing_cases(results, baseline):
+    """Return the (case, size) pairs of the results that are not in the
+    baseline, and are therefore not compared."""
+    baseline_keys = {(result["case"], result["size"]) for result in baseline}
+    return [(result["case"], result["size"]) for result in results
+            if (result["case"], result["size"]) not in baseline_keys]
+
+def format_comparison(rows):
+    def format_value(quantity, value):
+        if quantity == "time":
+            return f"{value:.4f} s"
+        else:
+            return f"{value / 1024:.1f} KiB"
+
+    table = [["Case", "Size", "Quantity", "Baseline", "Current", "Ratio", ""]]
+    for case, size, quantity, base, value, ratio, regression in rows:
+        table.append([case, size, quantity, format_value(quantity, base), format_value(quantity, value),
+                      f"{ratio:.2f}", "REGRESSION" if regression else ""])
+    return Table(table).format(column_sep = "  ")
+
+
+def main(arguments = None):
+    parser = argparse.ArgumentParser(description = "Run the cadlib benchmarks.")
+    parser.add_argument("--cases", nargs = "+", choices = list(cases), default = list(cases),
+                        help = "the cases to run (default: all)")
+    parser.add_argument("--sizes", nargs = "+", type = int, default = default_sizes,
+                        help = "the model sizes (default: %(default)s)")
+    parser.add_argument("--repeat", type = int, default = 5,
+                        help = "the number of timed runs per case and size (default: %(default)s)")
+    parser.add_argument("--backend", choices = ["python", "numpy"], default = "python",
+                        help = "the matrix backend (default: %(default)s)")
+    parser.add_argument("--no-memory", dest = "memory", action = "store_false",
+                        help = "don't measure the peak memory")
+    parser.add_argument("--output", help = "write the results to this JSON file")
+    parser.add_argument("--baseline", help = "compare the results to this JSON file")
+    parser.add_argument("--threshold", type = float, default = 0.2,
+                        help = "the allowed increase relative to the baseline (default: %(default)s)")
+    arguments = parser.parse_args(arguments)
+
+    if arguments.repeat < 1:
+        parser.error("repeat must be at least 1")
+
+    matrix.set_backend(arguments.backend)
+    results = run_benchmarks(arguments.cases, arguments.sizes, arguments.repeat, arguments.memory,
+                             log = sys.stderr)
+
+    output = {
+        "python":  platform.python_version(),
+        "backend": arguments.backend,
+        "results": results,
+    }
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(output, file, indent = 2)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            baseline = json.load(file)
+
+        rows = compare(results, baseline["results"], arguments.threshold)
+        print(format_comparison(rows))
+        for case, size in missing_cases(results, baseline["results"]):
+            print(f"Not in the baseline: {case} ({size})")
+        if any(row[-1] for row in rows):
+            return 1
+    elif not arguments.output:
+        json.dump(output, sys.stdout, indent = 2)
+        print()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,3 @@
 infinity = 100
+
+from cadlib.util.profile import profile
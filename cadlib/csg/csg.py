@@ -1,19 +1,68 @@
-from cadlib.util.tree import Node
+from cadlib.util.shared_sequence import SharedSequence
 from cadlib.object import Object
 
 
 class Csg(Object):
+    """A CSG operation on a list of children.
+
+    Children can be added at either end (e.g. by adding an object to a union)
+    in amortized constant time: the children are stored in two
+    SharedSequences, one for the children prepended to the list (in reverse
+    order) and one for the rest (see cadlib.transform.chained.Chained).
+    """
+
+    # The bounding volume hierarchy of the children, calculated when first
+    # requested
+    _bvh = None
+
+    # The list of children, created from the sequence when first requested
+    _children_list = None
+
     def __init__(self, children):
+        """children can be any iterable of objects, including a generator."""
         super().__init__()
 
-        children = list(children)
+        children = SharedSequence(children)
 
         # Check parameters
         for child in children:
             if not isinstance(child, Object):
                 raise TypeError("Children of Csg must be objects, {} found.".format(type(child)))
 
-        self._children = children
+        self._front = SharedSequence() # Reversed
+        self._back = children
+
+    @classmethod
+    def _from_shared(cls, front, back):
+        """Create an object from the sequences of children, without copying
+        or checking them. Callers must make sure that the children are
+        objects."""
+        result = cls.__new__(cls)
+        Object.__init__(result)
+        result._front = front
+        result._back = back
+        return result
+
+    def _extended(self, children):
+        """Create an object of the same type with children appended, in
+        amortized constant time per child. Callers must make sure that the
+        children are objects."""
+        return self._from_shared(self._front, self._back.extended(children))
+
+    def _prepended(self, children):
+        """Create an object of the same type with children inserted at the
+        beginning, in amortized constant time per child. Callers must make
+        sure that the children are objects."""
+        return self._from_shared(self._front.extended(reversed(children)), self._back)
+
+    @property
+    def _children(self):
+        if self._children_list is None:
+            self._children_list = self._front.to_list()[::-1] + self._back.to_list()
+        return self._children_list
+
+    def _key(self):
+        return tuple(self._children)
 
     @classmethod
     def empty(cls):
@@ -23,5 +72,59 @@ class Csg(Object):
     def children(self):
         return self._children
 
-    def to_tree(self):
-        return Node(self, [child.to_tree() for child in self._children])
+    @property
+    def bvh(self):
+        """A bounding volume hierarchy (a cadlib.util.bvh.Bvh) over the bounds
+        of the children, for spatial queries. The queries return indices into
+        children.
+
+        The hierarchy is built on the first access and cached.
+        """
+        if self._bvh is None:
+            from cadlib.util.bvh import Bvh
+            self._bvh = Bvh(child.bounds for child in self._children)
+        return self._bvh
+
+    def _with_children(self, children):
+        """Return self if children are the same objects as the children of
+        self, or a new object of the same type otherwise."""
+        if len(children) == len(self._children) and all(a is b for a, b in zip(children, self._children)):
+            return self
+        return type(self)(children)
+
+    def _pruned(self, children):
+        return self._with_children(children)
+
+    def _simplified(self, children):
+        children = self._flattened(children)
+
+        if len(children) == 1:
+            return children[0]
+        else:
+            return self._with_children(children)
+
+    def _flattened(self, children):
+        """Replace children of the same type with their children.
+
+        This is valid for associative operations. Implementations for other
+        operations must override this method.
+        """
+        result = []
+        for child in children:
+            if type(child) is type(self):
+                result.extend(child._children)
+            else:
+                result.append(child)
+        return result
+
+    def _operands(self):
+        return self._children
+
+    def to_scad(self):
+        return self._to_scad_from_operands()
+
+    def _tree_children(self):
+        return self._children
+
+    def _collapsed(self, children, tolerance):
+        return self._with_children(children)
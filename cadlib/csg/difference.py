@@ -1,13 +1,10 @@
 from cadlib.csg import Csg
 from cadlib.object import Object
 from cadlib.scad import ScadObject
+from cadlib.util import Bounds
 
 
 class Difference(Csg):
-    def __eq__(self, other):
-        return (isinstance(other, Difference)
-            and other._children == self._children)
-
     def __str__(self):
         return "Difference"
 
@@ -17,11 +14,71 @@ class Difference(Csg):
             return Difference([self, other])
         elif isinstance(other, Object):
             # Difference - Object - append to difference
-            return Difference(self._children + [other])
+            return self._extended([other])
         else:
             # Difference - other - defer to superclass
             return super().__sub__(other)
 
-    def to_scad(self):
-        children = [child.to_scad() for child in self._children]
+    def _flattened(self, children):
+        # (a - b) - c is a - b - c, but a - (b - c) is not
+        if len(children) > 0 and isinstance(children[0], Difference):
+            if len(children[0]._children) == 0:
+                # The minuend is empty, so the result is empty
+                return []
+            return children[0]._children + children[1:]
+        return children
+
+    def _pruned(self, children):
+        from cadlib.csg import Union
+        from cadlib.util.bvh import Bvh
+
+        if len(children) == 0:
+            return self
+
+        minuend, cutters = children[0], children[1:]
+        if minuend.bounds.is_empty:
+            return Union.empty()
+
+        # Only cutters that intersect the minuend
+        bvh = Bvh(cutter.bounds for cutter in cutters)
+        cutters = [cutters[index] for index in bvh.query_box(minuend.bounds)]
+        if len(cutters) == 0:
+            return minuend
+
+        # Distribute over the parts of a union:
+        #     (a + b) - c - d = (a - c) + (b - d)
+        # if c doesn't intersect b and d doesn't intersect a. Only do this if
+        # it actually removes cutters from some part.
+        if isinstance(minuend, Union):
+            bvh = Bvh(cutter.bounds for cutter in cutters)
+            parts = []
+            grouped = False
+            for part in minuend.children:
+                part_cutters = [cutters[index] for index in bvh.query_box(part.bounds)]
+                if len(part_cutters) < len(cutters):
+                    grouped = True
+                parts.append(Difference([part] + part_cutters) if part_cutters else part)
+
+            if grouped:
+                return Union(parts)
+
+        return self._with_children([minuend] + cutters)
+
+    def _calculate_bounds(self):
+        # Conservative: the subtracted objects can only make the result smaller
+        if len(self._children) == 0:
+            return Bounds.empty()
+        return self._children[0].bounds
+
+    def _sdf(self, points):
+        import numpy
+        if len(self._children) == 0:
+            return numpy.full(len(points), numpy.inf)
+
+        result = self._children[0]._sdf(points)
+        for child in self._children[1:]:
+            result = numpy.maximum(result, -child._sdf(points))
+        return result
+
+    def _combine_scad(self, children):
         return ScadObject("difference", None, None, children)
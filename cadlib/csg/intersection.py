@@ -1,23 +1,20 @@
 from cadlib.csg import Csg
 from cadlib.object import Object
 from cadlib.scad import ScadObject
+from cadlib.util import Bounds
 
 
 class Intersection(Csg):
-    def __eq__(self, other):
-        return (isinstance(other, Intersection)
-            and other._children == self._children)
-
     def __str__(self):
         return "Intersection"
 
     def __mul__(self, other):
         if isinstance(other, Intersection):
             # Intersection * Intersection - merge intersections
-            return Intersection(self._children + other._children)
+            return self._extended(other._children)
         elif isinstance(other, Object):
             # Intersection * Object - append to intersection
-            return Intersection(self._children + [other])
+            return self._extended([other])
         else:
             # Intersection * other - defer to superclass
             return super().__mul__(other)
@@ -28,11 +25,44 @@ class Intersection(Csg):
         if isinstance(other, Object):
             # Object * Intersection (deferred from Object.__mul__) - prepend to
             # intersection
-            return Intersection([other] + self._children)
+            return self._prepended([other])
         else:
             # Other * Intersection - unknown (no __rmul__ in superclass)
             return NotImplemented
 
-    def to_scad(self):
-        children = [child.to_scad() for child in self._children]
+    def _calculate_bounds(self):
+        if len(self._children) == 0:
+            return Bounds.empty()
+
+        bounds = self._children[0].bounds
+        for child in self._children[1:]:
+            bounds = bounds.intersection(child.bounds)
+        return bounds
+
+    def _sdf(self, points):
+        import numpy
+        if len(self._children) == 0:
+            return numpy.full(len(points), numpy.inf)
+
+        result = self._children[0]._sdf(points)
+        for child in self._children[1:]:
+            result = numpy.maximum(result, child._sdf(points))
+        return result
+
+    def _flattened(self, children):
+        # An empty intersection is empty (not the identity), so the result is
+        # empty
+        if any(isinstance(child, Intersection) and len(child._children) == 0 for child in children):
+            return []
+        return super()._flattened(children)
+
+    def _pruned(self, children):
+        from cadlib.csg import Union
+
+        result = self._with_children(children)
+        if len(self._children) > 0 and result.bounds.is_empty:
+            return Union.empty()
+        return result
+
+    def _combine_scad(self, children):
         return ScadObject("intersection", None, None, children)
@@ -1,23 +1,20 @@
 from cadlib.csg import Csg
 from cadlib.object import Object
 from cadlib.scad import ScadObject
+from cadlib.util import Bounds
 
 
 class Union(Csg):
-    def __eq__(self, other):
-        return (isinstance(other, Union)
-            and other._children == self._children)
-
     def __str__(self):
         return "Union"
 
     def __add__(self, other):
         if isinstance(other, Union):
             # Union + Union - merge unions
-            return Union(self._children + other._children)
+            return self._extended(other._children)
         elif isinstance(other, Object):
             # Union + Object - append to union
-            return Union(self._children + [other])
+            return self._extended([other])
         else:
             # Union + other - defer to superclass
             return super().__add__(other)
@@ -26,12 +23,44 @@ class Union(Csg):
         # other cannot be a Union: Union + Union calls Union.__add__.
         if isinstance(other, Object):
             # Object + Union (deferred from Object.__add__) - prepend to union
-            return Union([other] + self._children)
+            return self._prepended([other])
         else:
             # Other + Union - unknown (no __radd__ in superclass)
             return NotImplemented
             # return super().__radd__(other)
 
-    def to_scad(self):
-        children = [child.to_scad() for child in self._children]
+    def _pruned(self, children):
+        # Children with empty bounds do not contribute
+        return self._with_children([child for child in children if not child.bounds.is_empty])
+
+    def _combine_scad(self, children):
         return ScadObject("union", None, None, children)
+
+    def _calculate_bounds(self):
+        bounds = Bounds.empty()
+        for child in self._children:
+            bounds = bounds.union(child.bounds)
+        return bounds
+
+    def _sdf(self, points):
+        import numpy
+        result = numpy.full(len(points), numpy.inf)
+        for child in self._children:
+            result = numpy.minimum(result, child._sdf(points))
+        return result
+
+    def to_mesh(self, fn = None):
+        """Create a mesh that contains the meshes of all children.
+
+        The meshes are not merged: the result is a valid mesh of the union only
+        if the children do not intersect.
+        """
+        from cadlib.mesh import Mesh
+        return Mesh.concatenate(self.meshes(fn))
+
+    def meshes(self, fn = None):
+        for child in self._children:
+            yield from child.meshes(fn)
+
+    def _mesh_operands(self):
+        return self._children
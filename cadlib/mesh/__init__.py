@@ -0,0 +1,3 @@
+from .mesh import Mesh
+from .export import write_stl, write_obj
+from .implicit import mesh_sdf
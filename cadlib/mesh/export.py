@@ -0,0 +1,129 @@
+import shutil
+import struct
+import tempfile
+
+import numpy
+
+from cadlib.mesh.mesh import triangle_normals
+from cadlib.util.files import replacing
+
+# The number of triangles that are buffered before they are written
+default_chunk_size = 65536
+
+# The record of a triangle in a binary STL file (50 bytes)
+_stl_triangle = numpy.dtype([
+    ("normal"   , "<f4", (3, )),
+    ("vertices" , "<f4", (3, 3)),
+    ("attribute", "<u2"),
+])
+
+_stl_header_size = 80
+
+
+def write_stl(meshes, file_name, chunk_size = default_chunk_size, header = "Generated by cadlib"):
+    """Write meshes to a binary STL file.
+
+    meshes is an iterable of Mesh (e.g. the result of Object.meshes), which is
+    consumed lazily. The triangles are written in chunks of chunk_size
+    triangles through a single preallocated buffer, so the memory use does not
+    depend on the number of meshes.
+
+    The file is only replaced if all meshes are written successfully (see
+    cadlib.util.files.replacing). If the file is not seekable (e.g. a named
+    pipe), the triangles are written to a temporary file first, because the
+    triangle count precedes them.
+
+    Returns the number of triangles written.
+    """
+    header = header.encode("ascii")
+    if len(header) > _stl_header_size:
+        raise ValueError(f"STL header must be at most {_stl_header_size} bytes long")
+
+    with replacing(file_name, "wb") as file:
+        if file.seekable():
+            # The triangle count is not known yet; it is written at the end
+            file.write(header.ljust(_stl_header_size, b"\0"))
+            file.write(struct.pack("<I", 0))
+            count = _write_stl_triangles(meshes, file, chunk_size)
+            file.seek(_stl_header_size)
+            file.write(struct.pack("<I", count))
+        else:
+            # We can't seek back to the triangle count (e.g. in a pipe), so
+            # write the triangles to a temporary file first
+            with tempfile.TemporaryFile() as triangles:
+                count = _write_stl_triangles(meshes, triangles, chunk_size)
+                file.write(header.ljust(_stl_header_size, b"\0"))
+                file.write(struct.pack("<I", count))
+                triangles.seek(0)
+                shutil.copyfileobj(triangles, file)
+
+    return count
+
+
+def _write_stl_triangles(meshes, file, chunk_size):
+    """Write the triangle records of meshes to a file and return the number of
+    triangles."""
+    buffer = numpy.zeros(chunk_size, dtype = _stl_triangle)
+    used = 0
+    count = 0
+
+    for mesh in meshes:
+        vertices = mesh.vertices
+        faces = mesh.faces
+
+        # Copy the triangles to the buffer, flushing it whenever it is full
+        start = 0
+        while start < len(faces):
+            end = min(start + chunk_size - used, len(faces))
+            triangles = vertices[faces[start:end]]
+
+            buffer["vertices"][used:used + end - start] = triangles
+            buffer["normal"  ][used:used + end - start] = triangle_normals(triangles)
+            used += end - start
+            start = end
+
+            if used == chunk_size:
+                file.write(buffer.tobytes())
+                count += used
+                used = 0
+
+    file.write(buffer[:used].tobytes())
+    count += used
+
+    if count >= 2 ** 32:
+        raise ValueError(f"Too many triangles for an STL file: {count}")
+
+    return count
+
+
+def write_obj(meshes, file_name, chunk_size = default_chunk_size):
+    """Write meshes to a Wavefront OBJ file.
+
+    meshes is an iterable of Mesh (e.g. the result of Object.meshes), which is
+    consumed lazily. Each mesh is written as a separate object, and the
+    vertices and faces are formatted in chunks of chunk_size lines, so the
+    memory use does not depend on the number of meshes.
+
+    The file is only replaced if all meshes are written successfully.
+
+    Returns the number of triangles written.
+    """
+    vertex_offset = 0
+    count = 0
+
+    with replacing(file_name, "w", encoding = "utf-8") as file:
+        file.write("# Generated by cadlib\n")
+
+        for index, mesh in enumerate(meshes):
+            file.write(f"o part_{index + 1}\n")
+
+            # OBJ vertex indices are 1-based and global for the file
+            for start in range(0, mesh.vertex_count, chunk_size):
+                numpy.savetxt(file, mesh.vertices[start:start + chunk_size], fmt = "v %.9g %.9g %.9g")
+            for start in range(0, mesh.face_count, chunk_size):
+                numpy.savetxt(file, mesh.faces[start:start + chunk_size] + (vertex_offset + 1), fmt = "f %d %d %d")
+
+            vertex_offset += mesh.vertex_count
+            count += mesh.face_count
+
+    return count
@@ -0,0 +1,205 @@
+import concurrent.futures
+import itertools
+import math
+
+import numpy
+
+from cadlib.mesh.mesh import Mesh
+from cadlib.mesh import sdf as distance
+
+# The number of points that are evaluated in one call of the distance function
+default_batch_size = 65536
+
+# The corners of a cube cell, indexed by bits (x: 1, y: 2, z: 4)
+_corner_offsets = numpy.array([[c & 1, (c >> 1) & 1, (c >> 2) & 1] for c in range(8)])
+
+# The Freudenthal decomposition of a cube into 6 tetrahedra along the diagonal
+# from corner 0 to corner 7. It is the same for all cells, so neighboring
+# cells have matching faces.
+_tetrahedra = numpy.array([[0, a, a | b, 7] for a, b, _ in itertools.permutations([1, 2, 4])])
+
+
+def _triangle_table():
+    """For each of the 16 combinations of inside vertices of a tetrahedron
+    (bit i set if vertex i is inside), the triangles of the surface, as
+    triples of edges. Each edge is a pair (inside vertex, outside vertex)."""
+    table = []
+    for case in range(16):
+        inside  = [v for v in range(4) if case & (1 << v)]
+        outside = [v for v in range(4) if not case & (1 << v)]
+
+        if len(inside) in [0, 4]:
+            triangles = []
+        elif len(inside) == 1:
+            triangles = [[(inside[0], v) for v in outside]]
+        elif len(outside) == 1:
+            triangles = [[(v, outside[0]) for v in inside]]
+        else:
+            # A quad, with the edges in cyclic order
+            (a, b), (c, d) = inside, outside
+            quad = [(a, c), (a, d), (b, d), (b, c)]
+            triangles = [[quad[0], quad[1], quad[2]], [quad[0], quad[2], quad[3]]]
+        table.append(triangles)
+    return table
+
+_triangles = _triangle_table()
+
+
+class _Evaluator:
+    """Evaluates a distance function in batches, optionally in a process
+    pool, clipped to a box."""
+    def __init__(self, function, minimum, maximum, executor, batch_size):
+        self._function = function
+        self._minimum = minimum
+        self._maximum = maximum
+        self._executor = executor
+        self._batch_size = batch_size
+
+    def __call__(self, points):
+        batches = [points[start:start + self._batch_size] for start in range(0, len(points), self._batch_size)]
+        if self._executor is None:
+            values = [self._function(batch) for batch in batches]
+        else:
+            values = list(self._executor.map(_evaluate_in_worker, batches))
+
+        values = numpy.concatenate(values) if values else numpy.zeros(0)
+
+        # Intersect with the box so the result is closed even if the surface
+        # extends beyond the box
+        return numpy.maximum(values, distance.box(points, self._minimum, self._maximum))
+
+
+# The distance function of a worker process, set by _initialize_worker
+_worker_function = None
+
+def _initialize_worker(function):
+    global _worker_function
+    _worker_function = function
+
+def _evaluate_in_worker(points):
+    return _worker_function(points)
+
+
+def mesh_sdf(function, bounds, edge_length, processes = None, batch_size = default_batch_size):
+    """Create a closed, consistently oriented triangle mesh of the surface of
+    a signed distance function.
+
+    function is called with (N, 3) arrays of points and must return the
+    signed distances (negative inside), or a lower bound of their magnitude
+    with the correct sign (e.g. Object.sdf). The surface is meshed inside the
+    (finite) Bounds; parts of the object outside the bounds are cut off.
+
+    An octree is refined adaptively from a single root cell down to cells
+    with a size of edge_length, only near the surface: cells whose distance
+    from the surface is larger than their size are discarded. The cells of
+    the finest level are meshed with marching tetrahedra, so the cost depends
+    on the surface area rather than on the volume.
+
+    If processes is given, the distance function is evaluated in batches of
+    batch_size points in a pool with that many processes. This requires the
+    function to be picklable.
+    """
+    if bounds.is_empty:
+        return Mesh.empty()
+    if not bounds.is_finite:
+        raise ValueError("Bounds must be finite")
+    if edge_length <= 0:
+        raise ValueError("Edge length must be positive")
+
+    minimum = numpy.array(bounds.minimum, dtype = numpy.float64)
+    maximum = numpy.array(bounds.maximum, dtype = numpy.float64)
+
+    # Add a margin to the octree so the surface does not touch its boundary
+    origin = minimum - edge_length
+    depth = max(0, math.ceil(math.log2((maximum - minimum).max() / edge_length + 2)))
+    if depth > 20:
+        raise ValueError("Edge length is too small for the bounds")
+
+    if processes is None:
+        executor = None
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor(processes,
+            initializer = _initialize_worker, initargs = (function, ))
+
+    try:
+        evaluate = _Evaluator(function, minimum, maximum, executor, batch_size)
+
+        cells = _refine(evaluate, origin, edge_length, depth)
+        return _march(evaluate, origin, edge_length, cells)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def _refine(evaluate, origin, edge_length, depth):
+    """Refine the octree and return the cells of the finest level near the
+    surface, as an (M, 3) array of integer cell coordinates."""
+    cells = numpy.zeros((1, 3), dtype = numpy.int64)
+
+    for level in range(depth + 1):
+        # The size of the cells at this level, in units of edge_length
+        size = 2 ** (depth - level)
+
+        # Discard cells that cannot contain the surface: the distance
+        # function is 1-Lipschitz, so it cannot change its sign within half
+        # of the diagonal from the center.
+        centers = origin + (cells + 0.5) * (size * edge_length)
+        keep = numpy.abs(evaluate(centers)) <= size * edge_length * math.sqrt(3) / 2 * (1 + 1e-9)
+        cells = cells[keep]
+
+        if level < depth:
+            cells = (2 * cells[:, numpy.newaxis, :] + _corner_offsets).reshape(-1, 3)
+
+    return cells
+
+
+def _march(evaluate, origin, edge_length, cells):
+    """Create the mesh of the cells with marching tetrahedra."""
+    if len(cells) == 0:
+        return Mesh.empty()
+
+    # Evaluate each corner only once; corners are identified by their integer
+    # coordinates
+    corners = (cells[:, numpy.newaxis, :] + _corner_offsets).reshape(-1, 3)
+    corners, corner_ids = numpy.unique(corners, axis = 0, return_inverse = True)
+    corner_ids = corner_ids.reshape(-1, 8)
+    positions = origin + corners * edge_length
+    values = evaluate(positions)
+
+    # The vertices of all tetrahedra, as corner indices, and their case
+    tetrahedra = corner_ids[:, _tetrahedra].reshape(-1, 4)
+    inside = values[tetrahedra] < 0
+    cases = (inside * numpy.array([1, 2, 4, 8])).sum(axis = 1)
+
+    # The edges (pairs of corner indices: inside, outside) of all triangles
+    edges = []
+    for case, triangles in enumerate(_triangles):
+        if triangles:
+            selected = tetrahedra[cases == case]
+            for triangle in triangles:
+                edges.append(numpy.stack([selected[:, [a, b]] for a, b in triangle], axis = 1))
+    if not edges:
+        return Mesh.empty()
+    edges = numpy.concatenate(edges) # (triangles, 3 edges, 2 corners)
+
+    # Create one vertex per edge, so adjacent triangles share vertices
+    edge_keys = edges.min(axis = 2) * len(corners) + edges.max(axis = 2)
+    edge_keys, edge_index, faces = numpy.unique(edge_keys.ravel(), return_index = True, return_inverse = True)
+    faces = faces.reshape(-1, 3)
+
+    inner = edges.reshape(-1, 2)[edge_index, 0]
+    outer = edges.reshape(-1, 2)[edge_index, 1]
+    t = values[inner] / (values[inner] - values[outer])
+    vertices = positions[inner] + t[:, numpy.newaxis] * (positions[outer] - positions[inner])
+
+    # Orient the triangles so the normals point outside, i.e. along the edges
+    # from the inside to the outside corner. The interpolated triangles may be
+    # degenerate, so use the triangles between the edge midpoints, which have
+    # the same orientation.
+    triangles = (positions[edges[:, :, 0]] + positions[edges[:, :, 1]]) / 2
+    normals = numpy.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    direction = positions[edges[:, 0, 1]] - positions[edges[:, 0, 0]]
+    flip = numpy.einsum("ij,ij->i", normals, direction) < 0
+    faces[flip] = faces[flip][:, ::-1]
+
+    return Mesh(vertices, faces)
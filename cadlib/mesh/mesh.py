@@ -0,0 +1,141 @@
+import numpy
+
+from cadlib.util.bounds import Bounds
+
+
+def triangle_normals(triangles):
+    """Calculate the unit normals of an (M, 3, 3) array of triangles.
+
+    Degenerate triangles have a zero normal.
+    """
+    normals = numpy.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    lengths = numpy.linalg.norm(normals, axis = 1)
+    nonzero = lengths > 0
+    normals[nonzero] /= lengths[nonzero, numpy.newaxis]
+    return normals
+
+
+class Mesh:
+    """An immutable indexed triangle mesh.
+
+    The vertices are stored in an (N, 3) float64 array and the faces in an
+    (M, 3) integer array of vertex indices. The vertices of each face are in
+    counter-clockwise order when viewed from the outside, so the normals
+    (according to the right-hand rule) point outwards.
+
+    This class requires NumPy.
+    """
+
+    def __init__(self, vertices, faces):
+        vertices = numpy.array(vertices, dtype = numpy.float64).reshape(-1, 3)
+        faces    = numpy.array(faces   , dtype = numpy.int64  ).reshape(-1, 3)
+
+        if len(faces) > 0 and (faces.min() < 0 or faces.max() >= len(vertices)):
+            raise ValueError("Face vertex index out of range")
+
+        vertices.flags.writeable = False
+        faces.flags.writeable = False
+
+        self._vertices = vertices
+        self._faces = faces
+
+    @classmethod
+    def empty(cls):
+        return cls(numpy.zeros((0, 3)), numpy.zeros((0, 3)))
+
+    @classmethod
+    def concatenate(cls, meshes):
+        """Create a mesh that contains all faces of multiple meshes.
+
+        The meshes are not merged: intersecting meshes will intersect in the
+        result as well.
+        """
+        meshes = list(meshes)
+        if len(meshes) == 0:
+            return cls.empty()
+
+        offsets = numpy.cumsum([0] + [len(mesh._vertices) for mesh in meshes[:-1]])
+        vertices = numpy.concatenate([mesh._vertices for mesh in meshes])
+        faces = numpy.concatenate([mesh._faces + offset for mesh, offset in zip(meshes, offsets)])
+        return cls(vertices, faces)
+
+    ################
+    ## Properties ##
+    ################
+
+    @property
+    def vertices(self):
+        """The vertices, as a read-only (N, 3) array."""
+        return self._vertices
+
+    @property
+    def faces(self):
+        """The faces, as a read-only (M, 3) array of vertex indices."""
+        return self._faces
+
+    @property
+    def vertex_count(self):
+        return len(self._vertices)
+
+    @property
+    def face_count(self):
+        return len(self._faces)
+
+    def triangles(self):
+        """Return the vertices of all faces as an (M, 3, 3) array."""
+        return self._vertices[self._faces]
+
+    def normals(self):
+        """Return the unit normals of all faces as an (M, 3) array.
+
+        Degenerate faces have a zero normal.
+        """
+        return triangle_normals(self.triangles())
+
+    def volume(self):
+        """Calculate the enclosed volume.
+
+        The mesh must be closed and consistently oriented. Meshes that consist
+        of multiple intersecting parts count the intersection multiple times.
+        """
+        triangles = self.triangles()
+        return float(numpy.einsum("ij,ij->i", triangles[:, 0], numpy.cross(triangles[:, 1], triangles[:, 2])).sum() / 6)
+
+    def bounds(self):
+        """Return the axis-aligned bounding box of the vertices, as a
+        Bounds."""
+        if len(self._vertices) == 0:
+            return Bounds.empty()
+
+        return Bounds(self._vertices.min(axis = 0).tolist(), self._vertices.max(axis = 0).tolist())
+
+    ################
+    ## Transforms ##
+    ################
+
+    def transformed(self, matrix):
+        """Create a mesh with all vertices transformed by a 4x4 matrix in
+        homogeneous coordinates, e. g. the result of Transform.to_matrix.
+
+        All vertices are transformed in a single batch. If the transform
+        mirrors the mesh, the orientation of the faces is reversed so the
+        normals still point outwards.
+        """
+        from cadlib.transform.compiled import CompiledTransform
+
+        vertices = CompiledTransform(matrix).apply_many(self._vertices)
+
+        linear = numpy.array(matrix.row_values, dtype = numpy.float64)[:3, :3]
+        if numpy.linalg.det(linear) < 0:
+            faces = self._faces[:, ::-1]
+        else:
+            faces = self._faces
+
+        return Mesh(vertices, faces)
+
+    #########
+    ## I/O ##
+    #########
+
+    def __repr__(self):
+        return f"Mesh({self.vertex_count} vertices, {self.face_count} faces)"
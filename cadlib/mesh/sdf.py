@@ -0,0 +1,97 @@
+import numpy
+
+
+def as_points(points):
+    """Convert points (an (N, 3) array or a sequence of 3-element sequences)
+    to an (N, 3) float64 array."""
+    points = numpy.asarray(points, dtype = numpy.float64)
+    if points.ndim == 1 and len(points) == 0:
+        points = points.reshape(0, 3)
+    if points.ndim != 2 or points.shape[1] != 3:
+        raise ValueError(f"Points must be an (N, 3) array, not {points.shape}")
+    return points
+
+
+def _length(vectors):
+    return numpy.sqrt(numpy.einsum("ij,ij->i", vectors, vectors))
+
+
+def sphere(points, r):
+    """The signed distance of points to a sphere with radius r at the
+    origin."""
+    return _length(points) - abs(r)
+
+
+def box(points, minimum, maximum):
+    """The signed distance of points to an axis-aligned box."""
+    minimum = numpy.asarray(minimum, dtype = numpy.float64)
+    maximum = numpy.asarray(maximum, dtype = numpy.float64)
+    center = (minimum + maximum) / 2
+    half_size = (maximum - minimum) / 2
+
+    q = numpy.abs(points - center) - half_size
+    outside = _length(numpy.maximum(q, 0))
+    inside = numpy.minimum(q.max(axis = 1), 0)
+    return outside + inside
+
+
+def slab(points, normal, low, high):
+    """The signed distance of points to the region low <= n.p <= high, where n
+    is the normalized normal. low may be -infinity (a half space)."""
+    normal = numpy.asarray(normal, dtype = numpy.float64)
+    d = points @ (normal / numpy.linalg.norm(normal))
+    return numpy.maximum(low - d, d - high)
+
+
+def capped_cone(points, base, cap, base_radius, cap_radius):
+    """The signed distance of points to a frustum (a cylinder if both radii
+    are equal, a cone if one of them is 0) between base and cap."""
+    return capped_cones(points, [base], [cap], [base_radius], [cap_radius])[:, 0]
+
+
+def spheres(points, centers, radii):
+    """The signed distances of points to multiple spheres.
+
+    centers is an (K, 3) array and radii an array of K radii. The result is an
+    (N, K) array with the distance of each point to each sphere.
+    """
+    centers = numpy.asarray(centers, dtype = numpy.float64)
+    radii = numpy.asarray(radii, dtype = numpy.float64)
+
+    relative = points[:, numpy.newaxis, :] - centers
+    return numpy.sqrt(numpy.einsum("ijk,ijk->ij", relative, relative)) - numpy.abs(radii)
+
+
+def capped_cones(points, bases, caps, base_radii, cap_radii):
+    """The signed distances of points to multiple frustums (see capped_cone).
+
+    bases and caps are (K, 3) arrays and base_radii and cap_radii arrays of K
+    radii. The result is an (N, K) array with the distance of each point to
+    each frustum.
+    """
+    bases = numpy.asarray(bases, dtype = numpy.float64)
+    axes = numpy.asarray(caps, dtype = numpy.float64) - bases
+    ra = numpy.abs(numpy.asarray(base_radii, dtype = numpy.float64))
+    rb = numpy.abs(numpy.asarray(cap_radii, dtype = numpy.float64))
+
+    # Reduce to 2 dimensions: the radial distance from the axis (x) and the
+    # position along the axis, with 0 at the base and 1 at the cap (y)
+    length2 = numpy.einsum("jk,jk->j", axes, axes)
+    relative = points[:, numpy.newaxis, :] - bases
+    y = numpy.einsum("ijk,jk->ij", relative, axes) / length2
+    x = numpy.sqrt(numpy.maximum(numpy.einsum("ijk,ijk->ij", relative, relative) - y * y * length2, 0))
+
+    # Distance to the caps
+    cap_x = numpy.maximum(x - numpy.where(y < 0.5, ra, rb), 0)
+    cap_y = numpy.abs(y - 0.5) - 0.5
+
+    # Distance to the side
+    dr = rb - ra
+    f = numpy.clip((dr * (x - ra) + y * length2) / (dr * dr + length2), 0, 1)
+    side_x = x - ra - f * dr
+    side_y = y - f
+
+    sign = numpy.where((side_x < 0) & (cap_y < 0), -1.0, 1.0)
+    return sign * numpy.sqrt(numpy.minimum(
+        cap_x  * cap_x  + cap_y  * cap_y  * length2,
+        side_x * side_x + side_y * side_y * length2))
@@ -0,0 +1,132 @@
+import math
+
+import numpy
+
+from cadlib.mesh.mesh import Mesh
+
+# OpenSCAD defaults for $fa and $fs
+default_fa = 12
+default_fs = 2
+
+# Radii below this are treated as 0 by OpenSCAD
+_grid_fine = 0.00000095367431640625
+
+
+def fragments(r, fn = None, fa = default_fa, fs = default_fs):
+    """Calculate the number of fragments of a circle with radius r, using the
+    same rules as OpenSCAD for $fn, $fa, and $fs.
+
+    If fn is given (and not 0), it is used (with a minimum of 3). Otherwise,
+    the number of fragments is determined by the maximum angle fa (in degrees)
+    and the maximum length fs of a fragment, with a minimum of 5.
+    """
+    if r < _grid_fine:
+        return 3
+    if fn is not None and fn > 0:
+        return max(int(fn), 3)
+    return int(math.ceil(max(min(360 / fa, r * 2 * math.pi / fs), 5)))
+
+
+def _circle(radius, z, count):
+    """Create the vertices of a circle in the plane at z, starting on the X
+    axis and counter-clockwise when viewed from above."""
+    angles = numpy.arange(count) * (2 * math.pi / count)
+    return numpy.column_stack([radius * numpy.cos(angles), radius * numpy.sin(angles), numpy.full(count, z)])
+
+
+def _fan(ring, reverse):
+    """Create the faces of a polygon, given the vertex indices of its
+    boundary in counter-clockwise order when viewed from the outside (or
+    clockwise, if reverse is true)."""
+    j = numpy.arange(1, len(ring) - 1)
+    faces = numpy.column_stack([numpy.full(len(j), ring[0]), ring[j], ring[j + 1]])
+    return faces[:, ::-1] if reverse else faces
+
+
+def _band(lower, upper):
+    """Create the faces between two rings of vertex indices with the same
+    number of vertices, counter-clockwise when viewed from above."""
+    lower_next = numpy.roll(lower, -1)
+    upper_next = numpy.roll(upper, -1)
+    return numpy.concatenate([
+        numpy.column_stack([lower, lower_next, upper_next]),
+        numpy.column_stack([lower, upper_next, upper]),
+    ])
+
+
+def _cone(ring, apex, reverse):
+    """Create the faces between a ring of vertex indices (counter-clockwise
+    when viewed from above) and an apex vertex above the ring (or below, if
+    reverse is true)."""
+    ring_next = numpy.roll(ring, -1)
+    faces = numpy.column_stack([ring, ring_next, numpy.full(len(ring), apex)])
+    return faces[:, ::-1] if reverse else faces
+
+
+def cuboid(x, y, z):
+    """Create a mesh for a cuboid with one corner at the origin and the
+    opposite corner at (x, y, z), like OpenSCAD's cube."""
+    xs = sorted([0, x])
+    ys = sorted([0, y])
+    zs = sorted([0, z])
+
+    # Vertex i is at (xs[i & 1], ys[(i >> 1) & 1], zs[i >> 2])
+    vertices = [[xs[i & 1], ys[(i >> 1) & 1], zs[i >> 2]] for i in range(8)]
+    quads = [
+        [0, 2, 3, 1], # Bottom
+        [4, 5, 7, 6], # Top
+        [0, 1, 5, 4], # Front
+        [2, 6, 7, 3], # Back
+        [0, 4, 6, 2], # Left
+        [1, 3, 7, 5], # Right
+    ]
+    faces = [face for a, b, c, d in quads for face in [[a, b, c], [a, c, d]]]
+
+    return Mesh(vertices, faces)
+
+
+def sphere(r, fn = None, fa = default_fa, fs = default_fs):
+    """Create a mesh for a sphere with radius r at the origin, with the same
+    vertices as OpenSCAD's sphere."""
+    count = fragments(r, fn, fa, fs)
+    ring_count = (count + 1) // 2
+
+    # The rings are at the centers of ring_count latitude bands, from top to
+    # bottom, so there are no vertices at the poles.
+    vertices = []
+    for i in range(ring_count):
+        phi = math.pi * (i + 0.5) / ring_count
+        vertices.append(_circle(r * math.sin(phi), r * math.cos(phi), count))
+    vertices = numpy.concatenate(vertices)
+
+    rings = numpy.arange(ring_count * count).reshape(ring_count, count)
+    faces = [_fan(rings[0], False)]
+    for i in range(ring_count - 1):
+        faces.append(_band(rings[i + 1], rings[i]))
+    faces.append(_fan(rings[-1], True))
+
+    return Mesh(vertices, numpy.concatenate(faces))
+
+
+def cylinder(h, r1, r2, fn = None, fa = default_fa, fs = default_fs):
+    """Create a mesh for a cylinder or cone along the Z axis from 0 to h, with
+    radius r1 at the bottom and r2 at the top, with the same vertices as
+    OpenSCAD's cylinder."""
+    count = fragments(max(r1, r2), fn, fa, fs)
+    ring = numpy.arange(count)
+
+    if r1 > 0 and r2 > 0:
+        vertices = numpy.concatenate([_circle(r1, 0, count), _circle(r2, h, count)])
+        faces = [_fan(ring, True), _band(ring, ring + count), _fan(ring + count, False)]
+    elif r2 > 0:
+        # Apex at the bottom
+        vertices = numpy.concatenate([_circle(r2, h, count), [[0, 0, 0]]])
+        faces = [_cone(ring, count, True), _fan(ring, False)]
+    elif r1 > 0:
+        # Apex at the top
+        vertices = numpy.concatenate([_circle(r1, 0, count), [[0, 0, h]]])
+        faces = [_fan(ring, True), _cone(ring, count, False)]
+    else:
+        return Mesh.empty()
+
+    return Mesh(vertices, numpy.concatenate(faces))
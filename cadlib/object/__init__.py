@@ -1,3 +1,5 @@
 from .anchor import Anchor  # TODO depending on the anchor creation mechanism, remove
 from .object import Object
-from .transformed import Transformed
\ No newline at end of file
+from .transformed import Transformed
+from .patterns import Pattern, GridPattern, LinearPattern, PolarPattern
+from .batch import PrimitiveBatch, SphereBatch, FrustumBatch
\ No newline at end of file
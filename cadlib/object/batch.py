@@ -0,0 +1,368 @@
+import hashlib
+from numbers import Integral
+from warnings import warn
+
+from cadlib.object import Object
+from cadlib.scad import ScadObject, ScadExpression
+from cadlib.util import Bounds
+
+
+def _convert_array(values, label):
+    import numpy
+    try:
+        array = numpy.asarray(values)
+    except ValueError:  # E.g. rows of different lengths
+        raise ValueError(f"{label} must be a rectangular array")
+
+    # Integers or floats (or an empty array)
+    if array.dtype.kind not in "iuf" and array.size > 0:
+        raise TypeError(f"{label} must be numeric")
+    array = array.astype(numpy.float64)
+
+    if not numpy.isfinite(array).all():
+        raise ValueError(f"{label} must be finite")
+    return array
+
+def _convert_points(values, label):
+    array = _convert_array(values, label)
+    if array.ndim == 1 and len(array) == 0:
+        array = array.reshape(0, 3)
+    if array.ndim != 2 or array.shape[1] != 3:
+        raise ValueError(f"{label} must be an (N, 3) array, not {array.shape}")
+    return array
+
+def _convert_values(values, count, label):
+    """Convert a scalar (which is used for all instances) or an array of count
+    values."""
+    import numpy
+    array = _convert_array(values, label)
+    if array.ndim == 0:
+        return numpy.full(count, array)
+    if array.shape != (count, ):
+        raise ValueError(f"{label} must be a number or an array of {count} values, not {array.shape}")
+    return array
+
+
+class PrimitiveBatch(Object):
+    """Many primitives of the same type, stored column-wise in a NumPy array.
+
+    Each instance is described by one row of numbers (e.g. center and radius
+    of a sphere), so an instance takes tens of bytes instead of a complete
+    object. The batch is exported to OpenSCAD as a single for loop over a data
+    vector with the rows, and the bounds and the signed distance function are
+    calculated for all instances at once. The instances can be queried by
+    position (see instances_containing and instances_intersecting), and
+    created as regular objects when needed (see instance and instances).
+
+    This class requires NumPy. Subclasses implement the primitive types.
+    """
+
+    # The maximum number of distances (points times instances) that are
+    # calculated at once by _sdf
+    _sdf_chunk_size = 2 ** 18
+
+    _data_digest = None
+
+    def __init__(self, data):
+        """Create a batch from an (N, k) array of instance data, which must
+        not be modified afterwards."""
+        super().__init__()
+
+        data.flags.writeable = False
+        self._data = data
+
+    @property
+    def instance_count(self):
+        """The number of instances."""
+        return len(self._data)
+
+    @property
+    def nbytes(self):
+        """The number of bytes used to store the instance data."""
+        return self._data.nbytes
+
+    def _check_index(self, index):
+        if not isinstance(index, Integral):
+            raise TypeError("Index must be an integer")
+        if not 0 <= index < len(self._data):
+            raise IndexError("Index out of range")
+
+    def instance(self, index):
+        """Return the instance with the given index as a regular object."""
+        raise NotImplementedError("In {}".format(type(self)))
+
+    def instances(self):
+        """Generate all instances (see instance)."""
+        for index in range(len(self._data)):
+            yield self.instance(index)
+
+    def expanded(self):
+        """Return an equivalent Union of all instances."""
+        from cadlib.csg import Union
+        return Union(list(self.instances()))
+
+    def _key(self):
+        # Hashing the data is linear in the size of the batch, so the digest
+        # of the data is calculated only once
+        if self._data_digest is None:
+            self._data_digest = hashlib.sha256(self._data.tobytes()).hexdigest()
+        return (self._data.shape, self._data_digest)
+
+
+    #####################
+    ## OpenSCAD export ##
+    #####################
+
+    def _scad_rows(self):
+        """Return the rows of the OpenSCAD data vector as an array."""
+        return self._data
+
+    def _scad_instance(self):
+        """Return the ScadObject for one instance, with the row of the
+        instance in the variable p."""
+        raise NotImplementedError("In {}".format(type(self)))
+
+    def to_scad(self):
+        # The string representation of a list of floats is the same as the
+        # OpenSCAD representation (the values are finite), and it is much
+        # faster than rendering each value separately.
+        data = ScadExpression(str(self._scad_rows().tolist()))
+        return ScadObject("for", None, [("p", data)], [self._scad_instance()])
+
+
+    #####################
+    ## Spatial queries ##
+    #####################
+
+    def instance_bounds(self):
+        """Return the bounds of all instances, as a tuple of two (N, 3) arrays
+        with the minimum and the maximum corner of each instance."""
+        raise NotImplementedError("In {}".format(type(self)))
+
+    def _calculate_bounds(self):
+        if len(self._data) == 0:
+            return Bounds.empty()
+
+        minimum, maximum = self.instance_bounds()
+        return Bounds(minimum.min(axis = 0).tolist(), maximum.max(axis = 0).tolist())
+
+    def instances_intersecting(self, bounds):
+        """Return the indices (an array) of the instances whose bounds
+        intersect the given bounds."""
+        import numpy
+
+        if bounds.is_empty:
+            return numpy.zeros(0, dtype = numpy.intp)
+
+        minimum, maximum = self.instance_bounds()
+        mask = ((minimum <= list(bounds.maximum)) & (maximum >= list(bounds.minimum))).all(axis = 1)
+        return numpy.flatnonzero(mask)
+
+    def instances_containing(self, point):
+        """Return the indices (an array) of the instances that contain a
+        point, including those that touch it."""
+        import numpy
+        from cadlib.mesh import sdf
+
+        points = sdf.as_points([point])
+        return numpy.flatnonzero(self._distances(points)[0] <= 0)
+
+    def _distances(self, points):
+        """Return the signed distances of points (an (M, 3) array) to all
+        instances, as an (M, N) array."""
+        raise NotImplementedError("In {}".format(type(self)))
+
+    def _sdf(self, points):
+        import numpy
+
+        if len(self._data) == 0:
+            return numpy.full(len(points), numpy.inf)
+
+        # Limit the size of the (points x instances) distance array
+        chunk = max(1, self._sdf_chunk_size // len(self._data))
+        result = numpy.empty(len(points))
+        for start in range(0, len(points), chunk):
+            result[start:start + chunk] = self._distances(points[start:start + chunk]).min(axis = 1)
+        return result
+
+    def to_mesh(self, fn = None):
+        """Create a mesh that contains the meshes of all instances.
+
+        The meshes are not merged: the result is a valid mesh of the batch only
+        if the instances do not intersect.
+        """
+        from cadlib.mesh import Mesh
+        return Mesh.concatenate(self.meshes(fn))
+
+    def meshes(self, fn = None):
+        for instance in self.instances():
+            yield from instance.meshes(fn)
+
+
+class SphereBatch(PrimitiveBatch):
+    """Spheres with the given centers (an (N, 3) array) and radii (an array of
+    N radii, or a single radius for all spheres).
+
+    Exported to OpenSCAD as:
+        for (p = [[x, y, z, r], ...]) translate([p[0], p[1], p[2]]) sphere(p[3]);
+    """
+
+    def __init__(self, centers, radii):
+        import numpy
+
+        centers = _convert_points(centers, "centers")
+        radii = _convert_values(radii, len(centers), "radii")
+        if (radii == 0).any(): warn("radius is 0")
+
+        super().__init__(numpy.column_stack([centers, radii]))
+
+    @property
+    def centers(self):
+        return self._data[:, 0:3]
+
+    @property
+    def radii(self):
+        return self._data[:, 3]
+
+    def __str__(self):
+        return f"Batch of {self.instance_count} spheres"
+
+    def __repr__(self):
+        return f"SphereBatch({self.centers.tolist()!r}, {self.radii.tolist()!r})"
+
+    def instance(self, index):
+        from cadlib.object.primitives import Sphere
+        from cadlib.transform.primitives import Translate
+
+        self._check_index(index)
+        x, y, z, r = self._data[index].tolist()
+        return Translate([x, y, z]) * Sphere(r)
+
+    def _scad_instance(self):
+        sphere = ScadObject("sphere", [ScadExpression("p[3]")], None, None)
+        return ScadObject("translate", [ScadExpression("[p[0], p[1], p[2]]")], None, [sphere])
+
+    def instance_bounds(self):
+        radii = abs(self.radii)[:, None]
+        return self.centers - radii, self.centers + radii
+
+    def _distances(self, points):
+        from cadlib.mesh import sdf
+        return sdf.spheres(points, self.centers, self.radii)
+
+    def meshes(self, fn = None):
+        from cadlib.mesh import Mesh, tessellation
+
+        # Instances with the same radius have the same mesh, up to the position
+        meshes = {}
+        for x, y, z, r in self._data.tolist():
+            mesh = meshes.get(r)
+            if mesh is None:
+                mesh = meshes[r] = tessellation.sphere(r, fn)
+            yield Mesh(mesh.vertices + [x, y, z], mesh.faces)
+
+
+class FrustumBatch(PrimitiveBatch):
+    """Frustums (or cylinders, if the radii are equal) from the given bases to
+    the given caps (both (N, 3) arrays), with the given base radii and cap
+    radii (each an array of N radii, or a single radius for all frustums).
+
+    Exported to OpenSCAD as a for loop over rows with the base, the rotation
+    from the Z axis to the direction of the frustum, the length and the radii:
+        for (p = [[x, y, z, a, vx, vy, vz, h, r1, r2], ...])
+            translate([p[0], p[1], p[2]]) rotate(a = p[3], v = [p[4], p[5], p[6]]) cylinder(p[7], r1 = p[8], r2 = p[9]);
+    """
+
+    def __init__(self, bases, caps, base_radii, cap_radii):
+        import numpy
+
+        bases = _convert_points(bases, "bases")
+        caps = _convert_points(caps, "caps")
+        if caps.shape != bases.shape:
+            raise ValueError("bases and caps must have the same length")
+        base_radii = _convert_values(base_radii, len(bases), "base_radii")
+        cap_radii = _convert_values(cap_radii, len(bases), "cap_radii")
+
+        # See Frustum
+        if (bases == caps).all(axis = 1).any():          warn("length is 0")
+        if ((base_radii == 0) & (cap_radii == 0)).any(): warn("radius is 0")
+
+        super().__init__(numpy.column_stack([bases, caps, base_radii, cap_radii]))
+
+    @classmethod
+    def cylinders(cls, bases, caps, radii):
+        """Create a batch of cylinders (frustums with equal radii)."""
+        return cls(bases, caps, radii, radii)
+
+    @property
+    def bases(self):
+        return self._data[:, 0:3]
+
+    @property
+    def caps(self):
+        return self._data[:, 3:6]
+
+    @property
+    def base_radii(self):
+        return self._data[:, 6]
+
+    @property
+    def cap_radii(self):
+        return self._data[:, 7]
+
+    def __str__(self):
+        return f"Batch of {self.instance_count} frustums"
+
+    def __repr__(self):
+        return (f"FrustumBatch({self.bases.tolist()!r}, {self.caps.tolist()!r}, "
+                f"{self.base_radii.tolist()!r}, {self.cap_radii.tolist()!r})")
+
+    def instance(self, index):
+        from cadlib.object.primitives import Frustum
+
+        self._check_index(index)
+        values = self._data[index].tolist()
+        return Frustum(values[0:3], values[3:6], values[6], values[7])
+
+    def _scad_rows(self):
+        import numpy
+
+        # The rotation from the Z axis to the direction: the axis is Z x d
+        # and the angle is the angle between Z and d. If d is parallel to Z, the axis
+        # is arbitrary (but it must not be zero).
+        directions = self.caps - self.bases
+        lengths = numpy.linalg.norm(directions, axis = 1)
+        axes = numpy.column_stack([-directions[:, 1], directions[:, 0], numpy.zeros(len(directions))])
+        angles = numpy.degrees(numpy.arctan2(numpy.linalg.norm(axes, axis = 1), directions[:, 2]))
+        axes[(axes == 0).all(axis = 1)] = [1, 0, 0]
+        axes += 0.0  # Replace -0.0 with 0.0
+
+        return numpy.column_stack([self.bases, angles, axes, lengths, self.base_radii, self.cap_radii])
+
+    def _scad_instance(self):
+        cylinder = ScadObject("cylinder", [ScadExpression("p[7]")],
+                              [("r1", ScadExpression("p[8]")), ("r2", ScadExpression("p[9]"))], None)
+        rotate = ScadObject("rotate", None,
+                            [("a", ScadExpression("p[3]")), ("v", ScadExpression("[p[4], p[5], p[6]]"))], [cylinder])
+        return ScadObject("translate", [ScadExpression("[p[0], p[1], p[2]]")], None, [rotate])
+
+    def instance_bounds(self):
+        import numpy
+
+        # See Frustum._calculate_bounds. The extent of instances with zero
+        # length is not defined, so the bounding sphere is used.
+        directions = self.caps - self.bases
+        lengths = numpy.linalg.norm(directions, axis = 1)[:, None]
+        with numpy.errstate(invalid = "ignore", divide = "ignore"):
+            extents = numpy.sqrt(numpy.maximum(0, 1 - (directions / lengths) ** 2))
+        extents[lengths[:, 0] == 0] = 1
+
+        base_extents = extents * abs(self.base_radii)[:, None]
+        cap_extents = extents * abs(self.cap_radii)[:, None]
+        minimum = numpy.minimum(self.bases - base_extents, self.caps - cap_extents)
+        maximum = numpy.maximum(self.bases + base_extents, self.caps + cap_extents)
+        return minimum, maximum
+
+    def _distances(self, points):
+        from cadlib.mesh import sdf
+        return sdf.capped_cones(points, self.bases, self.caps, self.base_radii, self.cap_radii)
@@ -1,4 +1,5 @@
-from cadlib.util.tree import Node
+from cadlib.util.tree import Node, reduce_tree
+from cadlib.util.digest import structural_digest
 from cadlib.transform import Transform, shortcuts, generators
 from cadlib.object import Anchor # TODO remove? TODO from cadlib.object.anchor
 
@@ -98,14 +99,24 @@ from cadlib.object import Anchor # TODO remove? TODO from cadlib.object.anchor
 class Object:
     """A description of an object. Object instances are immutable.
 
-    Implementations must override to_scad and, if they can have children,
+    Implementations must override to_scad, _key and, if they can have children,
     to_tree.
 
     Objects can be added, multiplied, and subtracted to create unions,
     differences, and intersections, respectively. Objects can be left-multipled
     with transforms to create transformed objects.
+
+    Objects are hashable. Since objects are immutable, the hash is calculated
+    only once, so hashing and comparing large trees is cheap after the first
+    time.
     """
 
+    # The hash, the digest, and the bounds are calculated when they are first
+    # requested
+    _hash = None
+    _digest = None
+    _bounds = None
+
     def __init__(self):
         self._anchors = dict()
 
@@ -117,16 +128,319 @@ class Object:
         unconditionally."""
         raise NotImplementedError("In {}".format(type(self)))
 
+    @property
+    def bounds(self):
+        """The axis-aligned bounding box of this object, as a Bounds.
+
+        The bounds are calculated on the first access and cached. They are
+        exact for primitives and may be larger than the object for transformed
+        objects and CSG operations. Unbounded objects (like planes) have
+        infinite bounds.
+        """
+        if self._bounds is None:
+            self._cache_bottom_up("_bounds", lambda node: node._calculate_bounds())
+        return self._bounds
+
+    def _calculate_bounds(self):
+        """Calculate the bounds of this object. The bounds of the operands (see
+        _operands) have already been calculated when this method is called."""
+        raise NotImplementedError("In {}".format(type(self)))
+
+    def _cache_bottom_up(self, attribute, calculate):
+        """Calculate a cached value (e.g. the bounds) for this object and for
+        all of its (indirect) operands for which it has not been calculated yet.
+
+        attribute is the name of the attribute that stores the value (None if
+        it has not been calculated), and calculate(object) calculates the value
+        for an object, using the cached values of its operands. The operands are
+        processed before the objects they belong to, without recursion.
+        """
+        def calculate_node(node, _):
+            if getattr(node, attribute) is None:
+                setattr(node, attribute, calculate(node))
+
+        reduce_tree(self, lambda node: [] if getattr(node, attribute) is not None else node._operands(),
+                    calculate_node)
+
+    def sdf(self, points):
+        """Calculate the signed distance of points to the surface of this
+        object, negative inside the object. This requires NumPy.
+
+        points is an (N, 3) array (or a sequence of points); the result is an
+        array of N distances, calculated in a single vectorized pass. The
+        distances are exact for primitives. For CSG operations and non-rigid
+        transforms, the sign is exact, and the magnitude is a lower bound of
+        the actual distance.
+        """
+        from cadlib.mesh.sdf import as_points
+        return self._sdf(as_points(points))
+
+    def _sdf(self, points):
+        """Implementation of sdf, called with an (N, 3) float64 array."""
+        raise NotImplementedError("In {}".format(type(self)))
+
+    def to_mesh(self, fn = None):
+        """Create a triangle mesh (a cadlib.mesh.Mesh) for this object.
+
+        Round objects are approximated like in OpenSCAD: fn is the number of
+        fragments (like the fn parameter of ScadFile); if it is None, the
+        OpenSCAD defaults for $fa and $fs are used. This requires NumPy.
+        """
+        raise NotImplementedError("In {}".format(type(self)))
+
+    def to_implicit_mesh(self, edge_length, bounds = None, processes = None):
+        """Create a closed triangle mesh (a cadlib.mesh.Mesh) from the signed
+        distance function of this object (see sdf).
+
+        Unlike to_mesh, this works for all objects, including differences and
+        intersections, without OpenSCAD. The mesh is created by adaptive
+        octree refinement down to edge_length near the surface, within bounds
+        (by default, the bounds of the object, which must be finite). If
+        processes is given, the distances are evaluated in a process pool. See
+        cadlib.mesh.mesh_sdf.
+        """
+        from cadlib.mesh import mesh_sdf
+
+        if bounds is None:
+            bounds = self.bounds
+        return mesh_sdf(self.sdf, bounds, edge_length, processes = processes)
+
+    def meshes(self, fn = None):
+        """Generate the meshes of the parts of this object.
+
+        Objects that consist of multiple separate parts (e.g. unions) can
+        generate one mesh per part, so the meshes can be processed (e.g.
+        written to a file) without creating a mesh for the complete object. See
+        to_mesh for the fn parameter.
+
+        The default implementation generates the result of to_mesh.
+        """
+        yield self.to_mesh(fn)
+
+    def _mesh_operands(self):
+        """Return the objects whose meshes the meshes of this object are made
+        of, or None if this object cannot be tessellated.
+
+        The default implementation treats objects that implement to_mesh as
+        tessellable without operands.
+        """
+        if type(self).to_mesh is Object.to_mesh:
+            return None
+        return []
+
+    def _check_tessellable(self):
+        """Raise a TypeError if this object cannot be tessellated (see
+        to_mesh), so the error is reported before any mesh is created."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            operands = node._mesh_operands()
+            if operands is None:
+                raise TypeError(f"{node} ({type(node).__name__}) cannot be tessellated; "
+                                "use to_implicit_mesh for differences and intersections")
+            stack.extend(operands)
+
+    def _operands(self):
+        """Return the objects this object is composed of.
+
+        The OpenSCAD representation of the object can be created by calling
+        _combine_scad with the representations of the operands. This allows
+        converting (or looking up) the operands separately, e. g. for caching.
+
+        Implementations that have operands must override this method and
+        _combine_scad. The default implementation returns an empty list.
+        """
+        return []
+
+    def _combine_scad(self, operands):
+        """Create the OpenSCAD representation of this object from the
+        representations of its operands (see _operands).
+
+        The default implementation, for objects without operands, returns
+        to_scad().
+        """
+        return self.to_scad()
+
+    def _to_scad_from_operands(self):
+        """Create the OpenSCAD representation of this object by converting the
+        operands and combining them (see _operands and _combine_scad).
+
+        The tree is traversed with an explicit stack rather than by recursion,
+        so deep trees do not exceed the recursion limit. Objects that have
+        operands should implement to_scad by calling this method.
+        """
+        return reduce_tree(self, lambda node: node._operands(),
+                           lambda node, operands: node._combine_scad(operands))
+
+    def _tree_children(self):
+        """Return the objects (and transforms) that are represented as child
+        nodes by to_tree.
+
+        Implementations that can have children must override this method. The
+        default implementation returns an empty list.
+        """
+        return []
+
     def to_tree(self):
         """Creates a tree representation for this object.
 
         Returns a tree.Node with this object as the data and tree
-        representations of the object's children as child nodes.
+        representations of the object's children (see _tree_children) as child
+        nodes. The tree is created without recursion, so it can be arbitrarily
+        deep.
+        """
+        return reduce_tree(self, lambda node: node._tree_children(), Node)
+
+    def collapse_transforms(self, tolerance = None):
+        """Create an equivalent object in which each transform is exported to
+        OpenSCAD as a single node.
+
+        Chained transforms (and other transforms that would be exported as
+        multiple nodes) are replaced with a single matrix transform, and nested
+        transformed objects are merged. See Transform.collapsed for the
+        tolerance parameter.
+
+        The operands are processed first (without recursion), and the object is
+        then processed by _collapsed.
+        """
+        return reduce_tree(self, lambda node: node._operands(),
+                           lambda node, operands: node._collapsed(operands, tolerance))
 
-        Implementations that can have children must override this method to
-        create child nodes for the children.
+    def _collapsed(self, operands, tolerance):
+        """Create a version of this object with collapsed transforms, given the
+        processed versions of its operands (see collapse_transforms).
+
+        Implementations that have operands must override this method. The
+        default implementation returns self.
+        """
+        return self
+
+    def pruned(self):
+        """Create an equivalent object without operands that cannot affect the
+        result, based on the bounds of the objects.
+
+        Subtracted objects whose bounds do not intersect the bounds of the
+        object they are subtracted from are removed, and intersections of
+        objects with disjoint bounds are replaced with an empty union. If a
+        union is subtracted from, the subtraction is distributed over the parts
+        of the union, so that each part is only cut by the objects that
+        intersect it. Parts of the tree that cannot be pruned are re-used.
+
+        The operands are pruned first (without recursion), and the object is
+        then pruned by _pruned.
+        """
+        return reduce_tree(self, lambda node: node._operands(),
+                           lambda node, operands: node._pruned(operands))
+
+    def _pruned(self, operands):
+        """Create a pruned version of this object, given the pruned versions
+        of its operands (see _operands and pruned).
+
+        Implementations that have operands must override this method. The
+        default implementation returns self.
+        """
+        return self
+
+    def simplified(self):
+        """Create an equivalent object with a smaller tree.
+
+        Consecutive transforms are folded and identity transforms are removed
+        (see Transform.folded), and nested CSG operations of the same type are
+        flattened. Parts of the tree that cannot be simplified are re-used.
+
+        The operands are simplified first (without recursion), and the object
+        is then simplified by _simplified.
+        """
+        return reduce_tree(self, lambda node: node._operands(),
+                           lambda node, operands: node._simplified(operands))
+
+    def _simplified(self, operands):
+        """Create a simplified version of this object, given the simplified
+        versions of its operands (see _operands and simplified).
+
+        Implementations that have operands must override this method. The
+        default implementation returns self.
+        """
+        return self
+
+
+    ################
+    ## Comparison ##
+    ################
+
+    def _key(self):
+        """Return a tuple of the values that define this object.
+
+        Two objects are equal if they have the same type and equal keys. The
+        values must be hashable. Objects of classes that don't implement this
+        method are only equal to themselves (and they have no digest).
+        """
+        raise NotImplementedError("In {}".format(type(self)))
+
+    def _has_key(self):
+        """Whether the class of this object implements _key."""
+        return type(self)._key is not Object._key
+
+    def __eq__(self, other):
+        if other is self:
+            return True
+        if not isinstance(other, Object):
+            return False
+
+        # Compare the keys, with an explicit stack for the objects in the keys
+        # rather than recursively. Only compare the keys (which may be a deep
+        # comparison) if the (cached) hashes are equal.
+        stack = [(self, other)]
+        while stack:
+            a, b = stack.pop()
+            if a is b:
+                continue
+            if type(a) is not type(b) or not a._has_key() or hash(a) != hash(b):
+                return False
+
+            key_a, key_b = a._key(), b._key()
+            if len(key_a) != len(key_b):
+                return False
+            for value_a, value_b in zip(key_a, key_b):
+                if isinstance(value_a, Object) and isinstance(value_b, Object):
+                    stack.append((value_a, value_b))
+                elif value_a != value_b:
+                    return False
+
+        return True
+
+    def __hash__(self):
+        if self._hash is None:
+            # The keys contain the operands, so their hashes are calculated
+            # first
+            self._cache_bottom_up("_hash", lambda node: node._calculate_hash())
+        return self._hash
+
+    def _calculate_hash(self):
+        if self._has_key():
+            return hash((type(self), self._key()))
+        else:
+            return object.__hash__(self)
+
+    def __getstate__(self):
+        # The hash depends on the process (e. g., string hashes are
+        # randomized), so it must not be pickled.
+        state = self.__dict__.copy()
+        state.pop("_hash", None)
+        return state
+
+    def digest(self):
+        """Return a digest (a hex string) of the structure of this object.
+
+        Objects with equal digests are equal and generate the same OpenSCAD
+        code. The converse is not always true: values that compare equal but
+        are represented differently (like 1 and 1.0) lead to different
+        digests. Unlike the hash, the digest is stable across processes, so it
+        can be used as a key for persistent caches (see ScadCache).
         """
-        return Node(self, [])
+        if self._digest is None:
+            self._cache_bottom_up("_digest", lambda node: structural_digest(node, node._key()))
+        return self._digest
 
 
     ################
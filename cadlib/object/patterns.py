@@ -0,0 +1,349 @@
+import itertools
+from numbers import Integral
+
+from cadlib.object import Object, Transformed
+from cadlib.scad import ScadObject, ScadExpression
+from cadlib.transform.primitives import Translate, RotateAxisAngle
+from cadlib.util import Vector, Bounds, Z
+from cadlib.util import number
+
+
+def _convert_count(count, label):
+    if not isinstance(count, Integral):
+        raise TypeError(f"{label} must be an integer")
+    if count < 1:
+        raise ValueError(f"{label} must be at least 1")
+    return int(count)
+
+
+class Pattern(Object):
+    """Copies of an object, placed according to a pattern.
+
+    A pattern stores the object only once, together with a compact description
+    of the placement of the copies, and is exported to OpenSCAD as a for loop,
+    so the size of the tree does not depend on the number of copies. The
+    copies (instances) are only created when requested (see instance and
+    instances); the bounds, the signed distance function and the meshes are
+    calculated from the transforms of the instances, without creating them.
+
+    The instances are identified by an index (see indices). Subclasses
+    implement the placement.
+    """
+
+    def __init__(self, object):
+        super().__init__()
+
+        if not isinstance(object, Object):
+            raise TypeError("object must be an Object")
+
+        self._object = object
+
+    @property
+    def object(self):
+        """The object that is repeated."""
+        return self._object
+
+    @property
+    def instance_count(self):
+        """The number of instances."""
+        raise NotImplementedError("In {}".format(type(self)))
+
+    def indices(self):
+        """Generate the indices of all instances."""
+        raise NotImplementedError("In {}".format(type(self)))
+
+    def instance_transform(self, index):
+        """Return the transform that places the instance with the given index."""
+        raise NotImplementedError("In {}".format(type(self)))
+
+    def instance(self, index):
+        """Return the instance with the given index, as a Transformed object.
+
+        The anchors of the object are available on the instance, transformed
+        to its position, e.g. pattern.instance(3).top_face.
+        """
+        return Transformed(self.instance_transform(index), self._object)
+
+    def instances(self):
+        """Generate all instances (see instance)."""
+        for index in self.indices():
+            yield self.instance(index)
+
+    def expanded(self):
+        """Return an equivalent Union of all instances."""
+        from cadlib.csg import Union
+        return Union(list(self.instances()))
+
+    def _with_object(self, object):
+        """Return a pattern of the same type and placement with a different
+        object."""
+        raise NotImplementedError("In {}".format(type(self)))
+
+    def _tree_children(self):
+        return [self._object]
+
+    def _operands(self):
+        return [self._object]
+
+    def to_scad(self):
+        return self._to_scad_from_operands()
+
+    def _collapsed(self, operands, tolerance):
+        object, = operands
+        return self if object is self._object else self._with_object(object)
+
+    def _pruned(self, operands):
+        object, = operands
+        return self if object is self._object else self._with_object(object)
+
+    def _simplified(self, operands):
+        object, = operands
+
+        # The first instance is not transformed
+        if self.instance_count == 1:
+            return object
+        return self if object is self._object else self._with_object(object)
+
+    def _calculate_bounds(self):
+        bounds = Bounds.empty()
+        object_bounds = self._object.bounds
+        for index in self.indices():
+            bounds = bounds.union(object_bounds.transformed(self.instance_transform(index).to_matrix()))
+        return bounds
+
+    def _sdf(self, points):
+        import numpy
+        from cadlib.transform.compiled import CompiledTransform
+
+        # The instances are placed by rigid transforms, so the distances are
+        # not scaled
+        result = numpy.full(len(points), numpy.inf)
+        for index in self.indices():
+            transform = CompiledTransform(self.instance_transform(index).inverse_matrix())
+            result = numpy.minimum(result, self._object._sdf(transform.apply_many(points)))
+        return result
+
+    def to_mesh(self, fn = None):
+        """Create a mesh that contains the meshes of all instances.
+
+        The meshes are not merged: the result is a valid mesh of the pattern
+        only if the instances do not intersect.
+        """
+        from cadlib.mesh import Mesh
+        return Mesh.concatenate(self.meshes(fn))
+
+    def meshes(self, fn = None):
+        meshes = list(self._object.meshes(fn))
+        for index in self.indices():
+            matrix = self.instance_transform(index).to_matrix()
+            for mesh in meshes:
+                yield mesh.transformed(matrix)
+
+    def _mesh_operands(self):
+        return [self._object]
+
+
+class GridPattern(Pattern):
+    """Copies of an object on a grid with 1 to 3 dimensions.
+
+    counts is the number of copies along each dimension, and steps the offset
+    between neighboring copies along each dimension (a vector). The copy with
+    index (i, j, ...) is translated by i * steps[0] + j * steps[1] + ...; the
+    first copy is not translated.
+
+    Exported to OpenSCAD as:
+        for (i = [0 : counts[0] - 1], j = [0 : counts[1] - 1]) translate(i * steps[0] + j * steps[1]) ...
+    """
+
+    # The names of the loop variables in OpenSCAD
+    _variables = ["i", "j", "k"]
+
+    def __init__(self, object, counts, steps):
+        super().__init__(object)
+
+        counts = list(counts)
+        steps = list(steps)
+        if not 1 <= len(counts) <= len(self._variables):
+            raise ValueError(f"A grid must have 1 to {len(self._variables)} dimensions")
+        if len(steps) != len(counts):
+            raise ValueError("steps must have the same length as counts")
+
+        self._counts = tuple(_convert_count(count, "count") for count in counts)
+        self._steps = tuple(Vector.convert(step, "step", required_length = 3) for step in steps)
+
+    @property
+    def counts(self):
+        return self._counts
+
+    @property
+    def steps(self):
+        return self._steps
+
+    def _key(self):
+        return (self._object, self._counts, self._steps)
+
+    def __str__(self):
+        return "Grid pattern of {} copies".format(" x ".join(str(count) for count in self._counts))
+
+    def __repr__(self):
+        return f"GridPattern({self._object!r}, {list(self._counts)!r}, {list(self._steps)!r})"
+
+    def _with_object(self, object):
+        return GridPattern(object, self._counts, self._steps)
+
+    @property
+    def instance_count(self):
+        result = 1
+        for count in self._counts:
+            result *= count
+        return result
+
+    def indices(self):
+        return itertools.product(*(range(count) for count in self._counts))
+
+    def _offset(self, index):
+        index = tuple(index)
+        if len(index) != len(self._counts):
+            raise ValueError(f"Index must have {len(self._counts)} elements")
+        for value, count in zip(index, self._counts):
+            if not isinstance(value, Integral):
+                raise TypeError("Index must consist of integers")
+            if not 0 <= value < count:
+                raise IndexError("Index out of range")
+
+        offset = Vector(0, 0, 0)
+        for value, step in zip(index, self._steps):
+            offset = offset + value * step
+        return offset
+
+    def instance_transform(self, index):
+        return Translate(self._offset(index))
+
+    def _calculate_bounds(self):
+        # The instances are translated, so the extreme offsets are the corners
+        # of the grid
+        object_bounds = self._object.bounds
+        if object_bounds.is_empty:
+            return object_bounds
+
+        low  = [0, 0, 0]
+        high = [0, 0, 0]
+        for count, step in zip(self._counts, self._steps):
+            for axis in range(3):
+                extent = (count - 1) * step[axis]
+                low [axis] += min(extent, 0)
+                high[axis] += max(extent, 0)
+
+        return Bounds(object_bounds.minimum + Vector(*low), object_bounds.maximum + Vector(*high))
+
+    def _combine_scad(self, operands):
+        object_scad, = operands
+
+        variables = self._variables[:len(self._counts)]
+        ranges = [(variable, ScadExpression(f"[0 : {count - 1}]"))
+                  for variable, count in zip(variables, self._counts)]
+        offset = ScadExpression(" + ".join(f"{variable} * {ScadObject.render_value(list(step))}"
+                                           for variable, step in zip(variables, self._steps)))
+
+        return ScadObject("for", None, ranges, [ScadObject("translate", [offset], None, [object_scad])])
+
+
+class LinearPattern(GridPattern):
+    """Copies of an object along a line: count copies, each translated by
+    step (a vector) relative to the previous one.
+
+    The instances are indexed by integers (rather than by 1-tuples, like for a
+    one-dimensional GridPattern).
+    """
+
+    def __init__(self, object, count, step):
+        super().__init__(object, [count], [step])
+
+    @property
+    def count(self):
+        return self._counts[0]
+
+    @property
+    def step(self):
+        return self._steps[0]
+
+    def __str__(self):
+        return f"Linear pattern of {self.count} copies"
+
+    def __repr__(self):
+        return f"LinearPattern({self._object!r}, {self.count!r}, {self.step!r})"
+
+    def _with_object(self, object):
+        return LinearPattern(object, self.count, self.step)
+
+    def indices(self):
+        return iter(range(self.count))
+
+    def instance_transform(self, index):
+        return Translate(self._offset([index]))
+
+
+class PolarPattern(Pattern):
+    """Copies of an object around an axis through the origin.
+
+    count is the number of copies and angle the angle (in degrees) between
+    neighboring copies, by default 360 / count. The copy with index i is
+    rotated by i * angle around the axis; the first copy is not rotated.
+
+    Exported to OpenSCAD as:
+        for (i = [0 : count - 1]) rotate(a = i * angle, v = axis) ...
+    """
+
+    def __init__(self, object, count, axis = Z, angle = None):
+        super().__init__(object)
+
+        self._count = _convert_count(count, "count")
+        self._axis = Vector.convert(axis, "axis", required_length = 3)
+        if self._axis.is_zero:
+            raise ValueError("axis may not be zero-length")
+        self._angle = number.convert(angle, "angle", default = 360 / self._count)
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def axis(self):
+        return self._axis
+
+    @property
+    def angle(self):
+        return self._angle
+
+    def _key(self):
+        return (self._object, self._count, self._axis, self._angle)
+
+    def __str__(self):
+        return f"Polar pattern of {self._count} copies"
+
+    def __repr__(self):
+        return f"PolarPattern({self._object!r}, {self._count!r}, {self._axis!r}, {self._angle!r})"
+
+    def _with_object(self, object):
+        return PolarPattern(object, self._count, self._axis, self._angle)
+
+    @property
+    def instance_count(self):
+        return self._count
+
+    def indices(self):
+        return iter(range(self._count))
+
+    def instance_transform(self, index):
+        if not isinstance(index, Integral):
+            raise TypeError("Index must be an integer")
+        if not 0 <= index < self._count:
+            raise IndexError("Index out of range")
+        return RotateAxisAngle(self._axis, index * self._angle)
+
+    def _combine_scad(self, operands):
+        object_scad, = operands
+
+        angle = ScadExpression(f"i * {ScadObject.render_value(self._angle)}")
+        rotate = ScadObject("rotate", None, [("a", angle), ("v", list(self._axis))], [object_scad])
+        return ScadObject("for", None, [("i", ScadExpression(f"[0 : {self._count - 1}]"))], [rotate])
@@ -3,7 +3,7 @@ from warnings import warn
 
 from cadlib.object import Object, Anchor # TODO remove anchor?
 from cadlib.scad import ScadObject
-from cadlib.util import number
+from cadlib.util import number, Bounds
 
 
 class Cuboid(Object):
@@ -24,9 +24,8 @@ class Cuboid(Object):
         #setattr(self, "top_face", Anchor(self, [x/2, y/2, z]))
         self.add_anchor("top_face", [x/2, y/2, z])
 
-    def __eq__(self, other):
-        return (isinstance(other, Cuboid)
-            and other._size == self._size)
+    def _key(self):
+        return tuple(self._size)
 
     def __repr__(self):
         x, y, z = self._size
@@ -42,3 +41,14 @@ class Cuboid(Object):
     def to_scad(self):
         # In OpenSCAD, it's called "cube" - even if the sides are not equal.
         return ScadObject("cube", [self._size], None, None)
+
+    def _calculate_bounds(self):
+        return Bounds([min(0, x) for x in self._size], [max(0, x) for x in self._size])
+
+    def _sdf(self, points):
+        from cadlib.mesh import sdf
+        return sdf.box(points, [min(0, x) for x in self._size], [max(0, x) for x in self._size])
+
+    def to_mesh(self, fn = None):
+        from cadlib.mesh import tessellation
+        return tessellation.cuboid(*self._size)
@@ -1,10 +1,11 @@
+import math
 from warnings import warn
 
 from cadlib.util import Vector, X, Y, Z
 from cadlib.object import Object
 from cadlib.scad import ScadObject
 from cadlib.transform.primitives import RotateFromTo, Translate
-from cadlib.util import number
+from cadlib.util import number, Bounds
 
 class Frustum(Object):
     def __init__(self, base, cap, base_radius, cap_radius):
@@ -33,12 +34,8 @@ class Frustum(Object):
         cap = direction.normalized() * length
         return cls(base, cap, base_radius, cap_radius)
 
-    def __eq__(self, other):
-        return (isinstance(other, Frustum)
-            and other._base        == self._base
-            and other._cap         == self._cap
-            and other._base_radius == self._base_radius
-            and other._cap_radius  == self._cap_radius)
+    def _key(self):
+        return (self._base, self._cap, self._base_radius, self._cap_radius)
 
     def __repr__(self):
         return f"Frustum({self._base!r}, {self._cap!r}, {self._base_radius!r}, {self._cap_radius!r})"
@@ -65,3 +62,30 @@ class Frustum(Object):
             cylinder = Translate(self._base).to_scad(cylinder)
 
         return cylinder
+
+    def _calculate_bounds(self):
+        # The bounds of a circle with radius r and normal n extend by
+        # r * sqrt(1 - n_i^2) along axis i around its center.
+        direction = (self._cap - self._base).normalized()
+        extent = Vector(*(math.sqrt(max(0, 1 - d ** 2)) for d in direction))
+
+        def disc(center, radius):
+            radius = abs(radius)
+            return Bounds(center - extent * radius, center + extent * radius)
+
+        return disc(self._base, self._base_radius).union(disc(self._cap, self._cap_radius))
+
+    def _sdf(self, points):
+        from cadlib.mesh import sdf
+        return sdf.capped_cone(points, list(self._base), list(self._cap), self._base_radius, self._cap_radius)
+
+    def to_mesh(self, fn = None):
+        from cadlib.mesh import tessellation
+
+        length = (self._cap - self._base).length
+        direction = (self._cap - self._base).normalized()
+
+        # Create the cylinder along the Z axis, then move it into place
+        mesh = tessellation.cylinder(length, self._base_radius, self._cap_radius, fn)
+        transform = Translate(self._base) * RotateFromTo(frm = Z, to = direction, ignore_ambiguity = True)
+        return mesh.transformed(transform.to_matrix())
@@ -5,7 +5,7 @@ from cadlib import infinity as inf
 from cadlib.util import Z
 from cadlib.object import Object
 from cadlib.object.primitives import Cuboid
-from cadlib.util import number
+from cadlib.util import number, Bounds
 
 
 class Layer(Object):
@@ -25,11 +25,8 @@ class Layer(Object):
         self._offset1 = offset1
         self._offset2 = offset2
 
-    def __eq__(self, other):
-        return (isinstance(other, Layer)
-            and other._normal  == self._normal
-            and other._offset1 == self._offset1
-            and other._offset2 == self._offset2)
+    def _key(self):
+        return (self._normal, self._offset1, self._offset2)
 
     def __repr__(self):
         return(f"Layer({self._normal!r}, {self._offset1!r}, {self._offset2!r})")
@@ -37,12 +34,29 @@ class Layer(Object):
     def __str__(self):
         return f"Layer with normal {self._normal} from {self._offset1} to {self._offset2}"
 
-    def to_scad(self):
+    def _equivalent(self):
+        """Return a (finite) object that is used to represent the layer."""
         o1 = min(self._offset1, self._offset2)
         o2 = max(self._offset1, self._offset2)
 
         return (Cuboid(inf, inf, o2 - o1)
             .translate([-inf / 2, -inf / 2, 0])
             .up(o1)
-            .rotate(frm = Z, to = self._normal, ignore_ambiguity = True)
-            .to_scad().comment(str(self)))
+            .rotate(frm = Z, to = self._normal, ignore_ambiguity = True))
+
+    def to_scad(self):
+        return self._equivalent().to_scad().comment(str(self))
+
+    def _calculate_bounds(self):
+        o1 = min(self._offset1, self._offset2)
+        o2 = max(self._offset1, self._offset2)
+        return Bounds.slab(self._normal, o1, o2)
+
+    def _sdf(self, points):
+        from cadlib.mesh import sdf
+        o1 = min(self._offset1, self._offset2)
+        o2 = max(self._offset1, self._offset2)
+        return sdf.slab(points, list(self._normal), o1, o2)
+
+    def to_mesh(self, fn = None):
+        return self._equivalent().to_mesh(fn)
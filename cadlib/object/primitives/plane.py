@@ -1,9 +1,11 @@
+import math
+
 from cadlib.util.vector import Vector
 from cadlib import infinity as inf
 from cadlib.util import Z
 from cadlib.object import Object
 from cadlib.object.primitives import Cuboid
-from cadlib.util import number
+from cadlib.util import number, Bounds
 
 
 class Plane(Object):
@@ -19,10 +21,8 @@ class Plane(Object):
         self._normal = normal
         self._offset = offset
 
-    def __eq__(self, other):
-        return (isinstance(other, Plane)
-            and other._normal == self._normal
-            and other._offset == self._offset)
+    def _key(self):
+        return (self._normal, self._offset)
 
     def __repr__(self):
         return f"Plane({self._normal!r}, {self._offset!r})"
@@ -30,9 +30,24 @@ class Plane(Object):
     def __str__(self):
         return f"Plane with normal {self._normal} and offset {self._offset}"
 
-    def to_scad(self):
+    def _equivalent(self):
+        """Return a (finite) object that is used to represent the plane."""
         return (Cuboid(inf, inf, inf)
             .translate([-inf / 2, -inf / 2, -inf])
             .up(self._offset)
-            .rotate(frm = Z, to = self._normal, ignore_ambiguity = True)
-            .to_scad().comment(str(self)))
+            .rotate(frm = Z, to = self._normal, ignore_ambiguity = True))
+
+    def to_scad(self):
+        return self._equivalent().to_scad().comment(str(self))
+
+    def _calculate_bounds(self):
+        # The plane contains everything below the offset (in the direction of
+        # the normal)
+        return Bounds.slab(self._normal, -math.inf, self._offset)
+
+    def _sdf(self, points):
+        from cadlib.mesh import sdf
+        return sdf.slab(points, list(self._normal), -math.inf, self._offset)
+
+    def to_mesh(self, fn = None):
+        return self._equivalent().to_mesh(fn)
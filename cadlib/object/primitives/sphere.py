@@ -2,7 +2,7 @@ from warnings import warn
 
 from cadlib.object import Object, Anchor  # TODO remove anchor?
 from cadlib.scad import ScadObject
-from cadlib.util import number
+from cadlib.util import number, Bounds
 
 
 class Sphere(Object):
@@ -16,9 +16,8 @@ class Sphere(Object):
         self.add_anchor("center", [0, 0, 0])
         #self.center = Anchor(self, [0, 0, 0])
 
-    def __eq__(self, other):
-        return (isinstance(other, Sphere)
-            and other._radius == self._radius)
+    def _key(self):
+        return (self._radius, )
 
     def __repr__(self):
         return f"Sphere(r={self._radius!r})"
@@ -28,3 +27,15 @@ class Sphere(Object):
 
     def to_scad(self):
         return ScadObject("sphere", [self._radius], None, None)
+
+    def _calculate_bounds(self):
+        r = abs(self._radius)
+        return Bounds([-r, -r, -r], [r, r, r])
+
+    def _sdf(self, points):
+        from cadlib.mesh import sdf
+        return sdf.sphere(points, self._radius)
+
+    def to_mesh(self, fn = None):
+        from cadlib.mesh import tessellation
+        return tessellation.sphere(self._radius, fn)
@@ -1,6 +1,5 @@
 from cadlib.object import Object
 from cadlib.transform import Transform
-from cadlib.util.tree import Node
 
 
 class Transformed(Object):
@@ -16,13 +15,34 @@ class Transformed(Object):
         self._transform = transform
         self._object    = object
 
-        for name, anchor in object.anchors.items():
-            self.add_anchor(name, transform * anchor.position)
+        # The anchors are created when first requested, so creating a
+        # transformed object takes constant time
+        self._anchors = None
 
-    def __eq__(self, other):
-        return (isinstance(other, Transformed)
-            and other._transform == self._transform
-            and other._object    == self._object)
+    @property
+    def anchors(self):
+        if self._anchors is None:
+            self._anchors = dict()
+            for name, anchor in self._object.anchors.items():
+                self.add_anchor(name, self._transform * anchor.position)
+        return self._anchors
+
+    def add_anchor(self, name, position):
+        # Create the anchors of the object first, so they are not lost (and
+        # the new anchor is not overwritten)
+        self.anchors
+        super().add_anchor(name, position)
+
+    def __getattr__(self, name):
+        # Only called if the attribute does not exist - it may be an anchor
+        # that has not been created yet.
+        if not name.startswith("_") and self.__dict__.get("_anchors", {}) is None:
+            if name in self.anchors:
+                return self.anchors[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def _key(self):
+        return (self._transform, self._object)
 
     def __str__(self):
         return "Transformed object"
@@ -43,8 +63,77 @@ class Transformed(Object):
             # Other * Transformed - unknown (no __rmul__ in superclass)
             return NotImplemented
 
-    def to_tree(self):
-        return Node(self, [self._transform.to_tree(), self._object.to_tree()])
+    def _tree_children(self):
+        return [self._transform, self._object]
+
+    def _collapsed(self, operands, tolerance):
+        transform = self._transform
+        object, = operands
+
+        # Merge nested transformed objects
+        if isinstance(object, Transformed):
+            transform = transform * object._transform
+            object = object._object
+
+        return Transformed(transform.collapsed(tolerance), object)
+
+    def _pruned(self, operands):
+        object, = operands
+        if object is self._object:
+            return self
+        return Transformed(self._transform, object)
+
+    def _simplified(self, operands):
+        transform = self._transform
+        object, = operands
+
+        # Merge nested transformed objects
+        if isinstance(object, Transformed):
+            transform = transform * object._transform
+            object = object._object
+
+        transform = transform.folded()
+        if transform.is_identity:
+            return object
+        elif transform == self._transform and object is self._object:
+            return self
+        else:
+            return Transformed(transform, object)
+
+    def _operands(self):
+        return [self._object]
+
+    def _combine_scad(self, operands):
+        object_scad, = operands
+        return self._transform.to_scad(object_scad)
 
     def to_scad(self):
-       return self._transform.to_scad(self._object.to_scad())
+        return self._to_scad_from_operands()
+
+    def _calculate_bounds(self):
+        return self._object.bounds.transformed(self._transform.to_matrix())
+
+    def _sdf(self, points):
+        import numpy
+        from cadlib.transform.compiled import CompiledTransform
+
+        # Distances in the object's coordinates are scaled by at most the
+        # largest singular value of the inverse, so scaling them by the
+        # smallest singular value of the transform gives a lower bound.
+        matrix = self._transform.to_matrix()
+        linear = numpy.array(matrix.row_values, dtype = numpy.float64)[:3, :3]
+        scale = numpy.linalg.svd(linear, compute_uv = False).min()
+
+        local = CompiledTransform(self._transform.inverse_matrix()).apply_many(points)
+        return self._object._sdf(local) * scale
+
+    def to_mesh(self, fn = None):
+        return self._object.to_mesh(fn).transformed(self._transform.to_matrix())
+
+    def meshes(self, fn = None):
+        matrix = self._transform.to_matrix()
+        for mesh in self._object.meshes(fn):
+            yield mesh.transformed(matrix)
+
+    def _mesh_operands(self):
+        return [self._object]
@@ -1,4 +1,5 @@
 # Modules related to OpenSCAD
 
 from .scad_file import ScadFile
-from .scad_object import ScadObject, render_to_file
+from .scad_object import ScadObject, ScadExpression, render_to_file
+from .scad_cache import ScadCache
@@ -0,0 +1,85 @@
+from cadlib.scad.scad_object import ScadObject
+from cadlib.util.tree import reduce_tree
+
+
+class _Subtree:
+    """A distinct subtree of an ScadObject tree. Identical subtrees share a
+    single _Subtree instance."""
+    def __init__(self, index, scad, children):
+        self.index = index       # Position in post-order; children have lower indices than their parents
+        self.scad = scad         # A representative ScadObject
+        self.children = children # List of _Subtree
+        self.size = 1 + sum(child.size for child in children)
+        self.occurrences = 0     # Number of times the subtree appears in the generated code
+        self.is_module = False   # Whether the subtree is extracted into a module
+        self.name = None         # The module name, if the subtree is extracted
+
+
+def extract_modules(scad, min_size = 2, prefix = "subtree_"):
+    """Extract repeated subtrees of an ScadObject into modules.
+
+    Subtrees are compared structurally, i. e. by the code they generate. Each
+    subtree that appears in the code more than once and has at least min_size
+    nodes is replaced with a call to a module. Repeated subtrees within a
+    module body are extracted as well.
+
+    Returns a tuple (modules, body), where modules is a list of ScadObjects
+    that define the modules, and body is the ScadObject that calls them. The
+    modules are named with prefix and a sequential number.
+    """
+    subtrees = {}
+    root = reduce_tree(scad, lambda node: node._children,
+                       lambda node, children: _subtree(node, children, subtrees))
+
+    # Count how often each subtree appears in the generated code, parents
+    # before children. The body of a module appears only once, no matter how
+    # often the module is called.
+    ordered = sorted(subtrees.values(), key = lambda subtree: subtree.index, reverse = True)
+    root.occurrences = 1
+    for subtree in ordered:
+        if subtree is not root and subtree.occurrences > 1 and subtree.size >= min_size:
+            subtree.is_module = True
+            uses = 1
+        else:
+            uses = subtree.occurrences
+
+        for child in subtree.children:
+            child.occurrences += uses
+
+    # Name the modules in post-order, so the numbers are deterministic
+    modules = []
+    for subtree in reversed(ordered):
+        if subtree.is_module:
+            subtree.name = prefix + str(len(modules) + 1)
+            definition = ScadObject("module " + subtree.name, None, None, [_body(subtree)])
+            modules.append(definition)
+
+    return modules, _body(root)
+
+
+def _subtree(scad, children, subtrees):
+    """Return the _Subtree of an ScadObject, given the _Subtrees of its
+    children."""
+    key = (scad._head(), scad._comment, tuple(child.index for child in children))
+    subtree = subtrees.get(key)
+    if subtree is None:
+        subtree = _Subtree(len(subtrees), scad, children)
+        subtrees[key] = subtree
+
+    return subtree
+
+
+def _body(root):
+    """Create an ScadObject for a subtree, calling the modules of its
+    descendants (without recursion)."""
+    def is_call(subtree):
+        return subtree.is_module and subtree is not root
+
+    def create(subtree, children):
+        if is_call(subtree):
+            return ScadObject(subtree.name, None, None, None)
+
+        scad = subtree.scad
+        return ScadObject(scad._id, scad._parameters, scad._kw_parameters, children, scad._comment)
+
+    return reduce_tree(root, lambda subtree: [] if is_call(subtree) else subtree.children, create)
@@ -0,0 +1,145 @@
+import concurrent.futures
+import math
+import multiprocessing
+import os
+
+from cadlib.scad.scad_object import ScadObject
+from cadlib.util.tree import reduce_tree
+
+# CSG operations with at least this many children are converted in parallel
+default_min_children = 1000
+
+# The number of chunks per process that the children are split into, for load
+# balancing
+_chunks_per_process = 4
+
+
+class ScadFragment(ScadObject):
+    """Pre-rendered code of a sequence of objects, as created by
+    to_scad_parallel.
+
+    The lines are rendered at depth 0 with a given indent and with comments.
+    The fragment can only be rendered with the same indent, with comments and
+    without simplification; it is indented to the depth at which it appears.
+    """
+
+    def __init__(self, lines, indent):
+        super().__init__(None, None, None, None)
+        self._code_lines = lines
+        self._indent = indent
+
+    def _shallow_key(self):
+        return ("fragment", tuple(self._code_lines), self._indent)
+
+    def _head_lines(self, indent, top_indent, simplify, include_comments, depth):
+        if indent != self._indent or simplify or not include_comments:
+            raise ValueError("Code fragments can only be rendered with the indent they were created with, "
+                             "with comments, and without simplification")
+
+        prefix = top_indent + indent * depth
+        return [prefix + line for line in self._code_lines], None
+
+
+# The object that is converted, in a worker process
+_worker_root = None
+
+def _initialize_worker(root):
+    global _worker_root
+    _worker_root = root
+
+def _convert_chunk(path, start, end, indent):
+    """Render the children start to end of the object at path (a sequence of
+    operand indices, see Object._operands) in a worker process."""
+    node = _worker_root
+    for index in path:
+        node = node._operands()[index]
+
+    lines = []
+    for child in node._operands()[start:end]:
+        lines.extend(child.to_scad()._iter_lines(indent, "", False, True))
+    return lines
+
+
+def _large_nodes(object, min_children):
+    """Generate the large CSG operations in the tree, excluding those within
+    other large operations, as tuples of (path, object).
+
+    The tree is traversed without recursion. Each object on the stack refers
+    to the stack entry of its parent, so the path (a tuple of operand indices)
+    is only created for the large operations.
+    """
+    from cadlib.csg import Csg
+
+    # (object, (index, parent entry)), with None for the root
+    stack = [(object, None)]
+    while stack:
+        entry = stack.pop()
+        node = entry[0]
+
+        operands = node._operands()
+        if isinstance(node, Csg) and len(operands) >= min_children:
+            path = []
+            link = entry[1]
+            while link is not None:
+                index, parent = link
+                path.append(index)
+                link = parent[1]
+            yield tuple(reversed(path)), node
+        else:
+            # Reversed, so the operands are generated in order
+            stack.extend((operand, (index, entry)) for index, operand in reversed(list(enumerate(operands))))
+
+
+def _convert(object, futures, indent):
+    """Convert the object, using the results of the futures (a dict from the
+    ID of a large operation to a list of futures) for the large operations."""
+    def combine(node, operands):
+        if id(node) in futures:
+            return node._combine_scad([ScadFragment(future.result(), indent) for future in futures[id(node)]])
+        return node._combine_scad(operands)
+
+    return reduce_tree(object, lambda node: [] if id(node) in futures else node._operands(), combine)
+
+
+def to_scad_parallel(object, processes = None, min_children = default_min_children, indent = "    "):
+    """Convert an Object to a ScadObject, converting the children of large CSG
+    operations in a process pool.
+
+    The children of each CSG operation with at least min_children children are
+    split into chunks, which are rendered to code (with the given indent) by a
+    pool of processes. The code is included in the result as ScadFragments, in
+    order, so the code generated from the result is identical to the code
+    generated from object.to_scad() (but it can only be generated with the
+    same indent; see ScadFragment).
+
+    If processes is None, the number of processors is used. Where available,
+    the worker processes are forked, so the object does not
+    have to be pickled. Otherwise, it is pickled once per process.
+    """
+    nodes = list(_large_nodes(object, min_children))
+    if len(nodes) == 0:
+        return object.to_scad()
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    else:
+        context = None
+
+    with concurrent.futures.ProcessPoolExecutor(processes, mp_context = context,
+            initializer = _initialize_worker, initargs = (object, )) as executor:
+        # The nodes are in the tree, so their IDs are not re-used. A node that
+        # appears more than once is only converted once.
+        futures = {}
+        for path, node in nodes:
+            if id(node) in futures:
+                continue
+
+            count = len(node._operands())
+            chunk_size = math.ceil(count / (processes * _chunks_per_process))
+            futures[id(node)] = [executor.submit(_convert_chunk, path, start, min(start + chunk_size, count), indent)
+                for start in range(0, count, chunk_size)]
+
+        return _convert(object, futures, indent)
@@ -0,0 +1,313 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+from cadlib.util.tree import reduce_tree
+
+
+# The digest of the source code of cadlib, calculated when first requested
+_code_digest = None
+
+def code_digest():
+    """Return a digest (a hex string) of the source code of cadlib.
+
+    The OpenSCAD representation of an object depends on the code that converts
+    it, so ScadCache only uses entries that were stored with the same code.
+    """
+    global _code_digest
+
+    if _code_digest is None:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+        paths = []
+        for directory, _, file_names in os.walk(root):
+            paths += [os.path.join(directory, name) for name in file_names if name.endswith(".py")]
+
+        hasher = hashlib.sha256()
+        for path in sorted(paths):
+            hasher.update(os.path.relpath(path, root).replace(os.sep, "/").encode())
+            with open(path, "rb") as file:
+                hasher.update(hashlib.sha256(file.read()).digest())
+        _code_digest = hasher.hexdigest()
+
+    return _code_digest
+
+
+def _flattened(scad, references):
+    """Return the nodes of an ScadObject tree as a list in post-order, so the
+    tree can be pickled without recursion.
+
+    Each node is a tuple (class, state, child indices), where state contains
+    the attributes except for the children and the hash, and the child indices
+    refer to earlier nodes of the list. Nodes that appear more than once are
+    only included once.
+
+    Sub-trees that are stored in other entries (references maps their IDs to
+    their digests) are not included; they are represented by a node (None,
+    digest, None).
+    """
+    nodes = []
+    indices = {}  # ID -> index in nodes
+
+    def is_reference(node):
+        return node is not scad and id(node) in references
+
+    def add(node, children):
+        if id(node) not in indices:
+            if is_reference(node):
+                nodes.append((None, references[id(node)], None))
+            else:
+                state = node.__dict__.copy()
+                del state["_children"]
+                state.pop("_hash", None)
+                nodes.append((type(node), state, children))
+            indices[id(node)] = len(nodes) - 1
+        return indices[id(node)]
+
+    reduce_tree(scad, lambda node: [] if id(node) in indices or is_reference(node) else node._children, add)
+    return nodes
+
+def _references(nodes):
+    """Return the digests of the entries that the result of _flattened refers
+    to."""
+    return [state for cls, state, _ in nodes if cls is None]
+
+def _unflattened(nodes, referenced):
+    """Create an ScadObject tree from the result of _flattened. referenced
+    maps the digests of the referenced entries to their ScadObjects."""
+    scads = []
+    for cls, state, children in nodes:
+        if cls is None:
+            scads.append(referenced[state])
+        else:
+            scad = cls.__new__(cls)
+            scad.__dict__.update(state)
+            scad._children = [scads[index] for index in children]
+            scads.append(scad)
+    return scads[-1]
+
+
+class ScadCache:
+    """A persistent cache for the OpenSCAD representations of objects.
+
+    The ScadObjects are stored in a directory, keyed by the digest of the
+    object (see Object.digest), so the cache can be shared between processes
+    and sessions. When converting an object with to_scad, each sub-tree that is
+    found in the cache is used instead of converting it again.
+
+    Only sub-trees with at least min_size objects are stored, so small objects
+    (which are cheap to convert) don't lead to a large number of files. Each
+    entry refers to the entries of its stored sub-trees rather than containing
+    them, so the total size of the cache is linear in the size of the objects;
+    the sub-trees are spliced in when the entry is read. If
+    max_size (in bytes) is given, the least recently used entries are removed
+    when the total size of the cache exceeds it.
+
+    The entries are specific to the code that converted the objects: they are
+    stored in a sub-directory for the source code of cadlib (see code_digest),
+    so entries of other versions of cadlib are not used. Code outside of
+    cadlib (e.g. custom Object classes) is not included; if it changes, pass a
+    different version (any string), or clear the cache.
+
+    The entries are stored as pickles, and loading a pickle can execute
+    arbitrary code, so the directory must only be writable by trusted users.
+    """
+
+    # Increment when the format of the stored ScadObjects changes; entries of
+    # other versions are ignored.
+    _version = 3
+
+    # When the maximum size is exceeded, the cache is reduced to this fraction
+    # of the maximum size, so the eviction does not run on every store.
+    _eviction_target = 0.75
+
+    def __init__(self, directory, max_size = None, min_size = 16, version = None):
+        if max_size is not None and max_size <= 0:
+            raise ValueError("max_size must be positive")
+
+        code = code_digest()
+        if version is not None:
+            code = hashlib.sha256(f"{code}:{version}".encode()).hexdigest()
+
+        self._directory = os.path.join(directory, f"v{self._version}-{code[:16]}")
+        self._max_size = max_size
+        self._min_size = min_size
+
+        os.makedirs(self._directory, exist_ok = True)
+
+        # Digest -> file size, for all entries in the cache. This allows us to
+        # check for entries without accessing the file system.
+        self._index = dict()
+        for entry in os.scandir(self._directory):
+            name, extension = os.path.splitext(entry.name)
+            if extension == ".pickle":
+                self._index[name] = entry.stat().st_size
+        self._size = sum(self._index.values())
+
+    @property
+    def size(self):
+        """The total size of the entries, in bytes."""
+        return self._size
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, digest):
+        return digest in self._index
+
+    def _path(self, digest):
+        return os.path.join(self._directory, digest + ".pickle")
+
+    def get(self, digest):
+        """Return the ScadObject stored for a digest, or None if there is
+        none.
+
+        The sub-trees that are stored in other entries (see put) are loaded
+        from these entries. If one of them is missing, None is returned.
+        """
+        entries = dict() # Digest -> flattened nodes
+        missing = []
+        def references(digest):
+            if digest in entries or missing:
+                return []
+            nodes = self._load(digest)
+            if nodes is None:
+                missing.append(digest)
+                return []
+            entries[digest] = nodes
+            return _references(nodes)
+
+        scads = dict() # Digest -> ScadObject
+        def combine(digest, _):
+            if missing:
+                return None
+            if digest not in scads:
+                scads[digest] = _unflattened(entries[digest], scads)
+            return scads[digest]
+
+        return reduce_tree(digest, references, combine)
+
+    def _load(self, digest):
+        """Return the flattened nodes stored for a digest, or None if there
+        is no valid entry."""
+        if digest not in self._index:
+            return None
+
+        path = self._path(digest)
+        try:
+            with open(path, "rb") as file:
+                nodes = pickle.load(file)
+        except FileNotFoundError:
+            # Removed by another process
+            self._size -= self._index.pop(digest)
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError, IndexError):
+            # Corrupt or incompatible entry
+            self._remove(digest)
+            return None
+
+        # Mark as recently used
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        return nodes
+
+    def put(self, digest, scad, references = None):
+        """Store a ScadObject for a digest.
+
+        references can map the digests of other entries to the ScadObjects
+        stored in them. Sub-trees of scad that are one of these ScadObjects
+        are stored as a reference to the entry rather than copied, so the size
+        of an entry does not depend on the size of its stored sub-trees.
+        """
+        references = {id(reference): reference_digest for reference_digest, reference in (references or {}).items()}
+
+        # Write to a temporary file first so other processes never see a
+        # partially written entry
+        handle, temporary_path = tempfile.mkstemp(dir = self._directory, suffix = ".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                pickle.dump(_flattened(scad, references), file, protocol = pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, self._path(digest))
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+        self._size -= self._index.get(digest, 0)
+        self._index[digest] = os.path.getsize(self._path(digest))
+        self._size += self._index[digest]
+
+        if self._max_size is not None and self._size > self._max_size:
+            self._evict(int(self._max_size * self._eviction_target))
+
+    def _remove(self, digest):
+        try:
+            os.unlink(self._path(digest))
+        except FileNotFoundError:
+            pass
+        self._size -= self._index.pop(digest, 0)
+
+    def _evict(self, target_size):
+        """Remove the least recently used entries until the total size is at
+        most target_size."""
+        def last_used(digest):
+            try:
+                return os.path.getmtime(self._path(digest))
+            except FileNotFoundError:
+                return 0
+
+        for digest in sorted(self._index, key = last_used):
+            if self._size <= target_size:
+                break
+            self._remove(digest)
+
+    def clear(self):
+        """Remove all entries."""
+        for digest in list(self._index):
+            self._remove(digest)
+
+    def to_scad(self, object):
+        """Convert an object to a ScadObject, using the cached representations
+        of its sub-trees where possible, and storing the representations of
+        sub-trees that are not in the cache yet.
+
+        Identical sub-trees are only converted once. The tree is traversed
+        without recursion.
+        """
+        # Digest -> (ScadObject, (minimum) size of the object, whether it is
+        # stored in the cache)
+        converted = dict()
+
+        def operands(node):
+            # Don't convert the operands of objects that have already been
+            # converted or that are in the cache
+            digest = node.digest()
+            if digest not in converted:
+                scad = self.get(digest)
+                if scad is None:
+                    return node._operands()
+
+                # Only objects with at least min_size objects are stored
+                converted[digest] = (scad, self._min_size, True)
+            return []
+
+        def combine(node, operand_digests):
+            digest = node.digest()
+            if digest not in converted:
+                operands = [converted[operand_digest] for operand_digest in operand_digests]
+                scad = node._combine_scad([operand_scad for operand_scad, _, _ in operands])
+                size = 1 + sum(operand_size for _, operand_size, _ in operands)
+                stored = size >= self._min_size
+                if stored:
+                    # Refer to the entries of stored operands instead of
+                    # copying them
+                    self.put(digest, scad, {operand_digest: operand_scad
+                        for operand_digest, (operand_scad, _, operand_stored) in zip(operand_digests, operands)
+                        if operand_stored})
+                converted[digest] = (scad, size, stored)
+            return digest
+
+        return converted[reduce_tree(object, operands, combine)][0]
@@ -1,12 +1,66 @@
+from cadlib.util.files import replacing
+
+
 class ScadFile:
-    def __init__(self, target, fn = None):
+    def __init__(self, target, fn = None, collapse_transforms = False, tolerance = None,
+                 extract_modules = False, min_module_size = 2, cache = None, simplify_tree = False,
+                 prune = False, processes = None):
         """target can be an Object or an ScadObject (in fact, anything with a
-        to_scad method)."""
+        to_scad method).
+
+        If simplify_tree is True, an Object target is simplified before it is
+        converted (see Object.simplified). By default, the tree is converted as
+        built; render_to_file simplifies it by default.
+
+        If prune is True, operands of an Object target that cannot affect the
+        result are removed based on their bounds (see Object.pruned).
+
+        If collapse_transforms is True, each transform of an Object target is
+        exported as a single node (see Object.collapse_transforms for the
+        tolerance parameter). This has no effect on other targets.
+
+        If processes is given, the children of large CSG operations of an
+        Object target are converted in a pool with that many processes (see
+        cadlib.scad.parallel.to_scad_parallel). This cannot be combined with
+        extract_modules or cache.
+
+        If extract_modules is True, subtrees that appear more than once and
+        have at least min_module_size nodes are defined as modules (see
+        cadlib.scad.modules.extract_modules).
+
+        If cache is a ScadCache, the OpenSCAD representations of the sub-trees
+        of an Object target are taken from the cache where possible (and
+        stored in the cache otherwise).
+        """
+        from cadlib.object import Object
+        from cadlib.scad.modules import extract_modules as extract
+
+        if isinstance(target, Object):
+            if simplify_tree:
+                target = target.simplified()
+            if prune:
+                target = target.pruned()
+            if collapse_transforms:
+                target = target.collapse_transforms(tolerance)
 
-        self._scad = target.to_scad()
+        if processes is not None and (extract_modules or cache is not None):
+            raise ValueError("processes cannot be combined with extract_modules or cache")
+
+        if cache is not None and isinstance(target, Object):
+            self._scad = cache.to_scad(target)
+        elif processes is not None and isinstance(target, Object):
+            from cadlib.scad.parallel import to_scad_parallel
+            self._scad = to_scad_parallel(target, processes)
+        else:
+            self._scad = target.to_scad()
         self._fn = fn
 
-    def to_code(self):
+        if extract_modules:
+            self._modules, self._scad = extract(self._scad, min_module_size)
+        else:
+            self._modules = []
+
+    def _header_code(self):
         header_lines = [
             "// This file was auto-generated by cadlib",
         ]
@@ -16,12 +70,29 @@ class ScadFile:
                 "$fn = {};".format(self._fn),
             ]
 
-        header_code = "\n".join(header_lines) + "\n\n"
+        return "\n".join(header_lines) + "\n\n"
+
+    def to_code(self):
+        header_code = self._header_code()
+        modules_code = "".join(module.to_code() + "\n\n" for module in self._modules)
         body_code = self._scad.to_code()
 
         # End with a newline
-        return header_code + body_code + "\n"
+        return header_code + modules_code + body_code + "\n"
+
+    def write_to(self, stream):
+        """Write the code to a text stream. The code is written line by line,
+        so the complete code is never held in memory."""
+        stream.write(self._header_code())
+        for module in self._modules:
+            module.write_to(stream)
+            stream.write("\n\n")
+        self._scad.write_to(stream)
+
+        # End with a newline
+        stream.write("\n")
 
     def write(self, file_name):
-        with open(file_name, "w", encoding='utf-8') as file:
-            file.write(self.to_code())
+        # Don't leave a partial file behind if writing fails
+        with replacing(file_name, "w", encoding='utf-8') as file:
+            self.write_to(file)
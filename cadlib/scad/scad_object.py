@@ -1,15 +1,83 @@
-from cadlib.util.tree import Node
+from cadlib.util.tree import Node, reduce_tree
 from numbers import Number
+import os
 from cadlib.scad.scad_file import ScadFile
 
-def render_to_file(target, file_name, fn = None):
-    ScadFile(target, fn).write(file_name)
+def render_to_file(target, file_name, fn = None, collapse_transforms = False, tolerance = None,
+                   extract_modules = False, min_module_size = 2, cache = None, simplify_tree = True,
+                   prune = False, processes = None):
+    """Write the OpenSCAD code for target to a file.
+
+    See ScadFile for the parameters. Unlike ScadFile, the target is simplified
+    by default (pass simplify_tree = False to keep the tree as built).
+
+    If the file name ends with .stl or .obj, the target (which must be an
+    Object) is tessellated (see Object.meshes) and written as a binary STL or
+    Wavefront OBJ file instead. Only fn is used in this case. This requires
+    NumPy. Only primitives, transformed objects, unions, patterns and batches
+    can be tessellated; for other objects (e.g. differences), a TypeError is
+    raised before the file is written.
+    """
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension in [".stl", ".obj"]:
+        from cadlib.object import Object
+        from cadlib.mesh import write_stl, write_obj
+
+        if not isinstance(target, Object):
+            raise TypeError(f"Only objects can be written to {extension} files")
+        target._check_tessellable()
+
+        write = write_stl if extension == ".stl" else write_obj
+        write(target.meshes(fn), file_name)
+        return
+
+    ScadFile(target, fn, collapse_transforms, tolerance, extract_modules, min_module_size, cache,
+             simplify_tree, prune, processes).write(file_name)
+
+def _frozen(value):
+    """Convert (possibly nested) lists to tuples, so they can be hashed."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_frozen(x) for x in value)
+    else:
+        return value
+
+class ScadExpression:
+    """An OpenSCAD expression that is rendered verbatim as a parameter value,
+    e.g. a range ("[0 : 9]") or an expression that uses a loop variable
+    ("i * [2, 0, 0]").
+
+    Expressions are compared by their code.
+    """
+
+    def __init__(self, code):
+        if not isinstance(code, str):
+            raise TypeError("code must be a string")
+        self._code = code
+
+    @property
+    def code(self):
+        return self._code
+
+    def __eq__(self, other):
+        return isinstance(other, ScadExpression) and other._code == self._code
+
+    def __hash__(self):
+        return hash((ScadExpression, self._code))
+
+    def __repr__(self):
+        return f"ScadExpression({self._code!r})"
 
 class ScadObject():
     """
     Note that Vector is not supported as a type to enforce consistent value types. Use list instead.
+
+    ScadObjects are hashable. The hash is calculated when it is first requested
+    and cached, so ScadObjects must not be changed after they are created.
     """
 
+    # The hash is calculated when it is first requested
+    _hash = None
+
     def __init__(self, id, parameters, kw_parameters, children, comment = None):
         # Default values
         parameters    = parameters    or []
@@ -60,13 +128,51 @@ class ScadObject():
 
 
 
+    def _shallow_key(self):
+        """Return a tuple of the values that define this object, except for
+        the children."""
+        return (self._id,
+            _frozen(self._parameters),
+            _frozen(self._kw_parameters),
+            self._comment)
+
+    def _key(self):
+        return self._shallow_key() + (tuple(self._children), )
+
     def __eq__(self, other):
-        return (isinstance(other, ScadObject)
-            and other._id            == self._id
-            and other._parameters    == self._parameters
-            and other._kw_parameters == self._kw_parameters
-            and other._children      == self._children
-            and other._comment       == self._comment)
+        # Compare the children with an explicit stack rather than recursively.
+        # Only compare the keys if the (cached) hashes are equal.
+        stack = [(self, other)]
+        while stack:
+            a, b = stack.pop()
+            if a is b:
+                continue
+            if not (isinstance(b, ScadObject)
+                    and hash(a) == hash(b)
+                    and a._shallow_key() == b._shallow_key()
+                    and len(a._children) == len(b._children)):
+                return False
+            stack.extend(zip(a._children, b._children))
+
+        return True
+
+    def __hash__(self):
+        if self._hash is None:
+            # Calculate the hashes of the children first, so hashing the key
+            # does not recurse
+            def calculate(node, _):
+                if node._hash is None:
+                    node._hash = hash(node._key())
+
+            reduce_tree(self, lambda node: [] if node._hash is not None else node._children, calculate)
+        return self._hash
+
+    def __getstate__(self):
+        # The hash depends on the process (string hashes are randomized), so
+        # it must not be pickled.
+        state = self.__dict__.copy()
+        state.pop("_hash", None)
+        return state
 
     def __repr__(self):
         if self._comment is None:
@@ -84,13 +190,14 @@ class ScadObject():
                 repr(self._comment))
 
     def to_tree(self):
-        children_nodes = [child.to_tree() for child in self._children]
-
-        return Node(self._head(), children_nodes)
+        return reduce_tree(self, lambda node: node._children, lambda node, children: Node(node._head(), children))
 
     @staticmethod
     def render_value(value):
-        if isinstance(value, Number):
+        if isinstance(value, ScadExpression):
+            return value.code
+
+        elif isinstance(value, Number):
             return str(value)
 
         elif isinstance(value, str):
@@ -124,11 +231,18 @@ class ScadObject():
             return "{}({})".format(self._id, ", ".join(all_parameters))
 
     def _lines(self, indent, top_indent, simplify, include_comments):
-        result = []
+        return list(self._iter_lines(indent, top_indent, simplify, include_comments))
+
+    def _head_lines(self, indent, top_indent, simplify, include_comments, depth):
+        """Return the lines of code of this object before its children (the
+        comment and the head line), and the line after the children (or None),
+        at the given depth."""
+        prefix = top_indent + indent * depth
 
+        lines = []
         if include_comments and self._comment is not None:
             for line in self._comment.split("\n"):
-                result.append(top_indent + "// " + line)
+                lines.append(prefix + "// " + line)
 
         # Head line and start of block
         head_line = self._head()
@@ -141,20 +255,34 @@ class ScadObject():
             if head_line != "":
                 head_line += " "
             head_line += "{"
-            foot_line = "}"
-
-        result.append(top_indent + head_line)
-
-        # Children
-        for child in self._children:
-            for line in child._lines(indent, "", simplify, include_comments):
-                result.append(top_indent + indent + line)
-
-        # End of block
-        if foot_line is not None:
-            result.append(top_indent + foot_line)
-
-        return result
+            foot_line = prefix + "}"
+
+        lines.append(prefix + head_line)
+        return lines, foot_line
+
+    def _iter_lines(self, indent, top_indent, simplify, include_comments, depth = 0):
+        """Generate the lines of code for this object and its children.
+
+        Each line is generated once, with the indent prefix computed from the
+        depth, so no intermediate line lists are built for the subtrees. The
+        tree is traversed with an explicit stack, so its depth is not limited
+        by the recursion limit.
+        """
+        # The iterators over the remaining children of the open blocks, with
+        # the depth of the children and the line that closes the block
+        stack = [(iter([self]), depth, None)]
+        while stack:
+            children, child_depth, foot_line = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if foot_line is not None:
+                    yield foot_line
+                continue
+
+            lines, child_foot_line = child._head_lines(indent, top_indent, simplify, include_comments, child_depth)
+            yield from lines
+            stack.append((iter(child._children), child_depth + 1, child_foot_line))
 
     def to_scad(self):
         return self
@@ -165,3 +293,21 @@ class ScadObject():
             return " ".join(self._lines("", "", simplify, False))
         else:
             return "\n".join(self._lines(indent, top_indent, simplify, True))
+
+    def write_to(self, stream, indent = "    ", top_indent = "", inline = False, simplify = False):
+        """Write the code to a text stream, without building it in memory.
+
+        The written text is identical to the result of to_code with the same
+        parameters.
+        """
+        if inline:
+            lines = self._iter_lines("", "", simplify, False)
+            separator = " "
+        else:
+            lines = self._iter_lines(indent, top_indent, simplify, True)
+            separator = "\n"
+
+        for index, line in enumerate(lines):
+            if index > 0:
+                stream.write(separator)
+            stream.write(line)
@@ -1,9 +1,22 @@
 from cadlib.transform.transform import Transform
-from cadlib.util.tree import Node
-from cadlib.util import Matrix
+from cadlib.util import matrix
+from cadlib.util.shared_sequence import SharedSequence
 from cadlib.scad import ScadObject
 
 class Chained(Transform):
+    """A sequence of transforms, applied from last to first.
+
+    Chains can be extended at either end (by multiplying them with a
+    transform) in amortized constant time: the transforms are stored in two
+    SharedSequences, one for the transforms prepended to the chain (in reverse
+    order) and one for the rest. The matrix of an extended chain is calculated
+    from the matrix of the original chain, so it is available in constant time
+    as well.
+    """
+
+    # The list of transforms, created from the sequences when first requested
+    _transforms_list = None
+
     def __init__(self, transforms):
         transforms = list(transforms)
 
@@ -12,23 +25,49 @@ class Chained(Transform):
             if not isinstance(transform, Transform):
                 raise TypeError("Children of chained transform must be transform.")
 
-        self._transforms = transforms
+        self._front = SharedSequence() # Reversed
+        self._back = SharedSequence(transforms)
+
+    @classmethod
+    def _create(cls, front, back, matrix):
+        result = cls.__new__(cls)
+        result._front = front
+        result._back = back
+        result._matrix = matrix
+        return result
+
+    def _prepended(self, transforms, transforms_matrix):
+        """Create a chain with transforms (with the combined matrix
+        transforms_matrix) inserted at the beginning."""
+        return Chained._create(self._front.extended(reversed(transforms)), self._back,
+            transforms_matrix * self.to_matrix())
+
+    def _appended(self, transforms, transforms_matrix):
+        """Create a chain with transforms (with the combined matrix
+        transforms_matrix) appended."""
+        return Chained._create(self._front, self._back.extended(transforms),
+            self.to_matrix() * transforms_matrix)
+
+    @property
+    def _transforms(self):
+        if self._transforms_list is None:
+            self._transforms_list = self._front.to_list()[::-1] + self._back.to_list()
+        return self._transforms_list
 
     @property
     def transforms(self):
         return self._transforms
 
-    def __eq__(self, other):
-        return (isinstance(other, Chained)
-            and other._transforms == self._transforms)
+    def _key(self):
+        return tuple(self._transforms)
 
     def __mul__(self, other):
         if isinstance(other, Chained):
             # Chained * Chained - merge chains
-            return Chained(self._transforms + other._transforms)
+            return self._appended(other._transforms, other.to_matrix())
         elif isinstance(other, Transform):
             # Chained * Transform - append to chain
-            return Chained(self._transforms + [other])
+            return self._appended([other], other.to_matrix())
         else:
             # Chained * other - defer to superclass
             return super().__mul__(other)
@@ -37,7 +76,7 @@ class Chained(Transform):
         # other cannot be a Chained: Chained * Chained calls Chained.__add__.
         if isinstance(other, Transform):
             # Transform * Chained (deferred from Transform.__mul__) - prepend to chain
-            return Chained([other] + self._transforms)
+            return self._prepended([other], other.to_matrix())
         else:
             # Other * Chained - unknown (no __rmul__ in superclass)
             return NotImplemented
@@ -49,14 +88,46 @@ class Chained(Transform):
         transform_representations = (repr(tf) for tf in self._transforms)
         return f"Chained([{', '.join(transform_representations)}])"
 
-    def to_tree(self):
-        return Node(self, [tf.to_tree() for tf in self._transforms])
+    def _tree_children(self):
+        return self._transforms
 
     def inverse(self):
         transforms = reversed(self._transforms)
         transforms = (tf.inverse() for tf in transforms)
         return Chained(transforms)
 
+    def collapsed(self, tolerance = None):
+        if len(self._transforms) == 0:
+            return self
+        elif len(self._transforms) == 1:
+            return self._transforms[0].collapsed(tolerance)
+        else:
+            return self._collapse_to_matrix(tolerance)
+
+    def folded(self):
+        result = []
+        for transform in self._transforms:
+            transform = transform.folded()
+            parts = transform._transforms if isinstance(transform, Chained) else [transform]
+
+            for part in parts:
+                # Merge with the previous transform if possible
+                if len(result) > 0:
+                    merged = result[-1]._fold(part)
+                    if merged is not None:
+                        result.pop()
+                        part = merged
+
+                if not part.is_identity:
+                    result.append(part)
+
+        if len(result) == 1:
+            return result[0]
+        elif result == self._transforms:
+            return self
+        else:
+            return Chained(result)
+
     def to_scad(self, target):
         if len(self._transforms) == 0 and target is None:
             # Special case: this would result in a return value of None. Return
@@ -68,8 +139,8 @@ class Chained(Transform):
                 result = transform.to_scad(result)
             return result
 
-    def to_matrix(self):
-        result = Matrix.identity(4)
+    def _calculate_matrix(self):
+        result = matrix.identity(4)
         for transform in self._transforms:
             result = result * transform.to_matrix()
         return result
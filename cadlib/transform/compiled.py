@@ -0,0 +1,82 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from cadlib.util.vector import Vector3
+
+
+class CompiledTransform:
+    """A transform reduced to its matrix, for applying it to many points.
+
+    Create instances with Transform.compile. The matrix is calculated once, so
+    a CompiledTransform can be re-used for any number of points without
+    referring back to the transform.
+    """
+
+    def __init__(self, matrix):
+        """Create a compiled transform from a 4x4 matrix in homogeneous
+        coordinates."""
+        if matrix.dimensions != (4, 4):
+            raise ValueError(f"Transform matrices must be 4x4, not {matrix.dimensions}")
+
+        self._matrix = matrix
+        self._rows = [tuple(row) for row in matrix.row_values]
+        self._affine = self._rows[3] == (0, 0, 0, 1)
+        self._array = None
+
+    @property
+    def matrix(self):
+        return self._matrix
+
+    def apply(self, point):
+        """Transform a single point, given as a Vector or as a sequence of 3
+        numbers. The result is a Vector."""
+        return self.apply_many([point])[0]
+
+    def apply_many(self, points):
+        """Transform multiple points.
+
+        points can be an iterable of Vectors or sequences of 3 numbers, in which
+        case the result is a list of Vectors, or an (N, 3) NumPy array, in which
+        case the result is an (N, 3) NumPy array.
+        """
+        if numpy is not None and isinstance(points, numpy.ndarray):
+            return self._apply_array(points)
+
+        (a00, a01, a02, a03), (a10, a11, a12, a13), (a20, a21, a22, a23), (a30, a31, a32, a33) = self._rows
+
+        result = []
+        for x, y, z in points:
+            w = a30*x + a31*y + a32*z + a33
+            if w == 0:
+                raise ValueError(f"last component of homogeneous vector is 0 for {[x, y, z]}")
+
+            result.append(Vector3._make(
+                (a00*x + a01*y + a02*z + a03) / w,
+                (a10*x + a11*y + a12*z + a13) / w,
+                (a20*x + a21*y + a22*z + a23) / w))
+
+        return result
+
+    def _apply_array(self, points):
+        if points.ndim != 2 or points.shape[1] != 3:
+            raise ValueError(f"Points must be an (N, 3) array, not {points.shape}")
+
+        if self._array is None:
+            self._array = numpy.array(self._rows, dtype = numpy.float64)
+
+        linear      = self._array[:3, :3]
+        translation = self._array[:3, 3]
+        result = points @ linear.T + translation
+
+        if not self._affine:
+            w = points @ self._array[3, :3] + self._array[3, 3]
+            if numpy.any(w == 0):
+                raise ValueError("last component of homogeneous vector is 0")
+            result /= w[:, numpy.newaxis]
+
+        return result
+
+    def __repr__(self):
+        return f"CompiledTransform({self._matrix!r})"
@@ -11,3 +11,5 @@ from .scale_axis_factor import ScaleAxisFactor
 from .scale_uniform     import ScaleUniform
 
 from .translate import Translate
+
+from .matrix_transform import MatrixTransform
@@ -0,0 +1,102 @@
+import math
+
+from cadlib.util import Matrix, degree
+from cadlib.util.geometry import affine_inverse
+from cadlib.scad import ScadObject
+from cadlib.transform import Transform, Chained
+from cadlib.transform.primitives import RotateXyz, ScaleAxes, Translate
+
+
+class MatrixTransform(Transform):
+    """An arbitrary affine transform, described by its 4x4 matrix.
+
+    In OpenSCAD, this is a multmatrix.
+    """
+
+    def __init__(self, matrix):
+        if not isinstance(matrix, Matrix):
+            raise TypeError("matrix must be a Matrix")
+        if matrix.dimensions != (4, 4):
+            raise ValueError(f"matrix must be 4x4, not {matrix.dimensions}")
+        if matrix.row_values[3] != [0, 0, 0, 1]:
+            raise ValueError("matrix must describe an affine transform")
+
+        self._affine = matrix
+
+    def _key(self):
+        return (self._affine, )
+
+    def __str__(self):
+        return "Multiply by matrix"
+
+    def __repr__(self):
+        return f"MatrixTransform({self._affine!r})"
+
+    def inverse(self):
+        return MatrixTransform(affine_inverse(self._affine))
+
+    def to_scad(self, target):
+        children = [target] if target is not None else []
+        return ScadObject("multmatrix", [self._affine.row_values], None, children)
+
+    def _calculate_matrix(self):
+        return self._affine
+
+    def simplified(self, tolerance):
+        """Try to express the matrix with translations, rotations, and scales.
+
+        The matrix is decomposed into a translation, an XYZ rotation, and an
+        axis-aligned scale (each of which is omitted if it has no effect). If
+        the resulting transform differs from the matrix by more than tolerance
+        in any element, the decomposition is not possible and self is returned.
+        Values that are within tolerance of an integer are rounded.
+        """
+        def snap(value):
+            rounded = round(value)
+            return int(rounded) if abs(value - rounded) <= tolerance else value
+
+        (a00, a01, a02, tx), (a10, a11, a12, ty), (a20, a21, a22, tz), _ = self._affine.row_values
+
+        # The scale factors are the lengths of the columns. Since negative
+        # scales would be indistinguishable from rotations, they are not
+        # detected.
+        columns = [[a00, a10, a20], [a01, a11, a21], [a02, a12, a22]]
+        scales = [math.sqrt(sum(x ** 2 for x in column)) for column in columns]
+        if min(scales) == 0:
+            return self
+
+        # The rotation part, assuming an XYZ rotation, i. e. Rz * Ry * Rx
+        (r00, r01, r02), (r10, r11, r12), (r20, r21, r22) = zip(*([x / s for x in column] for column, s in zip(columns, scales)))
+        if abs(r20) < 1:
+            x = math.atan2(r21, r22)
+            y = math.asin(-r20)
+            z = math.atan2(r10, r00)
+        else:
+            # Gimbal lock: only the sum or difference of x and z is known
+            x = 0
+            y = math.copysign(math.pi / 2, -r20)
+            z = math.atan2(-r01, r11)
+
+        translation = [snap(v) for v in [tx, ty, tz]]
+        rotation    = [snap(v / degree) for v in [x, y, z]]
+        scale       = [snap(v) for v in scales]
+
+        transforms = []
+        if translation != [0, 0, 0]: transforms.append(Translate(translation))
+        if rotation    != [0, 0, 0]: transforms.append(RotateXyz(*rotation))
+        if scale       != [1, 1, 1]: transforms.append(ScaleAxes(*scale))
+
+        if len(transforms) == 1:
+            result = transforms[0]
+        else:
+            result = Chained(transforms)
+
+        # Make sure that the decomposition is actually equivalent
+        actual = result.to_matrix().row_values
+        expected = self._affine.row_values
+        for actual_row, expected_row in zip(actual, expected):
+            for a, e in zip(actual_row, expected_row):
+                if abs(a - e) > tolerance:
+                    return self
+
+        return result
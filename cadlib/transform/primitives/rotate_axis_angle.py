@@ -1,6 +1,7 @@
 import math
 
-from cadlib.util import Vector, Matrix, degree
+from cadlib.util import Vector, degree
+from cadlib.util import matrix
 from cadlib.scad import ScadObject
 from cadlib.transform import Transform
 from cadlib.util import number
@@ -14,10 +15,8 @@ class RotateAxisAngle(Transform):
         self._axis  = axis
         self._angle = number.convert(angle, "angle", default=self._axis.length)
 
-    def __eq__(self, other):
-        return (isinstance(other, RotateAxisAngle)
-            and self._axis  == other._axis
-            and self._angle == other._angle)
+    def _key(self):
+        return (self._axis, self._angle)
 
     def __str__(self):
         return "Rotate by {}° around {}".format(self._angle, self._axis)
@@ -28,17 +27,26 @@ class RotateAxisAngle(Transform):
     def inverse(self):
         return RotateAxisAngle(-self._axis, self._angle)
 
+    def _fold(self, other):
+        # Rotations around the same axis
+        if isinstance(other, RotateAxisAngle) and self._axis.collinear(other._axis):
+            if self._axis.dot(other._axis) > 0:
+                return RotateAxisAngle(self._axis, self._angle + other._angle)
+            else:
+                return RotateAxisAngle(self._axis, self._angle - other._angle)
+        return None
+
     def to_scad(self, target):
         children = [target] if target is not None else []
         return ScadObject("rotate", None, [("a", self._angle), ("v", list(self._axis))], children)
 
-    def to_matrix(self):
+    def _calculate_matrix(self):
         s = math.sin(self._angle * degree)
         c = math.cos(self._angle * degree)
         C = 1 - c
         x, y, z = self._axis.normalized()
 
-        return Matrix(rows = [
+        return matrix.create(rows = [
             [x*x*C + c  , x*y*C - z*s, x*z*C + y*s, 0],
             [y*x*C + z*s, y*y*C + c  , y*z*C - x*s, 0],
             [z*x*C - y*s, z*y*C + x*s, z*z*C + c  , 0],
@@ -1,10 +1,13 @@
 from warnings import warn
 
-from cadlib.util import Vector, Matrix, degree
+from cadlib.util import Vector, degree
+from cadlib.util import matrix
 from cadlib.transform import Transform
 from cadlib.transform.primitives import RotateAxisAngle, RotateXyz
 
 class RotateFromTo(Transform):
+    _axis_angle = None
+
     def __init__(self, frm, to, ignore_ambiguity = False):
         frm = Vector.convert(frm, "frm", required_length=3)
         to  = Vector.convert(to , "to" , required_length=3)
@@ -22,10 +25,8 @@ class RotateFromTo(Transform):
         self._frm = frm
         self._to  = to
 
-    def __eq__(self, other):
-        return (isinstance(other, RotateFromTo)
-            and self._frm == other._frm
-            and self._to  == other._to)
+    def _key(self):
+        return (self._frm, self._to)
 
     def __str__(self):
         return "Rotate from {} to {}".format(self._frm, self._to)
@@ -37,6 +38,12 @@ class RotateFromTo(Transform):
         return RotateFromTo(self._to, self._frm)
 
     def _to_axis_angle(self):
+        # Cached, like the matrix
+        if self._axis_angle is None:
+            self._axis_angle = self._calculate_axis_angle()
+        return self._axis_angle
+
+    def _calculate_axis_angle(self):
         if self._frm.collinear(self._to):
             # Special case: the vectors are collinear
             if self._frm.dot(self._to) > 0:
@@ -67,12 +74,12 @@ class RotateFromTo(Transform):
             # Yes rotation
             return RotateAxisAngle(axis.normalized(), angle).to_scad(target).comment(str(self))
 
-    def to_matrix(self):
+    def _calculate_matrix(self):
         axis, angle = self._to_axis_angle()
 
         if axis is None:
             # No rotation
-            return Matrix.identity(4)
+            return matrix.identity(4)
         else:
             # Yes rotation
             return RotateAxisAngle(axis, angle).to_matrix()
@@ -11,9 +11,8 @@ class RotateXyz(Transform):
         z = number.convert(z, "z")
         self._xyz = [x, y, z]
 
-    def __eq__(self, other):
-        return (isinstance(other, RotateXyz)
-            and self._xyz == other._xyz)
+    def _key(self):
+        return tuple(self._xyz)
 
     def __str__(self):
         x, y, z = self._xyz
@@ -41,10 +40,23 @@ class RotateXyz(Transform):
         x, y, z = self._xyz
         return RotateXyz(-x, 0, 0) * RotateXyz(0, -y, 0) * RotateXyz(0, 0, -z)
 
+    def _single_axis(self):
+        """The index of the only axis with a non-zero angle, or None."""
+        axes = [index for index, angle in enumerate(self._xyz) if angle != 0]
+        return axes[0] if len(axes) == 1 else None
+
+    def _fold(self, other):
+        # Rotations around the same axis
+        if isinstance(other, RotateXyz):
+            axis = self._single_axis()
+            if axis is not None and axis == other._single_axis():
+                return RotateXyz(*(a + b for a, b in zip(self._xyz, other._xyz)))
+        return None
+
     def to_scad(self, target):
         children = [target] if target is not None else []
         return ScadObject("rotate", [list(self._xyz)], None, children)
 
-    def to_matrix(self):
+    def _calculate_matrix(self):
         x, y, z = self._xyz
         return rotation_matrix(2, z*degree) * rotation_matrix(1, y*degree) * rotation_matrix(0, x*degree)
@@ -7,15 +7,16 @@ from cadlib.util import degree
 
 
 class RotateYpr(Transform):
+    _equivalent_transform = None
+
     def __init__(self, yaw, pitch, roll):
         yaw   = number.convert(yaw, "yaw")
         pitch = number.convert(pitch, "pitch")
         roll  = number.convert(roll, "roll")
         self._ypr = [yaw, pitch, roll]
 
-    def __eq__(self, other):
-        return (isinstance(other, RotateYpr)
-            and self._ypr == other._ypr)
+    def _key(self):
+        return tuple(self._ypr)
 
     def __str__(self):
         y, p, r = self._ypr
@@ -39,14 +40,25 @@ class RotateYpr(Transform):
         return RotateYpr(0, 0, -r) * RotateYpr(0, -p, 0) * RotateYpr(-y, 0, 0)
 
     def _equivalent(self):
-        yaw, pitch, roll = self._ypr
+        # Cached, like the matrix
+        if self._equivalent_transform is None:
+            yaw, pitch, roll = self._ypr
+
+            # yaw-pitch-roll in local coordinates corresponds to roll-pitch-yaw
+            # in global coordinates.
+            transforms = []
+            if yaw != 0 or pitch != 0: transforms.append(RotateXyz(pitch, 0   , yaw))
+            if roll != 0             : transforms.append(RotateXyz(0    , roll, 0  ))
+            self._equivalent_transform = Chained(transforms)
 
-        # yaw-pitch-roll in local coordinates corresponds to roll-pitch-yaw in
-        # global coordinates.
-        transforms = []
-        if yaw != 0 or pitch != 0: transforms.append(RotateXyz(pitch, 0   , yaw))
-        if roll != 0             : transforms.append(RotateXyz(0    , roll, 0  ))
-        return Chained(transforms)
+        return self._equivalent_transform
+
+    def collapsed(self, tolerance = None):
+        if len(self._equivalent().transforms) <= 1 and tolerance is None:
+            # Already a single rotation
+            return self
+        else:
+            return self._collapse_to_matrix(tolerance)
 
     def to_scad(self, target):
         equivalent = self._equivalent()
@@ -60,7 +72,7 @@ class RotateYpr(Transform):
 
         return equivalent.to_scad(target).comment(str(self))
 
-    def to_matrix(self):
+    def _calculate_matrix(self):
         # Alternative - direct generation:
         # return rotation_matrix(2, yaw*degree) * rotation_matrix(0, pitch*degree) * rotation_matrix(1, roll*degree)
 
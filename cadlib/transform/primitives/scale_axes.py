@@ -1,6 +1,6 @@
 from warnings import warn
 
-from cadlib.util import Matrix
+from cadlib.util import matrix
 from cadlib.scad import ScadObject
 from cadlib.transform import Transform
 from cadlib.util import number
@@ -19,9 +19,8 @@ class ScaleAxes(Transform):
         # TODO property name (can also be two-dimensional)
         self._xyz = [x, y, z]
 
-    def __eq__(self, other):
-        return (isinstance(other, ScaleAxes)
-            and other._xyz == self._xyz)
+    def _key(self):
+        return tuple(self._xyz)
 
     def __repr__(self):
         x, y, z = self._xyz
@@ -49,13 +48,22 @@ class ScaleAxes(Transform):
         x, y, z = self._xyz
         return ScaleAxes(1 / x, 1 / y, 1 / z)
 
+    def _fold(self, other):
+        from cadlib.transform.primitives import ScaleUniform
+
+        if isinstance(other, ScaleAxes):
+            return ScaleAxes(*(a * b for a, b in zip(self._xyz, other._xyz)))
+        elif isinstance(other, ScaleUniform):
+            return ScaleAxes(*(x * other._factor for x in self._xyz))
+        return None
+
     def to_scad(self, target):
         children = [target] if target is not None else []
         return ScadObject("scale", [self._xyz], None, children)
 
-    def to_matrix(self):
+    def _calculate_matrix(self):
         x, y, z = self._xyz
-        return Matrix(rows=[
+        return matrix.create(rows=[
             [x, 0, 0, 0],
             [0, y, 0, 0],
             [0, 0, z, 0],
@@ -8,6 +8,8 @@ from cadlib.util.vector import X, Y, Z
 from cadlib.transform.primitives import ScaleAxes, RotateFromTo
 
 class ScaleAxisFactor(Transform):
+    _equivalent_transform = None
+
     def __init__(self, axis, factor):
         axis = Vector.convert(axis, "axis", required_length=3)
         if axis.is_zero:
@@ -19,10 +21,8 @@ class ScaleAxisFactor(Transform):
         if self._factor == 0: warn("factor is 0")
 
 
-    def __eq__(self, other):
-        return (isinstance(other, ScaleAxisFactor)
-            and other._axis   == self._axis
-            and other._factor == self._factor)
+    def _key(self):
+        return (self._axis, self._factor)
 
     def __str__(self):
         return f"Scale by {self._factor} along {self._axis}"
@@ -34,13 +34,24 @@ class ScaleAxisFactor(Transform):
         return ScaleAxisFactor(self._axis, 1 / self._factor)
 
     def _equivalent(self):
-        transform_axis = self._axis.closest_axis()
+        # Cached, like the matrix
+        if self._equivalent_transform is None:
+            transform_axis = self._axis.closest_axis()
+
+            forward_rotation = RotateFromTo(self._axis, transform_axis)
+            scale = ScaleAxes(*(transform_axis * self._factor).replace(0, 1))
+            back_rotation = RotateFromTo(transform_axis, self._axis)
+
+            self._equivalent_transform = back_rotation * scale * forward_rotation
 
-        forward_rotation = RotateFromTo(self._axis, transform_axis)
-        scale = ScaleAxes(*(transform_axis * self._factor).replace(0, 1))
-        back_rotation = RotateFromTo(transform_axis, self._axis)
+        return self._equivalent_transform
 
-        return back_rotation * scale * forward_rotation
+    def collapsed(self, tolerance = None):
+        if self._factor == 1 or any(self._axis.collinear(axis) for axis in [X, Y, Z]):
+            # Already a single scale (see to_scad)
+            return self
+        else:
+            return self._collapse_to_matrix(tolerance)
 
     def to_scad(self, target):
         # Since OpenSCAD does not have axis/factor scaling, it has to be
@@ -67,6 +78,6 @@ class ScaleAxisFactor(Transform):
         # General case
         return self._equivalent().to_scad(target).comment(comment)
 
-    def to_matrix(self):
+    def _calculate_matrix(self):
         # No special-case handling here, the result would be identical
         return self._equivalent().to_matrix()
@@ -1,6 +1,6 @@
 from warnings import warn
 
-from cadlib.util import Matrix
+from cadlib.util import matrix
 from cadlib.scad import ScadObject
 from cadlib.transform import Transform
 from cadlib.util import number
@@ -12,9 +12,8 @@ class ScaleUniform(Transform):
         if self._factor == 0: warn("factor is 0")
 
 
-    def __eq__(self, other):
-        return (isinstance(other, ScaleUniform)
-            and other._factor == self._factor)
+    def _key(self):
+        return (self._factor, )
 
     def __str__(self):
         return "Scale by {}".format(self._factor)
@@ -25,14 +24,23 @@ class ScaleUniform(Transform):
     def inverse(self):
         return ScaleUniform(1 / self._factor)
 
+    def _fold(self, other):
+        from cadlib.transform.primitives import ScaleAxes
+
+        if isinstance(other, ScaleUniform):
+            return ScaleUniform(self._factor * other._factor)
+        elif isinstance(other, ScaleAxes):
+            return ScaleAxes(*(self._factor * x for x in other._xyz))
+        return None
+
     def to_scad(self, target):
         children = [target] if target is not None else []
         f = self._factor
         return ScadObject("scale", [[f, f, f]], None, children, repr(self))
 
-    def to_matrix(self):
+    def _calculate_matrix(self):
         f = self._factor
-        return Matrix(rows = [
+        return matrix.create(rows = [
             [f, 0, 0, 0],
             [0, f, 0, 0],
             [0, 0, f, 0],
@@ -1,4 +1,5 @@
-from cadlib.util import Vector, Matrix
+from cadlib.util import Vector
+from cadlib.util import matrix
 from cadlib.scad import ScadObject
 from cadlib.transform import Transform
 
@@ -7,9 +8,8 @@ class Translate(Transform):
     def __init__(self, vector):
         self._vector = Vector.convert(vector, "vector", required_length=3)
 
-    def __eq__(self, other):
-        return (isinstance(other, Translate)
-            and other._vector == self._vector)
+    def _key(self):
+        return (self._vector, )
 
     def __str__(self):
         return "Translate by {}".format(self._vector)
@@ -20,13 +20,18 @@ class Translate(Transform):
     def inverse(self):
         return Translate(-self._vector)
 
+    def _fold(self, other):
+        if isinstance(other, Translate):
+            return Translate(self._vector + other._vector)
+        return None
+
     def to_scad(self, target):
         children = [target] if target is not None else []
         return ScadObject("translate", [list(self._vector)], None, children)
 
-    def to_matrix(self):
+    def _calculate_matrix(self):
         x, y, z = self._vector
-        return Matrix(rows = [
+        return matrix.create(rows = [
             [1, 0, 0, x],
             [0, 1, 0, y],
             [0, 0, 1, z],
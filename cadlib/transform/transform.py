@@ -1,5 +1,6 @@
 from cadlib.util import Vector
-from cadlib.util.tree import Node
+from cadlib.util.tree import Node, reduce_tree
+from cadlib.util.digest import structural_digest
 
 # Multiplying transforms:
 #
@@ -34,6 +35,59 @@ from cadlib.util.tree import Node
 # The solution is basically the same as described in object.py.
 
 class Transform:
+    """A description of a transform. Transform instances are immutable.
+
+    Implementations must override inverse, to_scad, _calculate_matrix, and
+    _key.
+
+    Transforms are hashable; like for objects (see Object), the hash is
+    cached.
+    """
+
+    # The matrix, the inverse matrix, and the hash are calculated when they are
+    # first requested. Since transforms are immutable, the cached values never
+    # have to be invalidated.
+    _matrix = None
+    _inverse_matrix = None
+    _hash = None
+    _digest = None
+
+    def _key(self):
+        """Return a tuple of the values that define this transform. See
+        Object._key; transforms of classes that don't implement this method
+        are only equal to themselves."""
+        raise NotImplementedError("_key not implemented in {}".format(type(self)))
+
+    def _has_key(self):
+        """Whether the class of this transform implements _key."""
+        return type(self)._key is not Transform._key
+
+    def __eq__(self, other):
+        return (other is self) or (type(other) is type(self) and self._has_key()
+            and hash(other) == hash(self)
+            and other._key() == self._key())
+
+    def __hash__(self):
+        if self._hash is None:
+            if self._has_key():
+                self._hash = hash((type(self), self._key()))
+            else:
+                self._hash = object.__hash__(self)
+        return self._hash
+
+    def __getstate__(self):
+        # See Object.__getstate__
+        state = self.__dict__.copy()
+        state.pop("_hash", None)
+        return state
+
+    def digest(self):
+        """Return a digest of the structure of this transform. See
+        Object.digest."""
+        if self._digest is None:
+            self._digest = structural_digest(self, self._key())
+        return self._digest
+
     def __mul__(self, other):
         from cadlib.transform.chained import Chained
         from cadlib.object import Object, Transformed
@@ -59,8 +113,81 @@ class Transform:
             # Transform * other - unknown
             return NotImplemented
 
+    def _tree_children(self):
+        """Return the transforms that are represented as child nodes by
+        to_tree. The default implementation returns an empty list."""
+        return []
+
     def to_tree(self):
-        return Node(self, [])
+        return reduce_tree(self, lambda node: node._tree_children(), Node)
+
+    def collapsed(self, tolerance = None):
+        """Return an equivalent transform that is exported to OpenSCAD as a
+        single node, if that is not already the case.
+
+        Transforms that would be exported as multiple nodes are replaced by a
+        MatrixTransform. If tolerance is given, the matrix is converted back to
+        a translation, rotation, and/or scale if possible (see
+        MatrixTransform.simplified).
+
+        The default implementation returns self.
+        """
+        return self
+
+    @property
+    def is_identity(self):
+        """Whether the matrix of this transform is exactly the identity."""
+        from cadlib.util import matrix
+        return self.to_matrix() == matrix.identity(4)
+
+    def folded(self):
+        """Return an equivalent transform that is exported to OpenSCAD with
+        fewer nodes, if possible.
+
+        Identity transforms are replaced with an empty Chained, and consecutive
+        transforms of a chain that can be expressed as a single transform (e. g.
+        two translations) are merged (see _fold). Unlike collapsed, this never
+        introduces a matrix transform.
+
+        The default implementation replaces identity transforms.
+        """
+        from cadlib.transform.chained import Chained
+
+        if self.is_identity:
+            return Chained([])
+        return self
+
+    def _fold(self, other):
+        """Return a single transform that is equivalent to self * other, or
+        None if there is none (of the same kind as the operands).
+
+        The default implementation returns None.
+        """
+        return None
+
+    def _collapse_to_matrix(self, tolerance):
+        from cadlib.transform.primitives import MatrixTransform
+
+        result = MatrixTransform(self.to_matrix())
+        if tolerance is not None:
+            result = result.simplified(tolerance)
+        return result
+
+    def compile(self):
+        """Create a CompiledTransform for applying this transform to many
+        points."""
+        from cadlib.transform.compiled import CompiledTransform
+        return CompiledTransform(self.to_matrix())
+
+    def apply_many(self, points):
+        """Apply this transform to multiple points.
+
+        The matrix is calculated only once. points can be an iterable of
+        vectors (the result is a list of Vectors) or an (N, 3) NumPy array (the
+        result is an (N, 3) array). If the same transform is applied to points
+        repeatedly, use compile instead.
+        """
+        return self.compile().apply_many(points)
 
     def inverse(self):
         raise NotImplementedError("inverse not implemented in {}".format(type(self)))
@@ -69,4 +196,22 @@ class Transform:
         raise NotImplementedError("to_scad not implemented in {}".format(type(self)))
 
     def to_matrix(self):
+        """Return the 4x4 matrix of this transform in homogeneous coordinates.
+
+        The matrix is calculated on the first call and cached.
+        """
+        if self._matrix is None:
+            self._matrix = self._calculate_matrix()
+        return self._matrix
+
+    def inverse_matrix(self):
+        """Return the matrix of the inverse transform.
+
+        The matrix is calculated on the first call and cached.
+        """
+        if self._inverse_matrix is None:
+            self._inverse_matrix = self.inverse().to_matrix()
+        return self._inverse_matrix
+
+    def _calculate_matrix(self):
         raise NotImplementedError("to_matrix not implemented in {}".format(type(self)))
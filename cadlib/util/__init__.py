@@ -2,6 +2,7 @@ import math
 
 from .matrix import Matrix
 from .vector import Vector, X, Y, Z, origin
+from .bounds import Bounds
 
 degree = math.pi / 180
 
@@ -0,0 +1,231 @@
+import math
+
+from cadlib.util.vector import Vector
+
+
+class Bounds:
+    """An immutable axis-aligned bounding box in 3 dimensions.
+
+    The box is described by its minimum and maximum corner. The coordinates
+    may be infinite to describe unbounded objects. Bounds can also be empty
+    (e.g. for an empty union), in which case there are no corners.
+    """
+
+    ####################
+    ## Initialization ##
+    ####################
+
+    def __init__(self, minimum, maximum):
+        """Create bounds from the minimum and maximum corner.
+
+        ValueError is raised if any coordinate of minimum is greater than the
+        corresponding coordinate of maximum.
+        """
+        minimum = Vector.convert(minimum, "minimum", required_length = 3)
+        maximum = Vector.convert(maximum, "maximum", required_length = 3)
+
+        if any(a > b for a, b in zip(minimum, maximum)):
+            raise ValueError(f"Minimum {minimum} is greater than maximum {maximum}")
+
+        self._minimum = minimum
+        self._maximum = maximum
+
+    @classmethod
+    def empty(cls):
+        """Create empty bounds."""
+        result = cls.__new__(cls)
+        result._minimum = None
+        result._maximum = None
+        return result
+
+    @classmethod
+    def infinite(cls):
+        """Create bounds that contain everything."""
+        return cls([-math.inf] * 3, [math.inf] * 3)
+
+    @classmethod
+    def slab(cls, normal, low, high):
+        """Create the bounds of the region between two planes, i. e. of all
+        points p with low <= n.p <= high, where n is the normalized normal.
+        low and high may be infinite.
+
+        Unless the normal is parallel to an axis, the bounds are infinite.
+        """
+        normal = Vector.convert(normal, "normal", required_length = 3)
+        if normal.is_zero:
+            raise ValueError("Normal vector is zero")
+
+        minimum = [-math.inf] * 3
+        maximum = [ math.inf] * 3
+
+        if normal.snap_to_axis() == normal:
+            _, index = max((abs(v), i) for i, v in enumerate(normal))
+            if normal[index] > 0:
+                minimum[index], maximum[index] = low, high
+            else:
+                minimum[index], maximum[index] = -high, -low
+
+        return cls(minimum, maximum)
+
+    @classmethod
+    def of_points(cls, points):
+        """Create the smallest bounds that contain all points."""
+        points = list(points)
+        if len(points) == 0:
+            return cls.empty()
+
+        return cls(
+            [min(point[i] for point in points) for i in range(3)],
+            [max(point[i] for point in points) for i in range(3)])
+
+
+    ################
+    ## Properties ##
+    ################
+
+    @property
+    def minimum(self):
+        """The minimum corner, or None if the bounds are empty."""
+        return self._minimum
+
+    @property
+    def maximum(self):
+        """The maximum corner, or None if the bounds are empty."""
+        return self._maximum
+
+    @property
+    def is_empty(self):
+        return self._minimum is None
+
+    @property
+    def is_finite(self):
+        """Whether the bounds are non-empty and all coordinates are finite."""
+        return not self.is_empty and all(math.isfinite(x) for x in [*self._minimum, *self._maximum])
+
+    @property
+    def size(self):
+        """The size of the box along each axis, as a Vector."""
+        if self.is_empty:
+            return Vector(0, 0, 0)
+        return self._maximum - self._minimum
+
+    @property
+    def center(self):
+        """The center of the box, or None if the bounds are empty."""
+        if self.is_empty:
+            return None
+        return (self._minimum + self._maximum) / 2
+
+    @property
+    def volume(self):
+        x, y, z = self.size
+        if x == 0 or y == 0 or z == 0:
+            return 0
+        return x * y * z
+
+    def contains(self, point):
+        """Whether a point is inside the box or on its boundary."""
+        if self.is_empty:
+            return False
+        return all(a <= x <= b for a, x, b in zip(self._minimum, point, self._maximum))
+
+    def intersects(self, other):
+        """Whether the boxes overlap (touching counts as overlapping)."""
+        if self.is_empty or other.is_empty:
+            return False
+        return all(a1 <= b2 and a2 <= b1 for a1, b1, a2, b2
+            in zip(self._minimum, self._maximum, other._minimum, other._maximum))
+
+
+    ################
+    ## Comparison ##
+    ################
+
+    def __eq__(self, other):
+        return (isinstance(other, Bounds)
+            and other._minimum == self._minimum
+            and other._maximum == self._maximum)
+
+    def __hash__(self):
+        return hash((self._minimum, self._maximum))
+
+
+    ################
+    ## Operations ##
+    ################
+
+    def union(self, other):
+        """Create the smallest bounds that contain both bounds."""
+        if self.is_empty:
+            return other
+        if other.is_empty:
+            return self
+
+        return Bounds(
+            [min(a, b) for a, b in zip(self._minimum, other._minimum)],
+            [max(a, b) for a, b in zip(self._maximum, other._maximum)])
+
+    def intersection(self, other):
+        """Create the bounds of the region that is contained in both bounds."""
+        if self.is_empty or other.is_empty or not self.intersects(other):
+            return Bounds.empty()
+
+        return Bounds(
+            [max(a, b) for a, b in zip(self._minimum, other._minimum)],
+            [min(a, b) for a, b in zip(self._maximum, other._maximum)])
+
+    def __or__(self, other):
+        if isinstance(other, Bounds):
+            return self.union(other)
+        return NotImplemented
+
+    def __and__(self, other):
+        if isinstance(other, Bounds):
+            return self.intersection(other)
+        return NotImplemented
+
+    def transformed(self, matrix):
+        """Create the bounds of this box transformed by an affine 4x4 matrix
+        in homogeneous coordinates, e. g. the result of Transform.to_matrix.
+
+        The result contains all 8 transformed corners. It is calculated with
+        interval arithmetic, so it is also correct for infinite bounds.
+        """
+        if matrix.dimensions != (4, 4):
+            raise ValueError(f"Transform matrices must be 4x4, not {matrix.dimensions}")
+
+        rows = matrix.row_values
+        if rows[3] != [0, 0, 0, 1]:
+            raise ValueError("Only affine transforms are supported")
+
+        if self.is_empty:
+            return self
+
+        minimum = []
+        maximum = []
+        for row in rows[:3]:
+            low = high = row[3]
+            for factor, a, b in zip(row[:3], self._minimum, self._maximum):
+                # Skip 0 factors to avoid 0 * inf
+                if factor != 0:
+                    low  += min(factor * a, factor * b)
+                    high += max(factor * a, factor * b)
+            minimum.append(low)
+            maximum.append(high)
+
+        return Bounds(minimum, maximum)
+
+
+    #########
+    ## I/O ##
+    #########
+
+    def __repr__(self):
+        if self.is_empty:
+            return "Bounds.empty()"
+        return f"Bounds({self._minimum!r}, {self._maximum!r})"
+
+    def __str__(self):
+        if self.is_empty:
+            return "Empty bounds"
+        return f"Bounds from {self._minimum} to {self._maximum}"
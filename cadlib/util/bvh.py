@@ -0,0 +1,228 @@
+import math
+
+from cadlib.util.bounds import Bounds
+from cadlib.util.vector import Vector
+
+
+class _Node:
+    """A node of a Bvh. Leaf nodes have items; inner nodes have two
+    children."""
+    __slots__ = ("box", "left", "right", "items")
+
+    def __init__(self, box, left = None, right = None, items = None):
+        self.box = box     # (min x, min y, min z, max x, max y, max z)
+        self.left = left
+        self.right = right
+        self.items = items # List of item indices, for leaf nodes
+
+
+def _box(bounds):
+    return (*bounds.minimum, *bounds.maximum)
+
+def _union(a, b):
+    return (min(a[0], b[0]), min(a[1], b[1]), min(a[2], b[2]),
+            max(a[3], b[3]), max(a[4], b[4]), max(a[5], b[5]))
+
+def _overlap(a, b):
+    return (a[0] <= b[3] and b[0] <= a[3]
+        and a[1] <= b[4] and b[1] <= a[4]
+        and a[2] <= b[5] and b[2] <= a[5])
+
+def _center(low, high):
+    # Infinite boxes don't have a center; use a finite coordinate if there is
+    # one, so they can still be sorted.
+    if math.isinf(low) and math.isinf(high):
+        return 0
+    elif math.isinf(low):
+        return high
+    elif math.isinf(high):
+        return low
+    else:
+        return (low + high) / 2
+
+
+class Bvh:
+    """A bounding volume hierarchy for spatial queries over a list of items.
+
+    The items are given by their Bounds, and queries return the indices of the
+    items whose bounds match. Items with empty bounds never match. The tree is
+    built once, by recursively splitting the items at the median along the
+    axis with the largest extent, so queries take logarithmic time (plus the
+    number of results) for items that don't overlap too much.
+
+    The Bvh is immutable. Note that the queries only consider the bounds, so
+    they may return items that don't actually match (but never miss one).
+    """
+
+    # The maximum number of items in a leaf node
+    leaf_size = 4
+
+    def __init__(self, bounds):
+        bounds = list(bounds)
+        for item_bounds in bounds:
+            if not isinstance(item_bounds, Bounds):
+                raise TypeError("Items of a Bvh must be given as Bounds")
+
+        self._count = len(bounds)
+        self._boxes = [None if b.is_empty else _box(b) for b in bounds]
+
+        indices = [index for index, box in enumerate(self._boxes) if box is not None]
+        # The centers of the boxes, separately for each axis, for splitting
+        self._centers = [[_center(box[axis], box[axis + 3]) if box is not None else 0 for box in self._boxes]
+            for axis in range(3)]
+        self._root = self._build(indices) if indices else None
+
+    def _build(self, indices):
+        if len(indices) <= self.leaf_size:
+            box = self._boxes[indices[0]]
+            for index in indices[1:]:
+                box = _union(box, self._boxes[index])
+            return _Node(box, items = indices)
+
+        # Split at the median of the centers along the axis with the largest
+        # extent of the centers
+        extents = []
+        for centers in self._centers:
+            values = [centers[index] for index in indices]
+            extents.append(max(values) - min(values))
+        axis = extents.index(max(extents))
+
+        indices = sorted(indices, key = self._centers[axis].__getitem__)
+        middle = len(indices) // 2
+        left = self._build(indices[:middle])
+        right = self._build(indices[middle:])
+        return _Node(_union(left.box, right.box), left, right)
+
+    def __len__(self):
+        """The number of items (including items with empty bounds)."""
+        return self._count
+
+    @property
+    def bounds(self):
+        """The bounds of all items."""
+        if self._root is None:
+            return Bounds.empty()
+        return Bounds(self._root.box[:3], self._root.box[3:])
+
+    def _leaves(self, visit):
+        """Generate the leaves whose ancestors' (and own) boxes all satisfy
+        visit."""
+        if self._root is None:
+            return
+
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if visit(node.box):
+                if node.items is not None:
+                    yield node
+                else:
+                    stack.append(node.right)
+                    stack.append(node.left)
+
+
+    #############
+    ## Queries ##
+    #############
+
+    def query_box(self, bounds):
+        """Return the sorted indices of the items whose bounds intersect the
+        given Bounds (touching counts as intersecting)."""
+        if bounds.is_empty:
+            return []
+
+        box = _box(bounds)
+        return sorted(index
+            for leaf in self._leaves(lambda node_box: _overlap(node_box, box))
+            for index in leaf.items
+            if _overlap(self._boxes[index], box))
+
+    def query_point(self, point):
+        """Return the sorted indices of the items whose bounds contain the
+        point (including the boundary)."""
+        point = Vector.convert(point, "point", required_length = 3)
+        return self.query_box(Bounds(point, point))
+
+    def query_ray(self, origin, direction, max_distance = math.inf):
+        """Return the indices of the items whose bounds are hit by a ray,
+        ordered by the distance at which the ray enters the bounds.
+
+        The distance is measured in multiples of direction. Bounds that contain
+        the origin are hit at distance 0. Only hits up to max_distance are
+        returned.
+        """
+        origin = Vector.convert(origin, "origin", required_length = 3)
+        direction = Vector.convert(direction, "direction", required_length = 3)
+        if direction.is_zero:
+            raise ValueError("Direction is zero")
+
+        def entry(box):
+            """The distance at which the ray enters the box, or None."""
+            near, far = 0, max_distance
+            for axis in range(3):
+                o, d = origin[axis], direction[axis]
+                low, high = box[axis], box[axis + 3]
+                if d == 0:
+                    if o < low or o > high:
+                        return None
+                else:
+                    t1 = (low - o) / d
+                    t2 = (high - o) / d
+                    if t1 > t2:
+                        t1, t2 = t2, t1
+                    near = max(near, t1)
+                    far = min(far, t2)
+                    if near > far:
+                        return None
+            return near
+
+        hits = []
+        for leaf in self._leaves(lambda node_box: entry(node_box) is not None):
+            for index in leaf.items:
+                distance = entry(self._boxes[index])
+                if distance is not None:
+                    hits.append((distance, index))
+
+        return [index for _, index in sorted(hits)]
+
+    def pairs(self):
+        """Return all pairs (i, j) with i < j of items whose bounds intersect,
+        sorted.
+
+        This is the broad phase of interference checking: only the returned
+        pairs can possibly intersect.
+        """
+        result = []
+        if self._root is None:
+            return result
+
+        def leaf_pairs(items1, items2):
+            for i in items1:
+                for j in items2:
+                    if i != j and _overlap(self._boxes[i], self._boxes[j]):
+                        result.append((min(i, j), max(i, j)))
+
+        # Traverse both subtrees simultaneously; a pair of identical nodes
+        # stands for the pairs within that node
+        stack = [(self._root, self._root)]
+        while stack:
+            a, b = stack.pop()
+            if a is b:
+                if a.items is not None:
+                    leaf_pairs(a.items, a.items)
+                else:
+                    stack.append((a.left, a.left))
+                    stack.append((a.right, a.right))
+                    stack.append((a.left, a.right))
+            elif _overlap(a.box, b.box):
+                if a.items is not None and b.items is not None:
+                    leaf_pairs(a.items, b.items)
+                elif a.items is not None:
+                    stack.append((a, b.left))
+                    stack.append((a, b.right))
+                else:
+                    stack.append((a.left, b))
+                    stack.append((a.right, b))
+
+        # Pairs within a leaf are found twice
+        return sorted(set(result))
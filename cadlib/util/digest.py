@@ -0,0 +1,33 @@
+import hashlib
+
+
+def structural_digest(instance, values):
+    """Calculate a digest of an instance from the values that define it.
+
+    Unlike the built-in hash, the digest is the same in all processes and
+    sessions, so it can be used as a key for persistent caches. The result is a
+    hex string.
+
+    values is an iterable. Values with a digest method (like objects and
+    transforms) contribute their digest, tuples are processed recursively, and
+    all other values contribute their repr, which must be deterministic.
+    """
+    cls = type(instance)
+
+    hasher = hashlib.sha256()
+    hasher.update(f"{cls.__module__}.{cls.__qualname__}".encode())
+    _update(hasher, values)
+    return hasher.hexdigest()
+
+
+def _update(hasher, values):
+    hasher.update(b"(")
+    for value in values:
+        if hasattr(value, "digest"):
+            hasher.update(value.digest().encode())
+        elif isinstance(value, tuple):
+            _update(hasher, value)
+        else:
+            hasher.update(repr(value).encode())
+        hasher.update(b",")
+    hasher.update(b")")
@@ -0,0 +1,50 @@
+import contextlib
+import os
+import tempfile
+
+
+def _default_mode():
+    """Return the permissions of a newly created file, according to the
+    umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+@contextlib.contextmanager
+def replacing(file_name, mode = "w", encoding = None):
+    """Open a file for writing, such that the file is only replaced if the
+    with block completes.
+
+    The data is written to a temporary file in the same directory, which
+    replaces the target file at the end of the with block. If an exception is
+    raised, the temporary file is removed and the target file is not changed,
+    so a failed export does not leave a partial file behind. The file is
+    opened with the given mode (which must be a write mode) and encoding.
+
+    Targets that exist but are not regular files (e.g. os.devnull) are written
+    directly.
+    """
+    if os.path.exists(file_name) and not os.path.isfile(file_name):
+        with open(file_name, mode, encoding = encoding) as file:
+            yield file
+        return
+
+    directory, name = os.path.split(os.path.abspath(file_name))
+    descriptor, temporary = tempfile.mkstemp(prefix = f".{name}.", suffix = ".tmp", dir = directory)
+    try:
+        with open(descriptor, mode, encoding = encoding) as file:
+            yield file
+
+        # Keep the permissions of an existing file; otherwise, use the same
+        # permissions as open (mkstemp creates the file as private)
+        if os.path.exists(file_name):
+            os.chmod(temporary, os.stat(file_name).st_mode & 0o7777)
+        else:
+            os.chmod(temporary, _default_mode())
+
+        os.replace(temporary, file_name)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
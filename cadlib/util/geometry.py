@@ -1,4 +1,4 @@
-from cadlib.util import Matrix
+from cadlib.util import matrix
 import math
 
 
@@ -14,7 +14,7 @@ def affine_matrix(x, y, z, t = None):
     vector.
     """
     t = t or [0, 0, 0]
-    return Matrix(rows = [
+    return matrix.create(rows = [
         [x[0], y[0], z[0], t[0]],
         [x[1], y[1], z[1], t[1]],
         [x[2], y[2], z[2], t[2]],
@@ -47,4 +47,40 @@ def rotation_matrix(axis_index, angle):
     rows[i2][i1] = s
     rows[i2][i2] = c
 
-    return Matrix(rows = rows)
+    return matrix.create(rows = rows)
+
+
+def affine_inverse(affine):
+    """Calculate the inverse of a 4x4 matrix that describes an affine transform.
+
+    The last row of the matrix must be (0, 0, 0, 1). ValueError is raised if the
+    matrix is not affine or not invertible.
+    """
+    (a, b, c, tx), (d, e, f, ty), (g, h, i, tz), last_row = affine.row_values
+
+    if list(last_row) != [0, 0, 0, 1]:
+        raise ValueError("Matrix is not affine")
+
+    # Inverse of the linear part via the adjugate
+    A =   e * i - f * h
+    B = -(d * i - f * g)
+    C =   d * h - e * g
+    determinant = a * A + b * B + c * C
+    if determinant == 0:
+        raise ValueError("Matrix is not invertible")
+
+    linear = [
+        [A / determinant, -(b * i - c * h) / determinant,  (b * f - c * e) / determinant],
+        [B / determinant,  (a * i - c * g) / determinant, -(a * f - c * d) / determinant],
+        [C / determinant, -(a * h - b * g) / determinant,  (a * e - b * d) / determinant],
+    ]
+
+    # The inverse translation is the inverse linear part applied to -t
+    translation = [-(row[0] * tx + row[1] * ty + row[2] * tz) for row in linear]
+
+    return matrix.create(rows = [
+        linear[0] + [translation[0]],
+        linear[1] + [translation[1]],
+        linear[2] + [translation[2]],
+        [0, 0, 0, 1],
+    ])
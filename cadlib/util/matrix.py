@@ -2,7 +2,14 @@ from numbers import Number
 from cadlib.util.table import Table
 
 class Matrix:
-    """An immutable matrix with basic arithmetic."""
+    """An immutable matrix with basic arithmetic.
+
+    4x4 matrices created by transforms (see create) and by arithmetic on other
+    4x4 matrices are instances of the Matrix4 subclass, which has a faster
+    implementation of the most common operations.
+    """
+
+    __slots__ = ("_row_count", "_column_count", "_rows")
 
     ####################
     ## Initialization ##
@@ -129,11 +136,22 @@ class Matrix:
     ## Comparison ##
     ################
 
+    def _other_backend(self, other):
+        """Whether other is a matrix of another backend (e.g. NumpyMatrix),
+        which does not store the values as rows. Operations with such matrices
+        return NotImplemented, so they are handled by the other matrix."""
+        return isinstance(other, Matrix) and other._rows is None
+
     def __eq__(self, other):
         """Two matrices are identical if all of their values are identical."""
+        if self._other_backend(other):
+            return NotImplemented
         return (isinstance(other, Matrix)
             and self._rows == other._rows)
 
+    def __hash__(self):
+        return hash(tuple(tuple(row) for row in self._rows))
+
 
     ################
     ## Arithmetic ##
@@ -146,7 +164,9 @@ class Matrix:
     def __add__(self, other):
         """Matrices are added element-wise. The dimensions must be identical."""
 
-        if isinstance(other, Matrix):
+        if self._other_backend(other):
+            return NotImplemented
+        elif isinstance(other, Matrix):
             if other.dimensions != self.dimensions:
                 raise ValueError("Dimension mismatch: {} + {}".format(self.dimensions, other.dimensions))
             else:
@@ -177,6 +197,9 @@ class Matrix:
         if isinstance(other, Number):
             return Matrix(rows = [[x * other for x in row] for row in self._rows])
 
+        elif self._other_backend(other):
+            return NotImplemented
+
         elif isinstance(other, Matrix):
             if self.column_count != other.row_count:
                 raise ValueError("Dimension mismatch: {} x {}".format(self.dimensions, other.dimensions))
@@ -224,3 +247,127 @@ class Matrix:
     def format(self):
         """Pretty-print the matrix as a multi-line string."""
         return Table(self._rows).format(alignment="r")
+
+
+class Matrix4(Matrix):
+    """A 4x4 matrix, typically describing an affine transform in homogeneous
+    coordinates.
+
+    Matrix4 behaves exactly like a 4x4 Matrix (and compares equal to it), but
+    implements the arithmetic operations without loops. Results of operations
+    between instances of Matrix4 are not checked again.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, rows = None, columns = None):
+        """Create a 4x4 matrix from either rows or columns.
+
+        See Matrix.__init__ for the parameters. ValueError is raised if the
+        dimensions are not 4x4.
+        """
+        super().__init__(rows, columns)
+        if self.dimensions != (4, 4):
+            raise ValueError(f"Matrix4 must have 4x4 values, not {self.dimensions}")
+
+    @classmethod
+    def _make(cls, rows):
+        """Create a matrix from a list of 4 lists of 4 numbers, without checking
+        and without copying them."""
+        result = cls.__new__(cls)
+        result._row_count    = 4
+        result._column_count = 4
+        result._rows         = rows
+        return result
+
+    def transpose(self):
+        return Matrix4._make([list(column) for column in zip(*self._rows)])
+
+    def __add__(self, other):
+        if isinstance(other, Matrix4):
+            return Matrix4._make([[x1 + x2 for x1, x2 in zip(r1, r2)] for r1, r2 in zip(self._rows, other._rows)])
+        else:
+            return super().__add__(other)
+
+    def __mul__(self, other):
+        if isinstance(other, Matrix4):
+            (a00, a01, a02, a03), (a10, a11, a12, a13), (a20, a21, a22, a23), (a30, a31, a32, a33) = self._rows
+            (b00, b01, b02, b03), (b10, b11, b12, b13), (b20, b21, b22, b23), (b30, b31, b32, b33) = other._rows
+            return Matrix4._make([
+                [a00*b00 + a01*b10 + a02*b20 + a03*b30, a00*b01 + a01*b11 + a02*b21 + a03*b31,
+                 a00*b02 + a01*b12 + a02*b22 + a03*b32, a00*b03 + a01*b13 + a02*b23 + a03*b33],
+                [a10*b00 + a11*b10 + a12*b20 + a13*b30, a10*b01 + a11*b11 + a12*b21 + a13*b31,
+                 a10*b02 + a11*b12 + a12*b22 + a13*b32, a10*b03 + a11*b13 + a12*b23 + a13*b33],
+                [a20*b00 + a21*b10 + a22*b20 + a23*b30, a20*b01 + a21*b11 + a22*b21 + a23*b31,
+                 a20*b02 + a21*b12 + a22*b22 + a23*b32, a20*b03 + a21*b13 + a22*b23 + a23*b33],
+                [a30*b00 + a31*b10 + a32*b20 + a33*b30, a30*b01 + a31*b11 + a32*b21 + a33*b31,
+                 a30*b02 + a31*b12 + a32*b22 + a33*b32, a30*b03 + a31*b13 + a32*b23 + a33*b33],
+            ])
+        elif isinstance(other, Number):
+            return Matrix4._make([[x * other for x in row] for row in self._rows])
+        else:
+            return super().__mul__(other)
+
+    def homogeneous_mul(self, vector):
+        from cadlib.util.vector import Vector3
+
+        if len(vector) != 3:
+            return super().homogeneous_mul(vector)
+
+        x, y, z = vector
+        (a00, a01, a02, a03), (a10, a11, a12, a13), (a20, a21, a22, a23), (a30, a31, a32, a33) = self._rows
+
+        w = a30*x + a31*y + a32*z + a33
+        if w == 0:
+            raise ValueError(f"last component of homogeneous vector is 0: {vector}")
+
+        return Vector3._make(
+            (a00*x + a01*y + a02*z + a03) / w,
+            (a10*x + a11*y + a12*z + a13) / w,
+            (a20*x + a21*y + a22*z + a23) / w)
+
+
+#############
+## Backend ##
+#############
+
+# The class of the matrices created by create and identity, which are used by
+# the transforms. The NumPy backend is imported only when it is selected, so
+# NumPy is not required otherwise. With the Python backend, 4x4 matrices are
+# created as Matrix4.
+_matrix_class = Matrix
+
+def set_backend(name):
+    """Select the matrix implementation used by transforms.
+
+    name can be "python" (Matrix, the default) or "numpy" (NumpyMatrix, which
+    requires NumPy). Matrices that have already been created are not affected;
+    this includes the matrices that transforms have already cached.
+    """
+    global _matrix_class
+
+    if name == "python":
+        _matrix_class = Matrix
+    elif name == "numpy":
+        from cadlib.util.numpy_matrix import NumpyMatrix
+        _matrix_class = NumpyMatrix
+    else:
+        raise ValueError(f"Unknown matrix backend: {name!r}")
+
+def get_backend():
+    """Return the name of the selected matrix backend."""
+    return "python" if _matrix_class is Matrix else "numpy"
+
+def create(rows):
+    """Create a matrix from rows, using the selected backend."""
+    if _matrix_class is Matrix:
+        rows = list(rows)
+        if len(rows) == 4 and len(rows[0]) == 4:
+            return Matrix4(rows = rows)
+    return _matrix_class(rows = rows)
+
+def identity(size):
+    """Create an identity matrix, using the selected backend."""
+    if _matrix_class is Matrix and size == 4:
+        return Matrix4.identity(4)
+    return _matrix_class.identity(size)
@@ -0,0 +1,216 @@
+import numpy
+from numbers import Number
+
+from cadlib.util.matrix import Matrix
+from cadlib.util.table import Table
+
+
+class NumpyMatrix(Matrix):
+    """An immutable matrix backed by a contiguous float64 NumPy array.
+
+    NumpyMatrix has the same interface as Matrix, but all arithmetic is
+    vectorized. The values are stored as floats, so row_values, column_values,
+    and item access return floats even if the matrix was created from integers.
+
+    NumpyMatrix and Matrix can be mixed in arithmetic and comparisons. The
+    result of an operation involving a NumpyMatrix is a NumpyMatrix.
+
+    This class requires NumPy. Use cadlib.util.matrix.set_backend("numpy") to
+    use it for the matrices created by transforms.
+    """
+
+    __slots__ = ("_array",)
+
+    ####################
+    ## Initialization ##
+    ####################
+
+    def __init__(self, rows = None, columns = None):
+        """Create a matrix from either rows or columns.
+
+        See Matrix.__init__ for the parameters.
+        """
+        # Let Matrix do the parameter checks, then convert the values
+        super().__init__(rows, columns)
+        self._array = self._to_array(self._rows, self._row_count, self._column_count)
+        self._rows = None
+
+    @classmethod
+    def _from_array(cls, array):
+        """Create a matrix from a 2-dimensional array without checking the
+        values."""
+        result = cls.__new__(cls)
+        result._array = numpy.ascontiguousarray(array, dtype = numpy.float64)
+        result._row_count, result._column_count = result._array.shape
+        result._rows = None
+        return result
+
+    @staticmethod
+    def _to_array(rows, row_count, column_count):
+        if row_count == 0:
+            return numpy.zeros((0, 0))
+        else:
+            return numpy.array(rows, dtype = numpy.float64).reshape(row_count, column_count)
+
+    @staticmethod
+    def _array_of(matrix):
+        """Return the values of a Matrix or NumpyMatrix as an array."""
+        if isinstance(matrix, NumpyMatrix):
+            return matrix._array
+        else:
+            return NumpyMatrix._to_array(matrix._rows, matrix.row_count, matrix.column_count)
+
+    @classmethod
+    def identity(cls, size):
+        """Create an identity matrix."""
+        return cls._from_array(numpy.identity(size))
+
+    @classmethod
+    def zero(cls, size):
+        """Create a square zero matrix."""
+        return cls._from_array(numpy.zeros((size, size)))
+
+
+    ################
+    ## Properties ##
+    ################
+
+    def __getitem__(self, item):
+        """Return the value at the position specified by (row, column)"""
+        row = item[0]
+        column = item[1]
+        return float(self._array[row, column])
+
+    @property
+    def row_values(self):
+        """Return a copy of the matrix values as list of lists, row-wise."""
+        return self._array.tolist()
+
+    @property
+    def column_values(self):
+        """Return a copy of the matrix values as list of lists, column-wise."""
+        return self._array.T.tolist()
+
+
+    ################
+    ## Comparison ##
+    ################
+
+    def __eq__(self, other):
+        """Two matrices are identical if all of their values are identical."""
+        return (isinstance(other, Matrix)
+            and other.dimensions == self.dimensions
+            and bool(numpy.array_equal(self._array, self._array_of(other))))
+
+    def __hash__(self):
+        # Consistent with Matrix, since equal ints and floats have equal hashes
+        return hash(tuple(tuple(row) for row in self._array.tolist()))
+
+
+    ################
+    ## Arithmetic ##
+    ################
+
+    def transpose(self):
+        """Create a new matrix that is this matrix transposed"""
+        return self._from_array(self._array.T)
+
+    def __add__(self, other):
+        """Matrices are added element-wise. The dimensions must be identical."""
+        if isinstance(other, Matrix):
+            if other.dimensions != self.dimensions:
+                raise ValueError("Dimension mismatch: {} + {}".format(self.dimensions, other.dimensions))
+            return self._from_array(self._array + self._array_of(other))
+        else:
+            return NotImplemented
+
+    def __radd__(self, other):
+        """Matrix + NumpyMatrix (addition is commutative)."""
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        """Matrices are subtracted element-wise. The dimensions must be identical."""
+        if isinstance(other, Matrix):
+            if other.dimensions != self.dimensions:
+                raise ValueError("Dimension mismatch: {} - {}".format(self.dimensions, other.dimensions))
+            return self._from_array(self._array - self._array_of(other))
+        else:
+            return NotImplemented
+
+    def __rsub__(self, other):
+        """Matrix - NumpyMatrix."""
+        if isinstance(other, Matrix):
+            return (-self).__add__(other)
+        else:
+            return NotImplemented
+
+    def __neg__(self):
+        return self._from_array(-self._array)
+
+    def __mul__(self, other):
+        """Matrices can be multiplied with scalars or other matrices.
+
+        Multiplication of Matrix and Vector is implemented in Vector.__rmul__.
+        """
+        if isinstance(other, Number):
+            return self._from_array(self._array * other)
+
+        elif isinstance(other, Matrix):
+            if self.column_count != other.row_count:
+                raise ValueError("Dimension mismatch: {} x {}".format(self.dimensions, other.dimensions))
+            return self._from_array(self._array @ self._array_of(other))
+
+        else:
+            return NotImplemented
+
+    def __rmul__(self, other):
+        """Number * NumpyMatrix and Matrix * NumpyMatrix."""
+        if isinstance(other, Number):
+            return self._from_array(other * self._array)
+
+        elif isinstance(other, Matrix):
+            if other.column_count != self.row_count:
+                raise ValueError("Dimension mismatch: {} x {}".format(other.dimensions, self.dimensions))
+            return self._from_array(self._array_of(other) @ self._array)
+
+        else:
+            # See Matrix.__rmul__ for why we don't handle Vector * Matrix
+            return NotImplemented
+
+    def __truediv__(self, other):
+        """Matrix division is only possible with scalars."""
+        if isinstance(other, Number):
+            # NumPy would return infinities
+            if other == 0:
+                raise ZeroDivisionError("division by zero")
+            return self._from_array(self._array / other)
+        else:
+            return NotImplemented
+
+    def homogeneous_mul(self, vector):
+        from cadlib.util.vector import Vector
+
+        if len(vector) + 1 != self.column_count:
+            raise ValueError("Dimension mismatch: {} x {}".format(self.dimensions, len(vector) + 1))
+
+        # Equivalent to multiplying with the homogeneous vector, but without
+        # creating it
+        values = self._array[:, :-1] @ numpy.array(list(vector), dtype = numpy.float64) + self._array[:, -1]
+
+        last_component = values[-1]
+        if last_component == 0:
+            raise ValueError(f"last component of homogeneous vector is 0: {values.tolist()}")
+
+        return Vector(*(values[:-1] / last_component).tolist())
+
+
+    #########
+    ## I/O ##
+    #########
+
+    def __repr__(self):
+        return f"NumpyMatrix(rows={self.row_values!r})"
+
+    def format(self):
+        """Pretty-print the matrix as a multi-line string."""
+        return Table(self.row_values).format(alignment="r")
@@ -0,0 +1,334 @@
+import contextlib
+import functools
+import sys
+import time
+
+from cadlib.util.table import Table
+
+
+class ProfileEntry:
+    """The statistics of one function (a method of a node class) in a
+    Profile.
+
+    total_time is the time from entering the function to leaving it,
+    including the time spent in nested profiled functions (but recursive calls
+    are only counted once). self_time excludes the nested profiled functions.
+    output_bytes is the number of bytes of code generated by the function
+    itself (not by its children), including line breaks. allocated_blocks is
+    the net number of memory blocks allocated by the function itself (see
+    sys.getallocatedblocks), which approximates the number of objects that
+    it created.
+    """
+
+    __slots__ = ("name", "calls", "total_time", "self_time", "output_bytes", "allocated_blocks")
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.total_time = 0
+        self.self_time = 0
+        self.output_bytes = 0
+        self.allocated_blocks = 0
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"ProfileEntry({self.to_dict()!r})"
+
+
+class _Frame:
+    __slots__ = ("name", "stack", "start", "start_blocks", "children_time", "children_blocks", "output_bytes")
+
+    def __init__(self, name, stack):
+        self.name = name
+        self.stack = stack
+        self.children_time = 0
+        self.children_blocks = 0
+        self.output_bytes = 0
+        self.start_blocks = sys.getallocatedblocks()
+        self.start = time.perf_counter()
+
+
+class Profile:
+    """The result of profiling an export with profile().
+
+    The functions are identified by the class of the node and the name of the
+    method, e.g. "Union.to_scad" or "Translate.to_matrix". For ScadObjects,
+    the OpenSCAD identifier is included, e.g. "ScadObject[sphere]._head_lines".
+
+    The statistics are available per function (entries) and per stack of
+    nested functions (stacks), i. e. per subtree of the exported model. Since
+    the trees are traversed without recursion, the stack of a node of the tree
+    is made up of the functions of its ancestors rather than of the actual
+    calls.
+    """
+
+    def __init__(self):
+        self.entries = {}  # Name -> ProfileEntry
+        self.stacks = {}   # Tuple of names -> ProfileEntry (of the innermost function)
+
+        self._frames = []
+        self._active = {}  # Name -> number of active frames
+
+        # The stacks of the parents of tree nodes, by node ID. The nodes are
+        # stored as well, so their IDs are not re-used.
+        self._parents = {} # ID -> (node, stack)
+
+    def _entry(self, entries, key, name):
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = ProfileEntry(name)
+        return entry
+
+    def _enter(self, name, node = None):
+        """Enter a function. If node is given and its parent is known, the
+        stack of the function is based on that of the parent."""
+        parent = self._parents.get(id(node))
+        if parent is not None and parent[0] is node:
+            stack = parent[1] + (name, )
+        elif self._frames:
+            stack = self._frames[-1].stack + (name, )
+        else:
+            stack = (name, )
+
+        self._entry(self.entries, name, name).calls += 1
+        self._entry(self.stacks, stack, name).calls += 1
+
+        self._active[name] = self._active.get(name, 0) + 1
+        self._frames.append(_Frame(name, stack))
+
+    def _set_parent(self, children, stack):
+        """Set the stack of the parent of tree nodes."""
+        for child in children:
+            self._parents[id(child)] = (child, stack)
+
+    def _exit(self):
+        end = time.perf_counter()
+        blocks = sys.getallocatedblocks()
+
+        frame = self._frames.pop()
+        stack = frame.stack
+        elapsed = end - frame.start
+        allocated = blocks - frame.start_blocks
+
+        self._active[frame.name] -= 1
+        if self._frames:
+            self._frames[-1].children_time += elapsed
+            self._frames[-1].children_blocks += allocated
+
+        function_entry = self._entry(self.entries, frame.name, frame.name)
+        stack_entry = self._entry(self.stacks, stack, frame.name)
+
+        # Count recursive calls of the same function only once
+        if self._active[frame.name] == 0:
+            function_entry.total_time += elapsed
+        stack_entry.total_time += elapsed
+
+        for entry in [function_entry, stack_entry]:
+            entry.self_time += elapsed - frame.children_time
+            entry.allocated_blocks += allocated - frame.children_blocks
+            entry.output_bytes += frame.output_bytes
+
+    def _call(self, name, node, function, *args, **kwargs):
+        """Call the function, profiling it as a function of the tree node (if
+        given)."""
+        self._enter(name, node)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self._exit()
+
+    def _head_lines(self, name, scad_object, function, *args):
+        """Call ScadObject._head_lines, profiling it and counting the
+        generated code."""
+        self._enter(name, scad_object)
+        try:
+            lines, foot_line = function(scad_object, *args)
+
+            frame = self._frames[-1]
+            frame.output_bytes = sum(len(line) + 1 for line in lines)
+            if foot_line is not None:
+                frame.output_bytes += len(foot_line) + 1
+            self._set_parent(scad_object._children, frame.stack)
+
+            return lines, foot_line
+        finally:
+            self._exit()
+
+    def _operands(self, object, operands):
+        """Record the operands of an object that is being converted."""
+        if self._frames:
+            name = _name(object, "_combine_scad")
+            parent = self._parents.get(id(object))
+            if parent is not None and parent[0] is object:
+                stack = parent[1] + (name, )
+            else:
+                stack = self._frames[-1].stack + (name, )
+            self._set_parent(operands, stack)
+
+
+    ###############
+    ## Reporting ##
+    ###############
+
+    @property
+    def total_time(self):
+        """The total time spent in the profiled functions."""
+        return sum(entry.self_time for entry in self.entries.values())
+
+    @property
+    def output_bytes(self):
+        """The number of bytes of code generated."""
+        return sum(entry.output_bytes for entry in self.entries.values())
+
+    def to_dict(self):
+        """Return the statistics as a dict with the entries ("functions") and
+        the stacks ("stacks", each with a "stack" list of names), sorted by
+        descending time."""
+        functions = sorted(self.entries.values(), key = lambda entry: -entry.total_time)
+        stacks = sorted(self.stacks.items(), key = lambda item: -item[1].total_time)
+        return {
+            "functions": [entry.to_dict() for entry in functions],
+            "stacks": [dict(entry.to_dict(), stack = list(stack)) for stack, entry in stacks],
+        }
+
+    def format(self, limit = None):
+        """Format the entries as a table, sorted by descending total time.
+
+        If limit is given, only that many entries are included.
+        """
+        entries = sorted(self.entries.values(), key = lambda entry: -entry.total_time)[:limit]
+
+        rows = [["Function", "Calls", "Total [s]", "Self [s]", "Bytes", "Blocks"]]
+        for entry in entries:
+            rows.append([entry.name, entry.calls, f"{entry.total_time:.6f}", f"{entry.self_time:.6f}",
+                         entry.output_bytes, entry.allocated_blocks])
+        return Table(rows).format(column_sep = "  ")
+
+    def collapsed_stacks(self):
+        """Return the stacks in the collapsed format used by flame graph tools
+        (e.g. flamegraph.pl or speedscope): one line per stack with the names
+        separated by semicolons, followed by the self time in microseconds.
+        """
+        lines = []
+        for stack, entry in sorted(self.stacks.items()):
+            microseconds = round(entry.self_time * 1e6)
+            if microseconds > 0:
+                lines.append(";".join(stack) + " " + str(microseconds))
+        return "\n".join(lines)
+
+
+# The Profile that is currently recorded, if any
+_profile = None
+
+
+def _name(instance, method):
+    from cadlib.scad.scad_object import ScadObject
+    if isinstance(instance, ScadObject):
+        return f"{type(instance).__name__}[{instance._id or ''}].{method}"
+    return f"{type(instance).__name__}.{method}"
+
+def _wrap_call(function):
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        if _profile is None:
+            return function(self, *args, **kwargs)
+        return _profile._call(_name(self, function.__name__), None, function, self, *args, **kwargs)
+    return wrapper
+
+def _wrap_combine_scad(function):
+    @functools.wraps(function)
+    def wrapper(self, operands):
+        if _profile is None:
+            return function(self, operands)
+        return _profile._call(_name(self, "_combine_scad"), self, function, self, operands)
+    return wrapper
+
+def _wrap_operands(function):
+    @functools.wraps(function)
+    def wrapper(self):
+        operands = function(self)
+        if _profile is not None:
+            _profile._operands(self, operands)
+        return operands
+    return wrapper
+
+def _wrap_head_lines(function):
+    @functools.wraps(function)
+    def wrapper(self, *args):
+        if _profile is None:
+            return function(self, *args)
+        return _profile._head_lines(_name(self, "_head_lines"), self, function, *args)
+    return wrapper
+
+
+def _subclasses(cls):
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from _subclasses(subclass)
+
+def _instrumented_methods():
+    """Return the methods to profile, as a list of (class, name, wrap)."""
+    # Import the modules that define subclasses, so that they are instrumented
+    import cadlib.csg
+    import cadlib.object.primitives
+    import cadlib.scad.parallel
+    import cadlib.transform.chained
+    import cadlib.transform.primitives
+    from cadlib.object.object import Object
+    from cadlib.scad.scad_object import ScadObject
+    from cadlib.transform.transform import Transform
+
+    methods = [
+        (Object,     "to_scad",       _wrap_call),
+        (Object,     "_operands",     _wrap_operands),
+        (Object,     "_combine_scad", _wrap_combine_scad),
+        (Transform,  "to_scad",       _wrap_call),
+        (Transform,  "to_matrix",     _wrap_call),
+        (ScadObject, "_lines",        _wrap_call),
+        (ScadObject, "_head_lines",   _wrap_head_lines),
+    ]
+
+    return [(cls, name, wrap)
+            for base, name, wrap in methods
+            for cls in _subclasses(base)
+            if name in cls.__dict__]
+
+
+@contextlib.contextmanager
+def profile():
+    """Profile the export of objects within a with block.
+
+    While the block is running, the calls of Object.to_scad,
+    Object._combine_scad, Transform.to_scad, Transform.to_matrix,
+    ScadObject._lines and ScadObject._head_lines are recorded (including
+    those of subclasses that override them) in the Profile that is returned:
+
+        with cadlib.profile() as report:
+            render_to_file(part, "part.scad")
+        print(report.format())
+
+    Only the current thread should export objects while profiling, and
+    profiles cannot be nested. Profiling has a considerable overhead, so the
+    absolute times are larger than without profiling.
+    """
+    global _profile
+
+    if _profile is not None:
+        raise RuntimeError("A profile is already being recorded")
+
+    methods = _instrumented_methods()
+    originals = [(cls, name, cls.__dict__[name]) for cls, name, _ in methods]
+
+    _profile = Profile()
+    for cls, name, wrap in methods:
+        setattr(cls, name, wrap(cls.__dict__[name]))
+
+    try:
+        yield _profile
+    finally:
+        for cls, name, original in originals:
+            setattr(cls, name, original)
+        _profile._parents.clear()
+        _profile = None
@@ -0,0 +1,98 @@
+import threading
+
+
+# Guards the check-and-append in SharedSequence.extended, so sequences that
+# share their storage can be extended from multiple threads
+_lock = threading.Lock()
+
+
+class SharedSequence:
+    """An immutable sequence that can be extended in amortized constant time.
+
+    Extending a sequence creates a new sequence; the original is not changed.
+    The new sequence shares its storage with the original: the items are
+    appended to the shared list, and each sequence only sees the first items
+    of it (its own length). Only if the shared list has already been extended
+    by another sequence are the items copied.
+
+    This makes repeatedly extending the latest sequence (e.g. `total = total +
+    part` in a loop) linear rather than quadratic in the number of items.
+
+    Extending is thread-safe: if two threads extend the same sequence, only
+    one of them appends to the shared list, and the other one copies it.
+    """
+
+    __slots__ = ("_items", "_length")
+
+    def __init__(self, items = ()):
+        self._items = list(items)
+        self._length = len(self._items)
+
+    @classmethod
+    def _create(cls, items, length):
+        result = cls.__new__(cls)
+        result._items = items
+        result._length = length
+        return result
+
+    def extended(self, items):
+        """Return a new sequence with the items appended."""
+        # The items may be a view of the shared list
+        items = list(items)
+
+        with _lock:
+            if self._length == len(self._items):
+                # We own the end of the shared list
+                shared = self._items
+            else:
+                # Another sequence has already appended to the shared list
+                shared = self._items[:self._length]
+
+            shared.extend(items)
+            return SharedSequence._create(shared, len(shared))
+
+    def appended(self, item):
+        """Return a new sequence with the item appended."""
+        return self.extended([item])
+
+    def to_list(self):
+        """Return the items as a new list."""
+        return self._items[:self._length]
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        # Don't iterate over the shared list directly, it may be extended
+        # while iterating
+        for index in range(self._length):
+            yield self._items[index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.to_list()[index]
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("SharedSequence index out of range")
+        return self._items[index]
+
+    def __eq__(self, other):
+        if isinstance(other, SharedSequence):
+            return self.to_list() == other.to_list()
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __getstate__(self):
+        # Only pickle our own items
+        return self.to_list()
+
+    def __setstate__(self, state):
+        self._items = state
+        self._length = len(state)
+
+    def __repr__(self):
+        return f"SharedSequence({self.to_list()!r})"
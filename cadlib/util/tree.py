@@ -27,6 +27,40 @@ class Node:
                 and self._data     == other._data
                 and self._children == other._children)
 
+    def iter_lines(self, indent = None, top_indent = ""):
+        """Generate the lines of the tree, one line for each node.
+
+        See the lines method for the interpretation of the parameters. The
+        tree is traversed with an explicit stack, so the depth of the tree is
+        not limited by the recursion limit.
+        """
+        # Pretty printing:
+        #   * Last child:     first line "'-", other lines "  "
+        #   * Other children: first line "|-", other lines "| "
+        # The stack contains the iterators over the remaining children of the
+        # ancestors, with the prefix of the lines of the children.
+        yield top_indent + str(self._data)
+        stack = [(iter(self._children), len(self._children), top_indent)]
+        while stack:
+            children, remaining, prefix = stack[-1]
+            if remaining == 0:
+                stack.pop()
+                continue
+
+            child = next(children)
+            remaining -= 1
+            stack[-1] = (children, remaining, prefix)
+
+            if indent is not None:
+                first_prefix = child_prefix = prefix + indent
+            elif remaining == 0: # Last child
+                first_prefix, child_prefix = prefix + "'-- ", prefix + "    "
+            else:
+                first_prefix, child_prefix = prefix + "|-- ", prefix + "|   "
+
+            yield first_prefix + str(child._data)
+            stack.append((iter(child._children), len(child._children), child_prefix))
+
     def lines(self, indent = None, top_indent = ""):
         """Format the tree as a list of strings, one string for each node.
 
@@ -35,26 +69,7 @@ class Node:
         number of copies of indent. In any case, each line is prefixed with
         top_indent.
         """
-        result = []
-        result.append(top_indent + str(self._data))
-
-        if indent is None:
-            # Pretty printing:
-            #   * Last child:     first line "'-", other lines "  "
-            #   * Other children: first line "|-", other lines "| "
-            for child in self._children[:-1]: # All children except the last
-                lines = child.lines()
-                for line in lines[:1]: result.append(top_indent + "|-- " + line) # First line
-                for line in lines[1:]: result.append(top_indent + "|   " + line) # Other lines
-            for child in self._children[-1:]: # Last child
-                lines = child.lines()
-                for line in lines[:1]: result.append(top_indent + "'-- " + line) # First line
-                for line in lines[1:]: result.append(top_indent + "    " + line) # Other lines
-        else:
-            # Simple indenting
-            result += list(top_indent + indent + line for child in self._children for line in child.lines(indent))
-
-        return result
+        return list(self.iter_lines(indent, top_indent))
 
     def format(self, indent = None, top_indent = ""):
         """Format the tree as a single string.
@@ -62,3 +77,31 @@ class Node:
         See the lines method for the interpretation of the parameters.
         """
         return "\n".join(self.lines(indent, top_indent))
+
+
+def reduce_tree(root, children, combine):
+    """Calculate a value for each node of a tree from the values of its
+    children, and return the value of the root.
+
+    children(node) must return the list of children of a node, and
+    combine(node, values) must return the value of the node, given the list
+    of values of its children (in the same order). The nodes are visited in
+    post-order with an explicit stack, so the depth of the tree is not limited
+    by the recursion limit.
+    """
+    values = []
+    stack = [(root, None)]
+    while stack:
+        node, node_children = stack.pop()
+        if node_children is None:
+            # First visit: visit the children, then the node again
+            node_children = children(node)
+            stack.append((node, node_children))
+            stack.extend((child, None) for child in reversed(node_children))
+        else:
+            count = len(node_children)
+            child_values = values[len(values) - count:]
+            del values[len(values) - count:]
+            values.append(combine(node, child_values))
+
+    return values[0]
@@ -23,8 +23,19 @@ class Vector:
       * Matrices are initialized from an iterable of iterables; vectors can be
         initialized from individual values because the distinction between
         initialization by row and by column is not required.
+
+    3-dimensional vectors are instances of the Vector3 subclass, which has a
+    faster implementation of the most common operations.
     """
 
+    __slots__ = ("_values",)
+
+    def __new__(cls, *values):
+        # Vector(x, y, z) creates a Vector3
+        if cls is Vector and len(values) == 3:
+            cls = Vector3
+        return super().__new__(cls)
+
     ####################
     ## Initialization ##
     ####################
@@ -112,6 +123,9 @@ class Vector:
         return (isinstance(other, Vector)
             and self._values == other._values)
 
+    def __hash__(self):
+        return hash(tuple(self._values))
+
 
     ################
     ## Arithmetic ##
@@ -333,8 +347,101 @@ class Vector:
         return Table([[v] for v in self._values]).format(alignment="r")
 
 
+class Vector3(Vector):
+    """A 3-dimensional vector.
+
+    Vector3 behaves exactly like a Vector with 3 elements (and compares equal
+    to it), but implements the arithmetic operations without loops and without
+    intermediate vectors. Results of operations between instances of Vector3
+    are not checked again.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, x, y, z):
+        """Create a vector from 3 numeric values."""
+        super().__init__(x, y, z)
+
+    @classmethod
+    def _make(cls, x, y, z):
+        """Create a vector from values that are known to be valid."""
+        result = object.__new__(cls)
+        result._values = [x, y, z]
+        return result
+
+    @property
+    def is_zero(self):
+        x, y, z = self._values
+        return x == 0 and y == 0 and z == 0
+
+    def __add__(self, other):
+        if isinstance(other, Vector3):
+            a = self._values
+            b = other._values
+            return Vector3._make(a[0] + b[0], a[1] + b[1], a[2] + b[2])
+        else:
+            return super().__add__(other)
+
+    def __sub__(self, other):
+        if isinstance(other, Vector3):
+            a = self._values
+            b = other._values
+            return Vector3._make(a[0] - b[0], a[1] - b[1], a[2] - b[2])
+        else:
+            return super().__sub__(other)
+
+    def __neg__(self):
+        x, y, z = self._values
+        return Vector3._make(-x, -y, -z)
+
+    def __mul__(self, other):
+        if isinstance(other, Number):
+            x, y, z = self._values
+            return Vector3._make(x * other, y * other, z * other)
+        else:
+            return NotImplemented
+
+    def __rmul__(self, other):
+        if isinstance(other, Number):
+            x, y, z = self._values
+            return Vector3._make(other * x, other * y, other * z)
+        else:
+            return super().__rmul__(other)
+
+    def __truediv__(self, other):
+        if isinstance(other, Number):
+            x, y, z = self._values
+            return Vector3._make(x / other, y / other, z / other)
+        else:
+            return NotImplemented
+
+    def dot(self, other):
+        if isinstance(other, Vector3):
+            a = self._values
+            b = other._values
+            return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+        else:
+            return super().dot(other)
+
+    def cross(self, other):
+        if isinstance(other, Vector3):
+            a = self._values
+            b = other._values
+            return Vector3._make(
+                a[1] * b[2] - a[2] * b[1],
+                a[2] * b[0] - a[0] * b[2],
+                a[0] * b[1] - a[1] * b[0])
+        else:
+            return super().cross(other)
+
+    @property
+    def length_squared(self):
+        x, y, z = self._values
+        return x ** 2 + y ** 2 + z ** 2
+
+
 # Important constants
-origin = Vector(0, 0, 0)
-X = Vector(1, 0, 0)
-Y = Vector(0, 1, 0)
-Z = Vector(0, 0, 1)
+origin = Vector3(0, 0, 0)
+X = Vector3(1, 0, 0)
+Y = Vector3(0, 1, 0)
+Z = Vector3(0, 0, 1)
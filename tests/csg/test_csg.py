@@ -48,3 +48,43 @@ class TestCsg(TestCase):
             ScadObject("intersection", None, None, [ sphere  .to_scad(), cylinder.to_scad() ]),
             ScadObject("difference"  , None, None, [ cube    .to_scad(), sphere  .to_scad() ]),
         ]))
+
+    def test_simplified(self):
+        a, b, c, d = Sphere(1), Sphere(2), Cuboid(1, 1, 1), Cuboid(2, 2, 2)
+
+        # Associative operations are flattened
+        self.assertEqual(Union([a, Union([b, Union([c])]), d]).simplified(), Union([a, b, c, d]))
+        self.assertEqual(Intersection([Intersection([a, b]), c]).simplified(), Intersection([a, b, c]))
+        self.assertEqual(Union([a, Intersection([b, c])]).simplified(), Union([a, Intersection([b, c])]))
+
+        # Differences are flattened only in the first operand
+        self.assertEqual(Difference([Difference([a, b]), c]).simplified(), Difference([a, b, c]))
+        self.assertEqual(Difference([a, Difference([b, c])]).simplified(), Difference([a, Difference([b, c])]))
+
+        # Empty operations are empty, so they are not flattened
+        self.assertEqual(Difference([Difference([]), a]).simplified(), Difference([]))
+        self.assertEqual(Difference([Difference([])]).simplified(), Difference([]))
+        self.assertEqual(Intersection([a, Intersection([]), b]).simplified(), Intersection([]))
+        self.assertEqual(Union([a, Union([]), b]).simplified(), Union([a, b]))
+        self.assertTrue(Difference([Difference([]), a]).simplified().bounds.is_empty)
+
+        # Single children
+        self.assertIs(Union([a]).simplified(), a)
+        self.assertIs(Difference([Union([a])]).simplified(), a)
+
+        # Children are simplified; unchanged objects are re-used
+        self.assertEqual(Union([a.up(1).up(2), b]).simplified(), Union([a.up(3), b]))
+        union = Union([a, b.up(1)])
+        self.assertIs(union.simplified(), union)
+        self.assertEqual(Union([]).simplified(), Union([]))
+
+    def test_collapse_transforms(self):
+        sphere = Sphere(2)
+        cube   = Cuboid(10, 10, 10)
+        moved  = cube.up(1).left(2)
+
+        # The transforms of the children are collapsed; the CSG type is retained
+        self.assertEqual((sphere + moved).collapse_transforms(),
+            Union([sphere, moved.collapse_transforms()]))
+        self.assertEqual((sphere - moved).collapse_transforms(1e-9),
+            Difference([sphere, cube.translate([-2, 0, 1])]))
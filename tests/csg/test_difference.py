@@ -1,7 +1,10 @@
+import math
+
 from cadlib.object.primitives import Sphere, Cuboid, Frustum
-from cadlib.csg import Difference
+from cadlib.csg import Difference, Union
 from cadlib.scad import ScadObject
 from cadlib.util.vector import Z, origin
+from cadlib.util import Bounds
 from tests.unit_test import TestCase
 
 class TestDifference(TestCase):
@@ -40,3 +43,56 @@ class TestDifference(TestCase):
                 cube    .to_scad(),
                 cylinder.to_scad(),
         ]))
+
+    def test_accumulation(self):
+        parts = [Sphere(i + 1) for i in range(5)]
+
+        total = Cuboid(10, 10, 10)
+        for part in parts:
+            total = total - part
+        self.assertEqual(total, Difference([Cuboid(10, 10, 10)] + parts))
+
+        # Previous differences are not changed when subtracting from them
+        base = Cuboid(10, 10, 10) - parts[0]
+        a = base - parts[1]
+        b = base - parts[2]
+        self.assertEqual(base.children, [Cuboid(10, 10, 10), parts[0]])
+        self.assertEqual(a.children, [Cuboid(10, 10, 10), parts[0], parts[1]])
+        self.assertEqual(b.children, [Cuboid(10, 10, 10), parts[0], parts[2]])
+
+    def test_sdf(self):
+        difference = Difference([Sphere(3), Sphere(1), Sphere(1).right(5)])
+        self.assertEqual(difference.sdf([[0, 0, 0], [2, 0, 0], [0, 0, 4], [5, 0, 0]]).tolist(), [1, -1, 1, 2])
+        self.assertEqual(Difference([]).sdf([[0, 0, 0]]).tolist(), [math.inf])
+
+    def test_pruned(self):
+        a, b, c = Cuboid(10, 10, 1), Sphere(1), Sphere(1).right(5)
+        far = Sphere(1).right(50)
+
+        # Cutters that don't intersect the minuend are removed
+        self.assertEqual(Difference([a, b, far, c]).pruned(), Difference([a, b, c]))
+        self.assertIs(Difference([a, far]).pruned(), a)
+
+        # Empty minuend
+        self.assertEqual(Difference([Union([]), b]).pruned(), Union([]))
+
+        # Unchanged
+        difference = Difference([a, b, c])
+        self.assertIs(difference.pruned(), difference)
+
+        # Distributed over a union minuend
+        d = a.right(20)
+        e = Sphere(1).right(25)
+        self.assertEqual(Difference([Union([a, d]), b, e]).pruned(),
+            Union([Difference([a, b]), Difference([d, e])]))
+        self.assertEqual(Difference([Union([a, d, Cuboid(1, 1, 1).up(10)]), b]).pruned(),
+            Union([Difference([a, b]), d, Cuboid(1, 1, 1).up(10)]))
+
+        # Not distributed if all parts are cut by all cutters
+        self.assertEqual(Difference([Union([a, a.up(0.5)]), b, c]).pruned(),
+            Difference([Union([a, a.up(0.5)]), b, c]))
+
+    def test_bounds(self):
+        # Conservative: the bounds of the first object
+        self.assertEqual(Difference([Sphere(1), Cuboid(3, 2, 1)]).bounds, Bounds([-1, -1, -1], [1, 1, 1]))
+        self.assertTrue(Difference([]).bounds.is_empty)
@@ -1,7 +1,10 @@
+import math
+
 from cadlib.object.primitives import Sphere, Cuboid, Frustum
-from cadlib.csg import Intersection
+from cadlib.csg import Intersection, Union
 from cadlib.scad import ScadObject
 from cadlib.util.vector import Z, origin
+from cadlib.util import Bounds
 from tests.unit_test import TestCase
 
 class TestIntersection(TestCase):
@@ -40,3 +43,41 @@ class TestIntersection(TestCase):
                 cube    .to_scad(),
                 cylinder.to_scad(),
         ]))
+
+    def test_sdf(self):
+        intersection = Intersection([Sphere(2), Cuboid(4, 4, 4)])
+        self.assertEqual(intersection.sdf([[1, 0, 0], [-1, 0, 0], [1, 1, 1]]).tolist(), [0, 1, -0.2679491924311228])
+        self.assertEqual(Intersection([]).sdf([[0, 0, 0]]).tolist(), [math.inf])
+
+    def test_pruned(self):
+        # Disjoint bounds
+        self.assertEqual(Intersection([Sphere(1), Sphere(1).right(5)]).pruned(), Union([]))
+        self.assertEqual(Intersection([Sphere(1), Cuboid(1, 1, 1), Sphere(1).right(5)]).pruned(), Union([]))
+
+        # Overlapping bounds
+        intersection = Intersection([Sphere(1), Cuboid(1, 1, 1)])
+        self.assertIs(intersection.pruned(), intersection)
+        self.assertEqual(Intersection([]).pruned(), Intersection([]))
+
+    def test_bounds(self):
+        self.assertEqual(Intersection([Sphere(1), Cuboid(3, 2, 1)]).bounds, Bounds([0, 0, 0], [1, 1, 1]))
+        self.assertTrue(Intersection([Sphere(1), Sphere(1).right(5)]).bounds.is_empty)
+        self.assertTrue(Intersection([]).bounds.is_empty)
+
+    def test_accumulation(self):
+        parts = [Sphere(i + 1) for i in range(5)]
+
+        # Multiplying in both directions
+        total = Intersection([])
+        for part in parts:
+            total = total * part
+        self.assertEqual(total, Intersection(parts))
+
+        total = Intersection([])
+        for part in parts:
+            total = part * total
+        self.assertEqual(total, Intersection(parts[::-1]))
+        self.assertIs((parts[0] * total)._front._items, total._front._items)
+
+        self.assertEqual(parts[0] * (Intersection(parts[1:3]) * parts[3]), Intersection(parts[:4]))
+        self.assertEqual(total * total, Intersection(parts[::-1] * 2))
@@ -1,7 +1,11 @@
+import math
+
 from cadlib.object.primitives import Sphere, Cuboid, Frustum
 from cadlib.csg import Union
 from cadlib.scad import ScadObject
 from cadlib.util.vector import Z, origin
+from cadlib.util import Bounds
+from cadlib.util.shared_sequence import SharedSequence
 from tests.unit_test import TestCase
 
 class TestUnion(TestCase):
@@ -51,3 +55,66 @@ class TestUnion(TestCase):
         objects = [sphere, cube, cylinder]
 
         self.assertEqual(sum(objects, Union.empty()), Union(objects))
+
+    def test_pruned(self):
+        # Children are pruned, empty children are removed
+        self.assertEqual(Union([Sphere(1), Sphere(1) - Sphere(2).right(5), Union([])]).pruned(),
+            Union([Sphere(1), Sphere(1)]))
+
+        union = Union([Sphere(1), Cuboid(1, 2, 3)])
+        self.assertIs(union.pruned(), union)
+
+    def test_bounds(self):
+        self.assertEqual(Union([Sphere(1), Cuboid(3, 2, 1)]).bounds, Bounds([-1, -1, -1], [3, 2, 1]))
+        self.assertTrue(Union([]).bounds.is_empty)
+
+    def test_sdf(self):
+        union = Union([Sphere(1), Sphere(1).right(3)])
+        self.assertEqual(union.sdf([[0, 0, 0], [3, 0, 0], [1.5, 0, 0], [0, 0, 2]]).tolist(), [-1, -1, 0.5, 1])
+        self.assertEqual(Union([]).sdf([[0, 0, 0]]).tolist(), [math.inf])
+
+    def test_accumulation(self):
+        parts = [Sphere(i + 1) for i in range(5)]
+
+        # Adding in a loop
+        total = Union([])
+        for part in parts:
+            total = total + part
+        self.assertEqual(total, Union(parts))
+
+        # Previous unions are not changed when adding to them
+        base = parts[0] + parts[1]
+        a = base + parts[2]
+        b = base + parts[3]
+        self.assertEqual(base.children, parts[:2])
+        self.assertEqual(a.children, parts[:3])
+        self.assertEqual(b.children, [parts[0], parts[1], parts[3]])
+
+        # Union + Union
+        self.assertEqual(a + b, Union(parts[:3] + [parts[0], parts[1], parts[3]]))
+        self.assertEqual(a + a, Union(parts[:3] * 2))
+
+        # Generators
+        self.assertEqual(Union(part for part in parts), Union(parts))
+        with self.assertRaises(TypeError): Union(x for x in [parts[0], 1])
+
+        # Sequences are checked as well
+        with self.assertRaises(TypeError): Union(SharedSequence([parts[0], 1]))
+
+        # Prepending in a loop; the storage is shared
+        total = Union([])
+        for part in parts:
+            total = part + total
+        self.assertEqual(total, Union(parts[::-1]))
+        self.assertIs((parts[0] + total)._front._items, total._front._items)
+
+        # Adding in both directions
+        self.assertEqual(parts[0] + (a + parts[4]), Union([parts[0]] + parts[:3] + [parts[4]]))
+        self.assertEqual(sum(parts[1:], parts[0] + Union([])), Union(parts))
+
+    def test_bvh(self):
+        union = Union([Sphere(1), Cuboid(3, 2, 1), Sphere(1).right(10)])
+        self.assertIs(union.bvh, union.bvh)
+        self.assertEqual(union.bvh.query_point([2, 1, 0.5]), [1])
+        self.assertEqual(union.bvh.query_ray([-5, 0, 0], [1, 0, 0]), [0, 1, 2])
+        self.assertEqual(union.bvh.pairs(), [(0, 1)])
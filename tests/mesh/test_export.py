@@ -0,0 +1,137 @@
+import os
+import struct
+import threading
+from tempfile import TemporaryDirectory
+from unittest import skipUnless
+
+import numpy
+
+from cadlib.mesh import Mesh, write_stl, write_obj
+from cadlib.mesh import tessellation
+from cadlib.mesh.export import _stl_triangle
+from cadlib.object.primitives import Cuboid, Sphere
+from cadlib.csg import Union
+from cadlib.scad import ScadObject, render_to_file
+from tests.unit_test import TestCase
+
+class TestExport(TestCase):
+    def setUp(self):
+        self.temporary_directory = TemporaryDirectory()
+        self.cube = tessellation.cuboid(1, 2, 3)
+        self.moved_cube = Mesh(self.cube.vertices + [5, 0, 0], self.cube.faces)
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.temporary_directory.name, name)
+
+    def read_stl(self, file_name):
+        with open(file_name, "rb") as file:
+            header = file.read(80)
+            count, = struct.unpack("<I", file.read(4))
+            triangles = numpy.frombuffer(file.read(), dtype = _stl_triangle)
+        self.assertEqual(len(triangles), count)
+        return header, triangles
+
+    def test_write_stl(self):
+        for chunk_size in [1, 5, 12, 1000]:
+            file_name = self.path("test.stl")
+            count = write_stl(iter([self.cube, self.moved_cube]), file_name, chunk_size = chunk_size)
+            self.assertEqual(count, 24)
+
+            header, triangles = self.read_stl(file_name)
+            self.assertTrue(header.startswith(b"Generated by cadlib"))
+            self.assertEqual(len(header), 80)
+            self.assertEqual(triangles["vertices"].tolist(), numpy.concatenate([self.cube.triangles(), self.moved_cube.triangles()]).tolist())
+            self.assertEqual(triangles["normal"][:12].tolist(), self.cube.normals().tolist())
+            self.assertEqual(triangles["attribute"].tolist(), [0] * 24)
+
+        # Empty
+        self.assertEqual(write_stl([], file_name), 0)
+        self.assertEqual(len(self.read_stl(file_name)[1]), 0)
+
+        with self.assertRaises(ValueError): write_stl([], file_name, header = "x" * 81)
+
+    def test_write_obj(self):
+        file_name = self.path("test.obj")
+        self.assertEqual(write_obj(iter([self.cube, self.moved_cube]), file_name, chunk_size = 5), 24)
+
+        with open(file_name) as file:
+            lines = file.read().splitlines()
+
+        vertices = [[float(x) for x in line.split()[1:]] for line in lines if line.startswith("v ")]
+        faces    = [[int(x)   for x in line.split()[1:]] for line in lines if line.startswith("f ")]
+        self.assertEqual(vertices, numpy.concatenate([self.cube.vertices, self.moved_cube.vertices]).tolist())
+        self.assertEqual(faces, (numpy.concatenate([self.cube.faces, self.moved_cube.faces + 8]) + 1).tolist())
+        self.assertEqual([line for line in lines if line.startswith("o ")], ["o part_1", "o part_2"])
+
+    def test_render_to_file(self):
+        part = Cuboid(1, 2, 3) + Sphere(1).right(5)
+
+        stl = self.path("part.STL")
+        render_to_file(part, stl, fn = 10)
+        _, triangles = self.read_stl(stl)
+        self.assertEqual(len(triangles), part.to_mesh(10).face_count)
+
+        obj = self.path("part.obj")
+        render_to_file(part, obj, fn = 10)
+        with open(obj) as file:
+            self.assertEqual(sum(line.startswith("f ") for line in file), part.to_mesh(10).face_count)
+
+        with self.assertRaises(TypeError):
+            render_to_file(ScadObject("sphere", [1], None, None), stl)
+
+    def test_render_to_file_not_tessellable(self):
+        # Objects that cannot be tessellated are reported before writing
+        file_name = self.path("part.stl")
+        with open(file_name, "w") as file:
+            file.write("previous")
+
+        for part in [Cuboid(1, 2, 3) + (Sphere(2) - Cuboid(1, 1, 1)).up(1), Sphere(2) * Cuboid(1, 1, 1)]:
+            with self.assertRaisesRegex(TypeError, "to_implicit_mesh"):
+                render_to_file(part, file_name)
+
+        with self.assertRaisesRegex(TypeError, "Difference"):
+            render_to_file(Union([Sphere(1) - Sphere(2)]), file_name)
+
+        with open(file_name) as file:
+            self.assertEqual(file.read(), "previous")
+
+    @skipUnless(hasattr(os, "mkfifo"), "Named pipes are not supported")
+    def test_write_stl_pipe(self):
+        # A pipe is not seekable
+        file_name = self.path("pipe.stl")
+        os.mkfifo(file_name)
+
+        data = []
+        reader = threading.Thread(target = lambda: data.append(open(file_name, "rb").read()))
+        reader.start()
+        self.assertEqual(write_stl(iter([self.cube, self.moved_cube]), file_name, chunk_size = 5), 24)
+        reader.join()
+
+        copy = self.path("copy.stl")
+        with open(copy, "wb") as file:
+            file.write(data[0])
+        _, triangles = self.read_stl(copy)
+        self.assertEqual(triangles["vertices"].tolist(), numpy.concatenate([self.cube.triangles(), self.moved_cube.triangles()]).tolist())
+
+    def test_failed_export(self):
+        # If the meshes cannot be created, the file is not changed
+        def meshes():
+            yield self.cube
+            raise RuntimeError("mesh failed")
+
+        for name, write in [("part.stl", write_stl), ("part.obj", write_obj)]:
+            file_name = self.path(name)
+            with open(file_name, "w") as file:
+                file.write("previous")
+
+            with self.assertRaises(RuntimeError):
+                write(meshes(), file_name, chunk_size = 5)
+
+            with open(file_name) as file:
+                self.assertEqual(file.read(), "previous")
+
+        # The temporary files are removed
+        self.assertEqual(sorted(os.listdir(self.temporary_directory.name)), ["part.obj", "part.stl"])
@@ -0,0 +1,52 @@
+import math
+
+import numpy
+
+from cadlib.mesh import mesh_sdf, Mesh
+from cadlib.mesh import sdf
+from cadlib.object.primitives import Sphere, Cuboid
+from cadlib.util import Bounds
+from tests.unit_test import TestCase
+
+def sphere_sdf(points):
+    return sdf.sphere(points, 2)
+
+class TestImplicit(TestCase):
+    def assertClosed(self, mesh):
+        edges = [(face[i], face[(i + 1) % 3]) for face in mesh.faces.tolist() for i in range(3)]
+        self.assertEqual(len(edges), len(set(edges)))
+        self.assertEqual(set(edges), set((b, a) for a, b in edges))
+
+    def test_sphere(self):
+        mesh = mesh_sdf(sphere_sdf, Bounds([-2, -2, -2], [2, 2, 2]), 0.2)
+        self.assertClosed(mesh)
+        self.assertAlmostEqual(mesh.volume(), 4 / 3 * math.pi * 8, delta = 0.2)
+
+        # The vertices are on the surface
+        self.assertTrue(numpy.allclose(numpy.linalg.norm(mesh.vertices, axis = 1), 2, atol = 0.05))
+
+        # The normals point outside
+        centers = mesh.triangles().mean(axis = 1)
+        self.assertTrue((numpy.einsum("ij,ij->i", mesh.normals(), centers) >= 0).all())
+
+    def test_clipped(self):
+        # Only the part within the bounds is meshed
+        mesh = mesh_sdf(sphere_sdf, Bounds([-2, -2, 0], [2, 2, 2]), 0.2)
+        self.assertClosed(mesh)
+        self.assertAlmostEqual(mesh.bounds().minimum[2], 0)
+
+    def test_empty(self):
+        self.assertEqual(mesh_sdf(sphere_sdf, Bounds.empty(), 0.2).face_count, 0)
+        self.assertEqual(mesh_sdf(sphere_sdf, Bounds([5, 5, 5], [6, 6, 6]), 0.2).face_count, 0)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError): mesh_sdf(sphere_sdf, Bounds.infinite(), 0.2)
+        with self.assertRaises(ValueError): mesh_sdf(sphere_sdf, Bounds([-2, -2, -2], [2, 2, 2]), 0)
+        with self.assertRaises(ValueError): mesh_sdf(sphere_sdf, Bounds([-2, -2, -2], [2, 2, 2]), 1e-9)
+
+    def test_processes(self):
+        bounds = Bounds([-2, -2, -2], [2, 2, 2])
+        expected = mesh_sdf(sphere_sdf, bounds, 0.5)
+        actual = mesh_sdf(sphere_sdf, bounds, 0.5, processes = 2, batch_size = 100)
+        self.assertTrue(numpy.array_equal(actual.vertices, expected.vertices))
+        self.assertTrue(numpy.array_equal(actual.faces, expected.faces))
@@ -0,0 +1,81 @@
+import numpy
+
+from cadlib.mesh import Mesh
+from cadlib.mesh import tessellation
+from cadlib.transform.primitives import Translate, ScaleAxes, RotateXyz
+from cadlib.util import Vector, Bounds
+from tests.unit_test import TestCase
+
+class TestMesh(TestCase):
+    def setUp(self):
+        # A tetrahedron with volume 1/6
+        self.tetrahedron = Mesh(
+            [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]],
+            [[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]])
+
+    def test_construction(self):
+        self.assertEqual(self.tetrahedron.vertex_count, 4)
+        self.assertEqual(self.tetrahedron.face_count, 4)
+        self.assertEqual(self.tetrahedron.vertices.dtype, numpy.float64)
+
+        self.assertEqual(Mesh.empty().vertex_count, 0)
+        self.assertEqual(Mesh.empty().face_count, 0)
+
+        # Invalid index
+        with self.assertRaises(ValueError): Mesh([[0, 0, 0], [1, 0, 0], [0, 1, 0]], [[0, 1, 3]])
+        with self.assertRaises(ValueError): Mesh([[0, 0, 0], [1, 0, 0], [0, 1, 0]], [[0, 1, -1]])
+
+    def test_immutability(self):
+        with self.assertRaises(ValueError): self.tetrahedron.vertices[0, 0] = 1
+        with self.assertRaises(ValueError): self.tetrahedron.faces[0, 0] = 1
+
+        # Changing the source arrays does not affect the mesh
+        vertices = numpy.zeros((3, 3))
+        mesh = Mesh(vertices, [[0, 1, 2]])
+        vertices[0, 0] = 1
+        self.assertEqual(mesh.vertices[0, 0], 0)
+
+    def test_volume(self):
+        self.assertAlmostEqual(self.tetrahedron.volume(), 1 / 6)
+        self.assertAlmostEqual(Mesh.empty().volume(), 0)
+
+    def test_normals(self):
+        normals = self.tetrahedron.normals()
+        self.assertEqual(normals[0].tolist(), [0, 0, -1])
+        self.assertAlmostEqual(Vector(*normals[3].tolist()), Vector(1, 1, 1).normalized())
+
+    def test_bounds(self):
+        self.assertEqual(self.tetrahedron.bounds(), Bounds(Vector(0, 0, 0), Vector(1, 1, 1)))
+        self.assertTrue(Mesh.empty().bounds().is_empty)
+
+    def test_concatenate(self):
+        moved = self.tetrahedron.transformed(Translate([2, 0, 0]).to_matrix())
+        mesh = Mesh.concatenate([self.tetrahedron, moved])
+
+        self.assertEqual(mesh.vertex_count, 8)
+        self.assertEqual(mesh.face_count, 8)
+        self.assertEqual(mesh.faces[4:].tolist(), (self.tetrahedron.faces + 4).tolist())
+        self.assertAlmostEqual(mesh.volume(), 2 / 6)
+        self.assertEqual(mesh.bounds(), Bounds(Vector(0, 0, 0), Vector(3, 1, 1)))
+
+        self.assertEqual(Mesh.concatenate([]).face_count, 0)
+
+    def test_transformed(self):
+        cube = tessellation.cuboid(1, 2, 3)
+
+        moved = cube.transformed(Translate([1, 2, 3]).to_matrix())
+        self.assertEqual(moved.bounds(), Bounds(Vector(1, 2, 3), Vector(2, 4, 6)))
+        self.assertEqual(moved.faces.tolist(), cube.faces.tolist())
+
+        rotated = cube.transformed(RotateXyz(0, 0, 90).to_matrix())
+        self.assertAlmostEqual(rotated.bounds().minimum, Vector(-2, 0, 0))
+        self.assertAlmostEqual(rotated.bounds().maximum, Vector(0, 1, 3))
+        self.assertAlmostEqual(rotated.volume(), 6)
+
+        # Scaling scales the volume
+        self.assertAlmostEqual(cube.transformed(ScaleAxes(2, 3, 4).to_matrix()).volume(), 6 * 24)
+
+        # Mirroring reverses the faces, so the volume stays positive
+        mirrored = cube.transformed(ScaleAxes(-1, 1, 1).to_matrix())
+        self.assertAlmostEqual(mirrored.volume(), 6)
+        self.assertEqual(mirrored.faces.tolist(), cube.faces[:, ::-1].tolist())
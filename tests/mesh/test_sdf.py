@@ -0,0 +1,48 @@
+import math
+
+import numpy
+
+from cadlib.mesh import sdf
+from tests.unit_test import TestCase
+
+class TestSdf(TestCase):
+    def test_as_points(self):
+        self.assertEqual(sdf.as_points([[1, 2, 3]]).dtype, numpy.float64)
+        self.assertEqual(sdf.as_points([]).shape, (0, 3))
+        self.assertEqual(sdf.as_points(numpy.zeros((5, 3))).shape, (5, 3))
+        with self.assertRaises(ValueError): sdf.as_points([1, 2, 3])
+        with self.assertRaises(ValueError): sdf.as_points(numpy.zeros((5, 2)))
+
+    def test_capped_cone(self):
+        # Compare a cylinder with the distance calculated from the radial and
+        # axial distances
+        rng = numpy.random.default_rng(0)
+        points = rng.uniform(-3, 3, (1000, 3))
+        actual = sdf.capped_cone(points, [0, 0, -1], [0, 0, 1], 1, 1)
+
+        radial = numpy.hypot(points[:, 0], points[:, 1]) - 1
+        axial = numpy.abs(points[:, 2]) - 1
+        outside = numpy.hypot(numpy.maximum(radial, 0), numpy.maximum(axial, 0))
+        inside = numpy.minimum(numpy.maximum(radial, axial), 0)
+        self.assertTrue(numpy.allclose(actual, outside + inside))
+
+    def test_slab(self):
+        self.assertEqual(sdf.slab(numpy.array([[0, 0, 5]]), [0, 0, 1], -math.inf, 2).tolist(), [3])
+
+    def test_batches(self):
+        # The distances to multiple primitives are the same as to each
+        # primitive
+        rng = numpy.random.default_rng(0)
+        points = rng.uniform(-3, 3, (100, 3))
+
+        centers = [[0, 0, 0], [1, 2, 3]]
+        actual = sdf.spheres(points, centers, [1, -2])
+        self.assertEqual(actual.shape, (100, 2))
+        self.assertTrue(numpy.allclose(actual[:, 1], sdf.sphere(points - centers[1], 2)))
+
+        bases = [[0, 0, -1], [1, 0, 0], [0, 0, 0]]
+        caps  = [[0, 0,  1], [3, 1, 0], [0, 0, 2]]
+        actual = sdf.capped_cones(points, bases, caps, [1, 0.5, 2], [1, 1, 0])
+        self.assertEqual(actual.shape, (100, 3))
+        for index, radii in enumerate([(1, 1), (0.5, 1), (2, 0)]):
+            self.assertTrue(numpy.allclose(actual[:, index], sdf.capped_cone(points, bases[index], caps[index], *radii)))
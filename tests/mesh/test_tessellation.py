@@ -0,0 +1,77 @@
+import math
+
+from cadlib.mesh import tessellation
+from cadlib.util import Vector, Bounds
+from tests.unit_test import TestCase
+
+class TestTessellation(TestCase):
+    def assertClosed(self, mesh):
+        # Each edge of a closed, consistently oriented mesh appears exactly
+        # once in each direction
+        edges = [(face[i], face[(i + 1) % 3]) for face in mesh.faces.tolist() for i in range(3)]
+        self.assertEqual(len(edges), len(set(edges)))
+        self.assertEqual(set(edges), set((b, a) for a, b in edges))
+
+    def test_fragments(self):
+        # fn
+        self.assertEqual(tessellation.fragments(1, 10), 10)
+        self.assertEqual(tessellation.fragments(1, 2), 3)
+        self.assertEqual(tessellation.fragments(1, 0), 5)
+
+        # fa and fs
+        self.assertEqual(tessellation.fragments(1), 5)       # Minimum
+        self.assertEqual(tessellation.fragments(5), 16)      # fs: ceil(5 * 2 * pi / 2)
+        self.assertEqual(tessellation.fragments(100), 30)    # fa: 360 / 12
+        self.assertEqual(tessellation.fragments(100, fa = 6), 60)
+        self.assertEqual(tessellation.fragments(5, fs = 1), 30)
+
+        # Tiny radius
+        self.assertEqual(tessellation.fragments(0, 100), 3)
+
+    def test_cuboid(self):
+        mesh = tessellation.cuboid(1, 2, 3)
+        self.assertEqual(mesh.vertex_count, 8)
+        self.assertEqual(mesh.face_count, 12)
+        self.assertClosed(mesh)
+        self.assertEqual(mesh.volume(), 6)
+        self.assertEqual(mesh.bounds(), Bounds(Vector(0, 0, 0), Vector(1, 2, 3)))
+
+    def test_sphere(self):
+        # 5 fragments: 3 rings
+        mesh = tessellation.sphere(1)
+        self.assertEqual(mesh.vertex_count, 15)
+        self.assertClosed(mesh)
+
+        # The vertices are at the ring centers, like in OpenSCAD
+        mesh = tessellation.sphere(2, 4)
+        self.assertEqual(mesh.vertex_count, 8)
+        self.assertAlmostEqual(mesh.vertices[0, 2], 2 * math.cos(math.pi / 4))
+        self.assertClosed(mesh)
+
+        # With high resolution, the volume approaches the volume of the sphere
+        mesh = tessellation.sphere(2, 100)
+        self.assertClosed(mesh)
+        self.assertAlmostEqual(mesh.volume(), 4 / 3 * math.pi * 8, delta = 0.1)
+
+    def test_cylinder(self):
+        mesh = tessellation.cylinder(2, 1, 1, 6)
+        self.assertEqual(mesh.vertex_count, 12)
+        self.assertClosed(mesh)
+        self.assertAlmostEqual(mesh.volume(), 2 * 6 * math.sqrt(3) / 4) # Hexagonal prism
+        self.assertAlmostEqual(mesh.bounds().minimum, Vector(-1, -math.sqrt(3) / 2, 0))
+        self.assertAlmostEqual(mesh.bounds().maximum, Vector(1, math.sqrt(3) / 2, 2))
+
+        # Frustum
+        mesh = tessellation.cylinder(3, 1, 2, 100)
+        self.assertClosed(mesh)
+        self.assertAlmostEqual(mesh.volume(), math.pi * 3 / 3 * (1 + 2 + 4), delta = 0.05)
+
+        # Cones (apex at the top and at the bottom)
+        for r1, r2 in [(1, 0), (0, 1)]:
+            mesh = tessellation.cylinder(3, r1, r2, 6)
+            self.assertEqual(mesh.vertex_count, 7)
+            self.assertClosed(mesh)
+            self.assertAlmostEqual(mesh.volume(), 6 * math.sqrt(3) / 4)
+
+        # Degenerate
+        self.assertEqual(tessellation.cylinder(3, 0, 0).face_count, 0)
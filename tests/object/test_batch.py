@@ -0,0 +1,150 @@
+import warnings
+
+import numpy
+
+from tests.unit_test import TestCase
+from cadlib.object import SphereBatch, FrustumBatch
+from cadlib.object.primitives import Sphere, Frustum
+from cadlib.csg import Union
+from cadlib.scad import ScadObject, ScadExpression, ScadFile
+from cadlib.transform.primitives import Translate
+from cadlib.util import Bounds, Vector
+
+class TestBatch(TestCase):
+    def spheres(self):
+        return SphereBatch([[0, 0, 0], [5, 0, 0], [0, 5, 0]], [1, 2, 0.5])
+
+    def frustums(self):
+        return FrustumBatch([[0, 0, 0], [5, 0, 0], [0, 0, 0]], [[0, 0, 2], [5, 0, -2], [3, 0, 0]], [1, 1, 2], [1, 0, 1])
+
+    def test_construction(self):
+        with self.assertNothingRaised(): SphereBatch([[0, 0, 0]], 1)
+        with self.assertNothingRaised(): SphereBatch(numpy.zeros((10, 3)), numpy.ones(10))
+        with self.assertNothingRaised(): SphereBatch([], 1)
+        with self.assertNothingRaised(): FrustumBatch.cylinders([[0, 0, 0]], [[0, 0, 1]], 1)
+
+        with self.assertRaises(TypeError): SphereBatch([["a", 0, 0]], 1)
+        with self.assertRaises(TypeError): SphereBatch([[0, 0, 0]], "1")
+        with self.assertRaises(ValueError): SphereBatch([[0, 0]], 1)
+        with self.assertRaises(ValueError): SphereBatch([[0, 0, 0]], [1, 2])
+        with self.assertRaises(ValueError): SphereBatch([[0, 0, numpy.inf]], 1)
+        with self.assertRaises(ValueError): FrustumBatch([[0, 0, 0]], [[0, 0, 1], [0, 0, 2]], 1, 1)
+
+        with warnings.catch_warnings(record = True) as caught:
+            warnings.simplefilter("always")
+            SphereBatch([[0, 0, 0], [1, 0, 0]], [1, 0])
+            FrustumBatch.cylinders([[0, 0, 0]], [[0, 0, 0]], 1)
+        self.assertEqual([str(warning.message) for warning in caught], ["radius is 0", "length is 0"])
+
+        # The data is copied and cannot be modified
+        centers = numpy.zeros((2, 3))
+        batch = SphereBatch(centers, 1)
+        centers[0, 0] = 1
+        self.assertEqual(batch.centers[0, 0], 0)
+        with self.assertRaises(ValueError): batch.centers[0, 0] = 1
+
+    def test_columns(self):
+        spheres = self.spheres()
+        self.assertEqual(spheres.instance_count, 3)
+        self.assertEqual(spheres.centers.tolist(), [[0, 0, 0], [5, 0, 0], [0, 5, 0]])
+        self.assertEqual(spheres.radii.tolist(), [1, 2, 0.5])
+        self.assertEqual(spheres.nbytes, 3 * 4 * 8)
+
+        frustums = self.frustums()
+        self.assertEqual(frustums.caps.tolist(), [[0, 0, 2], [5, 0, -2], [3, 0, 0]])
+        self.assertEqual(frustums.cap_radii.tolist(), [1, 0, 1])
+        self.assertEqual(FrustumBatch.cylinders([[0, 0, 0]], [[0, 0, 1]], 2).base_radii.tolist(), [2])
+
+    def test_equality(self):
+        self.assertEqual   (self.spheres(), self.spheres())
+        self.assertEqual   (SphereBatch([[1, 2, 3]], 1), SphereBatch(numpy.array([[1., 2., 3.]]), [1]))
+        self.assertNotEqual(SphereBatch([[1, 2, 3]], 1), SphereBatch([[1, 2, 3]], 2))
+        self.assertNotEqual(SphereBatch([[1, 2, 3]], 1), FrustumBatch([[1, 2, 3]], [[1, 2, 4]], 1, 1))
+
+        self.assertEqual(hash(self.spheres()), hash(self.spheres()))
+        self.assertEqual(self.spheres().digest(), self.spheres().digest())
+        self.assertNotEqual(self.spheres().digest(), SphereBatch([[1, 2, 3]], 1).digest())
+
+    def test_instances(self):
+        spheres = self.spheres()
+        self.assertEqual(spheres.instance(1), Translate([5, 0, 0]) * Sphere(2))
+        with self.assertRaises(IndexError): spheres.instance(3)
+        with self.assertRaises(IndexError): spheres.instance(-1)
+        with self.assertRaises(TypeError): spheres.instance(0.5)
+
+        frustums = self.frustums()
+        self.assertEqual(frustums.instance(1), Frustum([5, 0, 0], [5, 0, -2], 1, 0))
+
+        self.assertEqual(spheres.expanded(), Union(list(spheres.instances())))
+        self.assertEqual(len(frustums.expanded().children), 3)
+
+    def test_to_scad(self):
+        self.assertEqual(SphereBatch([[1, 2, 3]], 4).to_scad(),
+            ScadObject("for", None, [("p", ScadExpression("[[1.0, 2.0, 3.0, 4.0]]"))], [
+                ScadObject("translate", [ScadExpression("[p[0], p[1], p[2]]")], None, [
+                    ScadObject("sphere", [ScadExpression("p[3]")], None, None)])]))
+
+        self.assertEqual(self.frustums().to_scad().to_code(simplify = True),
+            "for(p = [[0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 2.0, 1.0, 1.0], "
+                     "[5.0, 0.0, 0.0, 180.0, 1.0, 0.0, 0.0, 2.0, 1.0, 0.0], "
+                     "[0.0, 0.0, 0.0, 90.0, 0.0, 3.0, 0.0, 3.0, 2.0, 1.0]])\n"
+            "    translate([p[0], p[1], p[2]])\n"
+            "        rotate(a = p[3], v = [p[4], p[5], p[6]])\n"
+            "            cylinder(p[7], r1 = p[8], r2 = p[9]);")
+
+        # The size of the code does not depend on the number of instances,
+        # except for the data
+        code = ScadFile(SphereBatch(numpy.zeros((1000, 3)), 1)).to_code()
+        self.assertEqual(code.count("sphere"), 1)
+        self.assertEqual(code.count("[0.0, 0.0, 0.0, 1.0]"), 1000)
+
+    def test_to_tree(self):
+        self.assertEqual(self.spheres().to_tree().lines(), ["Batch of 3 spheres"])
+
+    def test_bounds(self):
+        self.assertEqual(self.spheres().bounds, Bounds([-1, -2, -2], [7, 5.5, 2]))
+        self.assertTrue(SphereBatch([], 1).bounds.is_empty)
+
+        # Same as the bounds of the instances
+        frustums = self.frustums()
+        self.assertEqual(frustums.bounds, frustums.expanded().bounds)
+        minimum, maximum = frustums.instance_bounds()
+        for index, instance in enumerate(frustums.instances()):
+            self.assertAlmostEqual(Vector(*minimum[index].tolist()), instance.bounds.minimum)
+            self.assertAlmostEqual(Vector(*maximum[index].tolist()), instance.bounds.maximum)
+
+    def test_queries(self):
+        spheres = self.spheres()
+        self.assertEqual(spheres.instances_containing([5, 1, 0]).tolist(), [1])
+        self.assertEqual(spheres.instances_containing([1, 0, 0]).tolist(), [0])
+        self.assertEqual(spheres.instances_containing([2, 2, 2]).tolist(), [])
+
+        self.assertEqual(spheres.instances_intersecting(Bounds([0, 0, 0], [3, 3, 3])).tolist(), [0, 1])
+        self.assertEqual(spheres.instances_intersecting(Bounds([-5, 4, -5], [5, 5, 5])).tolist(), [2])
+        self.assertEqual(spheres.instances_intersecting(Bounds.empty()).tolist(), [])
+
+        self.assertEqual(self.frustums().instances_containing([1, 0, 0.5]).tolist(), [0, 2])
+
+    def test_sdf(self):
+        spheres = self.spheres()
+        self.assertAlmostEqual(list(spheres.sdf([[0, 0, 0], [2.5, 0, 0], [0, 0, 10]])), [-1, 0.5, 9])
+        self.assertEqual(list(SphereBatch([], 1).sdf([[0, 0, 0]])), [numpy.inf])
+
+        # Same as the union of the instances, also if the points are processed
+        # in chunks
+        rng = numpy.random.default_rng(0)
+        points = rng.uniform(-3, 8, (100, 3))
+        frustums = self.frustums()
+        frustums._sdf_chunk_size = 10
+        self.assertTrue(numpy.allclose(frustums.sdf(points), frustums.expanded().sdf(points)))
+        self.assertTrue(numpy.allclose(spheres.sdf(points), spheres.expanded().sdf(points)))
+
+    def test_meshes(self):
+        spheres = self.spheres()
+        meshes = list(spheres.meshes(fn = 8))
+        self.assertEqual(len(meshes), 3)
+        self.assertEqual(meshes[1].bounds(), spheres.instance(1).to_mesh(fn = 8).bounds())
+        self.assertEqual(spheres.to_mesh(fn = 8).face_count, sum(mesh.face_count for mesh in meshes))
+
+        frustums = self.frustums()
+        self.assertEqual(len(list(frustums.meshes(fn = 8))), 3)
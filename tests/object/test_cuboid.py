@@ -1,5 +1,6 @@
 from tests.unit_test import TestCase
 from cadlib.object.primitives import Cuboid
+from cadlib.util import Bounds
 
 
 class TestCuboid(TestCase):
@@ -49,3 +50,16 @@ class TestCuboid(TestCase):
     def test_str(self):
         self.assertStr(Cuboid(11, 22, 33), "Cuboid with width 11, depth 22, and height 33")
         self.assertStr(Cuboid(44, 44, 44), "Cube with size 44")
+
+    def test_bounds(self):
+        self.assertEqual(Cuboid(1, 2, 3).bounds, Bounds([0, 0, 0], [1, 2, 3]))
+        self.assertEqual(Cuboid(-1, 2, 3).bounds, Bounds([-1, 0, 0], [0, 2, 3]))
+
+        # Cached
+        cuboid = Cuboid(1, 2, 3)
+        self.assertIs(cuboid.bounds, cuboid.bounds)
+
+    def test_sdf(self):
+        # Inside, outside a face, outside an edge
+        self.assertEqual(Cuboid(2, 4, 6).sdf([[1, 1, 1], [1, 2, 8], [5, 8, 3]]).tolist(), [-1, 2, 5])
+        self.assertEqual(Cuboid(-2, 2, 2).sdf([[-1, 1, 1], [1, 1, 1]]).tolist(), [-1, 1])
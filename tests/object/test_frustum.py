@@ -3,6 +3,7 @@ import math
 from cadlib.object.primitives import Frustum
 from cadlib.util.vector import Vector, X, Y, Z, origin
 from cadlib.scad import ScadObject
+from cadlib.util import Bounds
 from tests.unit_test import TestCase
 
 class TestFrustum(TestCase):
@@ -114,3 +115,31 @@ class TestFrustum(TestCase):
 
     def test_str(self):
         self.assertStr(Frustum(Y, 5*X, 1, 2), "Frustum with base <0, 1, 0> (base radius 1) and cap <5, 0, 0> (cap radius 2)")
+
+    def test_sdf(self):
+        # Cylinder: inside, side, cap, edge
+        cylinder = Frustum([0, 0, 1], [0, 0, 3], 1, 1)
+        self.assertEqual(cylinder.sdf([[0, 0, 2], [3, 0, 2], [0, 0, 5], [4, 0, 7]]).tolist(), [-1, 2, 2, 5])
+
+        # Cone along X with the apex at 1
+        cone = Frustum(origin, X, 1, 0)
+        s = math.sqrt(0.5)
+        for actual, expected in zip(cone.sdf([[1, 0, 1], [0.25, 0, 0], [-1, 0, 0], [2, 0, 0]]), [s, -0.25, 1, 1]):
+            self.assertAlmostEqual(actual, expected)
+
+    def test_bounds(self):
+        # Along an axis
+        self.assertEqual(Frustum([1, 2, 3], [1, 2, 6], 1, 2).bounds, Bounds([-1, 0, 3], [3, 4, 6]))
+        self.assertEqual(Frustum(origin, -X, 1, 0).bounds, Bounds([-1, -1, -1], [0, 1, 1]))
+
+        # Diagonal: the bounds of the discs, which are exact
+        bounds = Frustum(origin, [1, 1, 0], 1, 1).bounds
+        s = math.sqrt(0.5)
+        self.assertAlmostEqual(bounds.minimum, Vector(-s, -s, -1))
+        self.assertAlmostEqual(bounds.maximum, Vector(1 + s, 1 + s, 1))
+
+        # The bounds contain the mesh
+        frustum = Frustum([1, 2, 3], [4, 3, 2], 1, 2)
+        mesh_bounds = frustum.to_mesh(100).bounds()
+        self.assertTrue(frustum.bounds.contains(mesh_bounds.minimum))
+        self.assertTrue(frustum.bounds.contains(mesh_bounds.maximum))
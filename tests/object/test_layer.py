@@ -4,6 +4,8 @@ from cadlib.util.vector import Vector
 from cadlib.util.vector import X, Y, Z
 from cadlib.scad import ScadObject
 from cadlib import infinity
+from cadlib.util import Bounds
+import math
 
 class TestLayer(TestCase):
     def test_construction(self):
@@ -56,3 +58,13 @@ class TestLayer(TestCase):
 
     def test_str(self):
         self.assertStr(Layer(X, 2, 3), "Layer with normal <1, 0, 0> from 2 to 3")
+
+    def test_bounds(self):
+        inf = math.inf
+        self.assertEqual(Layer(Z, 3, 2).bounds, Bounds([-inf, -inf, 2], [inf, inf, 3]))
+        self.assertEqual(Layer(-Y, 1, 2).bounds, Bounds([-inf, -2, -inf], [inf, -1, inf]))
+        self.assertEqual(Layer(X + Z, 1, 2).bounds, Bounds.infinite())
+
+    def test_sdf(self):
+        self.assertEqual(Layer(Z, 3, 1).sdf([[0, 0, 2], [0, 0, 5], [0, 0, 0]]).tolist(), [-1, 2, 1])
+        self.assertEqual(Layer(-Y, 1, 2).sdf([[0, -1.5, 0], [0, 0, 0]]).tolist(), [-0.5, 1])
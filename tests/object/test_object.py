@@ -1,12 +1,20 @@
 from cadlib.object import Object, Transformed
-from cadlib.object.primitives import Sphere, Cuboid, Frustum
+from cadlib.object.primitives import Sphere, Cuboid, Frustum, Plane, Layer
 from cadlib.transform.chained import Chained
 from cadlib.transform.primitives import Translate, ScaleAxes, ScaleUniform, ScaleAxisFactor, RotateXyz
-from cadlib.util.vector import Z, origin
+from cadlib.util.vector import Vector, Z, origin
+from cadlib.util import Bounds
 from tests.unit_test import TestCase
 from cadlib.csg import Intersection, Difference, Union
 from cadlib.transform.primitives import RotateYpr
 from cadlib.util.tree import Node
+from cadlib.scad import ScadFile, ScadCache
+import math
+import pickle
+import subprocess
+import sys
+import os
+from tempfile import TemporaryDirectory
 
 
 class TestObject(TestCase):
@@ -176,3 +184,166 @@ class TestObject(TestCase):
     def test_not_implemented(self):
         o = Object()
         with self.assertRaises(NotImplementedError): o.to_scad()
+        with self.assertRaises(NotImplementedError): o.digest()
+
+    def test_identity(self):
+        # Objects without a key are only equal to themselves
+        class Custom(Object):
+            def to_scad(self):
+                return Sphere(1).to_scad()
+
+        a = Custom()
+        b = Custom()
+        self.assertEqual(a, a)
+        self.assertNotEqual(a, b)
+        self.assertIn(a, [b, a])
+        self.assertNotIn(a, [b])
+        self.assertEqual(len({a, a, b}), 2)
+        self.assertEqual({a: 1}[a], 1)
+        self.assertEqual(len({a + Sphere(1), a + Sphere(1), b + Sphere(1)}), 2)
+
+    def test_hash(self):
+        def part(offset):
+            return Sphere(2) + Translate([offset, 0, 0]) * Cuboid(1, 2, 3) - Frustum(origin, Z, 1, 2)
+
+        # Equal objects have equal hashes
+        self.assertEqual(hash(part(1)), hash(part(1)))
+        self.assertEqual(hash(Sphere(1)), hash(Sphere(1.0)))
+
+        # Objects can be used in sets and as dict keys
+        self.assertEqual(len({part(1), part(1), part(2)}), 2)
+        self.assertEqual({part(1): "a"}[part(1)], "a")
+
+        # Equal values, but different types
+        self.assertNotEqual(Union([Sphere(1)]), Intersection([Sphere(1)]))
+        self.assertEqual(len({Union([Sphere(1)]), Intersection([Sphere(1)])}), 2)
+
+        # Pickled objects (e. g. in another process) don't keep the hash
+        self.assertIsNone(pickle.loads(pickle.dumps(part(1)))._hash)
+        self.assertEqual(pickle.loads(pickle.dumps(part(1))), part(1))
+
+        # The hash is cached
+        p = part(1)
+        self.assertIsNone(p._hash)
+        h = hash(p)
+        self.assertEqual(p._hash, h)
+        self.assertEqual(hash(p), h)
+
+    def test_to_implicit_mesh(self):
+        # Differences and intersections are supported
+        mesh = (Cuboid(2, 3, 4) - Sphere(1)).to_implicit_mesh(0.1)
+        self.assertAlmostEqual(mesh.volume(), 24 - math.pi / 6, delta = 0.1)
+        mesh = (Sphere(2) * Cuboid(2, 2, 2)).to_implicit_mesh(0.1)
+        self.assertAlmostEqual(mesh.volume(), 4 / 3 * math.pi, delta = 0.1)
+
+        # Unbounded objects require bounds
+        with self.assertRaises(ValueError): Plane(Z, 1).to_implicit_mesh(0.1)
+        mesh = Plane(Z, 1).to_implicit_mesh(0.05, bounds = Bounds([0, 0, 0], [1, 1, 2]))
+        self.assertAlmostEqual(mesh.volume(), 1, delta = 0.1)
+
+    def test_to_mesh(self):
+        cube = Cuboid(1, 2, 3)
+
+        self.assertAlmostEqual(cube.to_mesh().volume(), 6)
+        self.assertAlmostEqual(Sphere(2).to_mesh(100).volume(), 4 / 3 * math.pi * 8, delta = 0.1)
+
+        # Frustum: the mesh is moved to the base and points to the cap
+        frustum = Frustum([1, 2, 3], [1, 2, 6], 1, 1).to_mesh(100)
+        self.assertAlmostEqual(frustum.volume(), 3 * math.pi, delta = 0.01)
+        self.assertAlmostEqual(frustum.bounds().minimum, Vector(0, 1, 3))
+        self.assertAlmostEqual(frustum.bounds().maximum, Vector(2, 3, 6))
+        self.assertAlmostEqual(Frustum(origin, [3, 0, 0], 1, 0).to_mesh(4).bounds().maximum, Vector(3, 1, 1))
+
+        # Transformed
+        mesh = (Translate([1, 2, 3]) * ScaleUniform(2) * cube).to_mesh()
+        self.assertAlmostEqual(mesh.volume(), 48)
+        self.assertEqual(mesh.bounds(), Bounds(Vector(1, 2, 3), Vector(3, 6, 9)))
+
+        # The resolution is passed on
+        self.assertEqual((Translate([1, 2, 3]) * Sphere(1)).to_mesh(10).vertex_count, 50)
+
+        # Meshes of parts
+        self.assertEqual(len(list(cube.meshes())), 1)
+        meshes = list((cube + (Sphere(1) + cube).up(2)).meshes(10))
+        self.assertEqual(len(meshes), 3)
+        self.assertEqual(meshes[2].bounds(), Bounds(Vector(0, 0, 2), Vector(1, 2, 5)))
+
+        # Union
+        union = cube + cube.right(2)
+        self.assertAlmostEqual(union.to_mesh().volume(), 12)
+        self.assertEqual(union.to_mesh().face_count, 24)
+
+        # Planes and layers are represented by large cuboids, like in OpenSCAD
+        self.assertEqual(Plane(Z, 1).to_mesh().bounds().maximum[2], 1)
+        self.assertAlmostEqual(Layer(Z, 1, 3).to_mesh().bounds().maximum[2], 3)
+
+        # Not supported
+        with self.assertRaises(NotImplementedError): (cube - Sphere(1)).to_mesh()
+        with self.assertRaises(NotImplementedError): (cube * Sphere(1)).to_mesh()
+
+    def test_digest(self):
+        def part(offset):
+            return Sphere(2) + Translate([offset, 0, 0]) * Cuboid(1, 2, 3) - Frustum(origin, Z, 1, 2)
+
+        self.assertEqual(part(1).digest(), part(1).digest())
+        self.assertNotEqual(part(1).digest(), part(2).digest())
+        self.assertNotEqual(Union([Sphere(1)]).digest(), Intersection([Sphere(1)]).digest())
+        self.assertEqual(len(part(1).digest()), 64)
+
+        # The digest does not depend on the process (unlike the hash)
+        code = "from cadlib.object.primitives import Sphere; print((Sphere(1) + Sphere(2).up(1)).digest())"
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        for seed in ["1", "2"]:
+            environment = dict(os.environ, PYTHONHASHSEED = seed)
+            output = subprocess.run([sys.executable, "-c", code], cwd = root, env = environment,
+                capture_output = True, text = True, check = True).stdout
+            self.assertEqual(output.strip(), (Sphere(1) + Sphere(2).up(1)).digest())
+
+    def test_deep_tree(self):
+        # Alternating unions and differences are not flattened
+        depth = 5 * sys.getrecursionlimit()
+        part = Sphere(1)
+        for index in range(depth):
+            part = (part + Sphere(2)) if index % 2 else (part - Cuboid(1, 1, 1))
+
+        scad = part.to_scad()
+        self.assertEqual(len(scad.to_code().split("\n")), 3 * depth + 1)
+
+        tree = part.to_tree()
+        self.assertEqual(len(tree.lines()), 2 * depth + 1)
+
+        self.assertIs(part.simplified(), part)
+        lines = (Translate([1, 0, 0]) * part).to_scad().to_code().split("\n")
+        self.assertEqual(lines[:2], ["translate([1, 0, 0]) {", "    union() {"])
+
+    def test_deep_tree_passes(self):
+        # Each pass of the export works for trees that are deeper than the
+        # recursion limit
+        depth = 5 * sys.getrecursionlimit()
+        def model():
+            part = Sphere(1)
+            for index in range(depth):
+                part = (part + Cuboid(1, 1, 1)).up(1) if index % 2 else (part - Sphere(2))
+            return part
+
+        part = model()
+        self.assertEqual(part, model())
+        self.assertNotEqual(part, model().up(1))
+        self.assertEqual(hash(part), hash(model()))
+        self.assertEqual(part.digest(), model().digest())
+        self.assertEqual(part.bounds, Bounds([-1, -1, 1], [1, 1, depth // 2 + 1]))
+        self.assertEqual(part.pruned(), part)
+        self.assertEqual(part.collapse_transforms(), part)
+
+        code = ScadFile(part).to_code()
+        self.assertEqual(ScadFile(part, simplify_tree = False).to_code(), code)
+        self.assertEqual(ScadFile(part, prune = True).to_code(), code)
+        self.assertEqual(ScadFile(part, collapse_transforms = True).to_code(), code)
+        self.assertEqual(ScadFile(part, processes = 2).to_code(), code)
+        self.assertEqual(ScadFile(part, extract_modules = True).to_code(), code)
+
+        with TemporaryDirectory() as directory:
+            cache = ScadCache(directory, min_size = 1)
+            self.assertEqual(ScadFile(part, cache = cache).to_code(), code)
+            cache = ScadCache(directory, min_size = 1)
+            self.assertEqual(ScadFile(model(), cache = cache).to_code(), code)
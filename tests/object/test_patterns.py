@@ -0,0 +1,160 @@
+from tests.unit_test import TestCase
+from cadlib.object import Transformed, GridPattern, LinearPattern, PolarPattern
+from cadlib.object.primitives import Cuboid, Sphere
+from cadlib.csg import Union
+from cadlib.scad import ScadObject, ScadExpression, ScadFile
+from cadlib.transform.primitives import Translate, RotateAxisAngle
+from cadlib.util import Bounds, Vector, X, Z
+
+class TestPatterns(TestCase):
+    def test_construction(self):
+        sphere = Sphere(1)
+
+        with self.assertNothingRaised(): LinearPattern(sphere, 3, [1, 0, 0])
+        with self.assertNothingRaised(): GridPattern(sphere, [3, 4, 5], [X, [0, 1, 0], Z])
+        with self.assertNothingRaised(): PolarPattern(sphere, 6)
+        with self.assertNothingRaised(): PolarPattern(sphere, 6, X, 10)
+
+        with self.assertRaises(TypeError): LinearPattern(None, 3, [1, 0, 0])
+        with self.assertRaises(TypeError): LinearPattern(sphere, 1.5, [1, 0, 0])
+        with self.assertRaises(ValueError): LinearPattern(sphere, 0, [1, 0, 0])
+        with self.assertRaises(ValueError): LinearPattern(sphere, 3, [1, 0])
+        with self.assertRaises(ValueError): GridPattern(sphere, [], [])
+        with self.assertRaises(ValueError): GridPattern(sphere, [1, 1, 1, 1], [X, X, X, X])
+        with self.assertRaises(ValueError): GridPattern(sphere, [3, 4], [X])
+        with self.assertRaises(ValueError): PolarPattern(sphere, 6, [0, 0, 0])
+        with self.assertRaises(TypeError): PolarPattern(sphere, 6, Z, "10")
+
+        self.assertEqual(PolarPattern(sphere, 8).angle, 45)
+
+    def test_equality(self):
+        sphere = Sphere(1)
+        self.assertEqual   (LinearPattern(sphere, 3, X), LinearPattern(Sphere(1), 3, [1, 0, 0]))
+        self.assertNotEqual(LinearPattern(sphere, 3, X), LinearPattern(sphere, 4, X))
+        self.assertNotEqual(LinearPattern(sphere, 3, X), LinearPattern(sphere, 3, Z))
+        self.assertNotEqual(LinearPattern(sphere, 3, X), GridPattern(sphere, [3], [X]))
+        self.assertEqual   (GridPattern(sphere, [2, 3], [X, Z]), GridPattern(sphere, [2, 3], [X, Z]))
+        self.assertNotEqual(GridPattern(sphere, [2, 3], [X, Z]), GridPattern(sphere, [3, 2], [X, Z]))
+        self.assertEqual   (PolarPattern(sphere, 4), PolarPattern(sphere, 4, Z, 90))
+        self.assertNotEqual(PolarPattern(sphere, 4), PolarPattern(sphere, 4, X))
+
+        self.assertEqual(hash(LinearPattern(sphere, 3, X)), hash(LinearPattern(Sphere(1), 3, X)))
+        self.assertEqual(LinearPattern(sphere, 3, X).digest(), LinearPattern(Sphere(1), 3, X).digest())
+
+    def test_instances(self):
+        cuboid = Cuboid(1, 2, 3)
+
+        linear = LinearPattern(cuboid, 3, [2, 0, 0])
+        self.assertEqual(linear.instance_count, 3)
+        self.assertEqual(list(linear.indices()), [0, 1, 2])
+        self.assertEqual(linear.instance(2), Transformed(Translate([4, 0, 0]), cuboid))
+        with self.assertRaises(IndexError): linear.instance(3)
+        with self.assertRaises(IndexError): linear.instance(-1)
+
+        grid = GridPattern(cuboid, [2, 3], [[2, 0, 0], [0, 3, 0]])
+        self.assertEqual(grid.instance_count, 6)
+        self.assertEqual(list(grid.indices()), [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2)])
+        self.assertEqual(grid.instance((1, 2)), Transformed(Translate([2, 6, 0]), cuboid))
+        with self.assertRaises(IndexError): grid.instance((2, 0))
+        with self.assertRaises(ValueError): grid.instance((1, ))
+        with self.assertRaises(TypeError): grid.instance((1, 0.5))
+
+        polar = PolarPattern(cuboid, 4)
+        self.assertEqual(polar.instance(3), Transformed(RotateAxisAngle(Z, 270), cuboid))
+        with self.assertRaises(IndexError): polar.instance(4)
+
+        self.assertEqual(grid.expanded(), Union(list(grid.instances())))
+        self.assertEqual(len(grid.expanded().children), 6)
+
+    def test_anchors(self):
+        cuboid = Cuboid(1, 1, 1)
+        cuboid.add_anchor("top_face", [0.5, 0.5, 1])
+
+        grid = GridPattern(cuboid, [100, 100], [[2, 0, 0], [0, 2, 0]])
+        self.assertEqual(grid.instance((3, 4)).top_face.position, Vector(6.5, 8.5, 1))
+
+        polar = PolarPattern(cuboid, 4)
+        self.assertAlmostEqual(polar.instance(1).top_face.position, Vector(-0.5, 0.5, 1))
+
+    def test_to_scad(self):
+        sphere = Sphere(1)
+
+        self.assertEqual(LinearPattern(sphere, 3, [2, 0, 0]).to_scad(),
+            ScadObject("for", None, [("i", ScadExpression("[0 : 2]"))], [
+                ScadObject("translate", [ScadExpression("i * [2, 0, 0]")], None, [sphere.to_scad()])]))
+
+        self.assertEqual(GridPattern(sphere, [100, 100], [[2, 0, 0], [0, 3, 0]]).to_scad().to_code(),
+            "for(i = [0 : 99], j = [0 : 99]) {\n"
+            "    translate(i * [2, 0, 0] + j * [0, 3, 0]) {\n"
+            "        sphere(1);\n"
+            "    }\n"
+            "}")
+
+        self.assertEqual(PolarPattern(sphere, 6, Z, 60).to_scad().to_code(),
+            "for(i = [0 : 5]) {\n"
+            "    rotate(a = i * 60, v = [0, 0, 1]) {\n"
+            "        sphere(1);\n"
+            "    }\n"
+            "}")
+
+        # Nested patterns
+        nested = LinearPattern(PolarPattern(sphere, 6, Z, 60), 2, [0, 0, 5])
+        self.assertEqual(nested.to_scad().to_code(simplify = True),
+            "for(i = [0 : 1])\n"
+            "    translate(i * [0, 0, 5])\n"
+            "        for(i = [0 : 5])\n"
+            "            rotate(a = i * 60, v = [0, 0, 1])\n"
+            "                sphere(1);")
+
+    def test_to_tree(self):
+        sphere = Sphere(1)
+        pattern = LinearPattern(sphere, 3, X)
+        self.assertEqual(pattern.to_tree().lines(), ["Linear pattern of 3 copies", "'-- Sphere with radius 1"])
+
+    def test_bounds(self):
+        cuboid = Cuboid(1, 2, 3)
+
+        self.assertEqual(LinearPattern(cuboid, 3, [2, 0, 0]).bounds, Bounds([0, 0, 0], [5, 2, 3]))
+        self.assertEqual(LinearPattern(cuboid, 3, [-2, 0, 0]).bounds, Bounds([-4, 0, 0], [1, 2, 3]))
+
+        grid = GridPattern(cuboid, [100, 100], [[2, 0, 0], [0, -3, 1]])
+        self.assertEqual(grid.bounds, Bounds([0, -297, 0], [199, 2, 102]))
+        self.assertEqual(grid.bounds, grid.expanded().bounds)
+
+        polar = PolarPattern(Sphere(1).right(5), 4)
+        self.assertAlmostEqual(polar.bounds.minimum, Vector(-6, -6, -1))
+        self.assertAlmostEqual(polar.bounds.maximum, Vector( 6,  6,  1))
+
+        self.assertTrue(LinearPattern(Union([]), 3, X).bounds.is_empty)
+
+    def test_sdf(self):
+        pattern = LinearPattern(Sphere(1), 3, [3, 0, 0])
+        self.assertAlmostEqual(list(pattern.sdf([[6, 0, 0], [1.5, 0, 0], [10, 0, 0]])), [-1, 0.5, 3])
+
+        polar = PolarPattern(Sphere(1).right(5), 4)
+        self.assertAlmostEqual(list(polar.sdf([[0, 5, 0], [0, 0, 0]])), [-1, 4])
+
+    def test_meshes(self):
+        pattern = GridPattern(Cuboid(1, 1, 1), [2, 3], [[2, 0, 0], [0, 2, 0]])
+        meshes = list(pattern.meshes())
+        self.assertEqual(len(meshes), 6)
+        self.assertAlmostEqual(pattern.to_mesh().volume(), 6)
+
+    def test_simplified(self):
+        sphere = Sphere(1)
+
+        self.assertIs(LinearPattern(sphere, 1, X).simplified(), sphere)
+        self.assertIs(PolarPattern(sphere, 1).simplified(), sphere)
+
+        pattern = LinearPattern(sphere, 3, X)
+        self.assertIs(pattern.simplified(), pattern)
+
+        # The object is simplified
+        pattern = GridPattern(Translate([0, 0, 0]) * sphere, [2, 2], [X, Z])
+        self.assertEqual(pattern.simplified(), GridPattern(sphere, [2, 2], [X, Z]))
+
+    def test_scad_file(self):
+        grid = GridPattern(Sphere(1) - Cuboid(1, 1, 1), [100, 100], [[3, 0, 0], [0, 3, 0]])
+        code = ScadFile(grid).to_code()
+        self.assertEqual(code.count("sphere"), 1)
+        self.assertIn("for(i = [0 : 99], j = [0 : 99])", code)
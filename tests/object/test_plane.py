@@ -4,6 +4,8 @@ from cadlib.util.vector import Vector
 from cadlib.util.vector import X, Y, Z
 from cadlib.scad import ScadObject
 from cadlib import infinity
+from cadlib.util import Bounds
+import math
 
 class TestPlane(TestCase):
     def test_construction(self):
@@ -49,3 +51,13 @@ class TestPlane(TestCase):
 
     def test_str(self):
         self.assertStr(Plane(X, 2), "Plane with normal <1, 0, 0> and offset 2")
+
+    def test_bounds(self):
+        inf = math.inf
+        self.assertEqual(Plane(Z, 2).bounds, Bounds([-inf, -inf, -inf], [inf, inf, 2]))
+        self.assertEqual(Plane(-X, 2).bounds, Bounds([-2, -inf, -inf], [inf, inf, inf]))
+        self.assertEqual(Plane(X + Y, 2).bounds, Bounds.infinite())
+
+    def test_sdf(self):
+        self.assertEqual(Plane(2 * Z, 1).sdf([[5, 5, 3], [0, 0, -1]]).tolist(), [2, -2])
+        self.assertAlmostEqual(Plane(X + Y, 0).sdf([[1, 1, 0]])[0], math.sqrt(2))
@@ -1,5 +1,6 @@
 from tests.unit_test import TestCase
 from cadlib.object.primitives import Sphere
+from cadlib.util import Bounds
 
 
 class TestSphere(TestCase):
@@ -29,3 +30,11 @@ class TestSphere(TestCase):
 
     def test_str(self):
         self.assertStr(Sphere(11), "Sphere with radius 11")
+
+    def test_bounds(self):
+        self.assertEqual(Sphere(2).bounds, Bounds([-2, -2, -2], [2, 2, 2]))
+
+    def test_sdf(self):
+        self.assertEqual(Sphere(2).sdf([[0, 0, 0], [3, 0, 0], [0, 0, -2]]).tolist(), [-2, 1, 0])
+        self.assertEqual(Sphere(2).sdf([]).tolist(), [])
+        with self.assertRaises(ValueError): Sphere(2).sdf([[0, 0]])
@@ -2,7 +2,8 @@ from tests.unit_test import TestCase
 from cadlib.object import Transformed
 from cadlib.transform.chained import Chained
 from cadlib.scad import ScadObject
-from cadlib.object.primitives import Cuboid
+from cadlib.object.primitives import Cuboid, Sphere
+from cadlib.util import Bounds, Vector
 from cadlib.transform.primitives import ScaleAxes, ScaleUniform, Translate, RotateXyz
 
 class TestTransformed(TestCase):
@@ -68,3 +69,90 @@ class TestTransformed(TestCase):
         cube = Cuboid(1, 1, 1)
 
         self.assertStr(Transformed(t, cube), "Transformed object")
+
+    def test_anchors(self):
+        cube = Cuboid(2, 4, 6)
+        moved = cube.right(1).up(1)
+
+        # Created on demand
+        self.assertEqual(moved.top_face.position, Vector(2, 2, 7))
+        self.assertEqual(moved.anchors["top_face"].position, Vector(2, 2, 7))
+        self.assertIs(moved.top_face.object, moved)
+        self.assertEqual(list((Translate([1, 0, 0]) * cube).anchors), ["top_face"])
+
+        with self.assertRaises(AttributeError): moved.invalid
+        with self.assertRaises(AttributeError): moved._invalid
+
+        # Anchors can be added before the anchors of the object are created
+        moved = Translate([1, 0, 0]) * cube
+        moved.add_anchor("corner", [1, 2, 3])
+        self.assertEqual(moved.corner.position, Vector(1, 2, 3))
+        self.assertEqual(moved.top_face.position, Vector(2, 2, 6))
+        self.assertEqual(sorted(moved.anchors), ["corner", "top_face"])
+
+    def test_simplified(self):
+        t = Translate([1, 2, 3])
+        s = ScaleAxes(1, 2, -1)
+        cube = Cuboid(11, 11, 11)
+
+        # Nested transforms are merged and folded
+        self.assertEqual(cube.up(1).right(2).simplified(), Transformed(Translate([2, 0, 1]), cube))
+        self.assertEqual(Transformed(t, Transformed(s, cube)).simplified(), Transformed(Chained([t, s]), cube))
+
+        # Identity transforms are removed
+        self.assertIs(Transformed(Chained([]), cube).simplified(), cube)
+        self.assertIs(Transformed(t, Transformed(t.inverse(), cube)).simplified(), cube)
+
+        # Unchanged
+        part = Transformed(t, cube)
+        self.assertIs(part.simplified(), part)
+
+    def test_collapse_transforms(self):
+        t = Translate([1, 2, 3])
+        s = ScaleAxes(1, 2, -1)
+        cube = Cuboid(11, 11, 11)
+
+        # Single transforms are not changed
+        self.assertEqual(Transformed(t, cube).collapse_transforms(), Transformed(t, cube))
+
+        # Chains and nested transformed objects become a single matrix
+        for part in [Transformed(Chained([t, s]), cube), Transformed(t, Transformed(s, cube))]:
+            self.assertEqual(part.collapse_transforms().to_scad(),
+                ScadObject("multmatrix", [(t * s).to_matrix().row_values], None, [
+                    ScadObject("cube", [[11, 11, 11]], None, None),
+                ])
+            )
+
+        # With tolerance
+        self.assertEqual(Transformed(Chained([t, t]), cube).collapse_transforms(1e-9),
+            Transformed(Translate([2, 4, 6]), cube))
+
+    def test_sdf(self):
+        # Rigid and uniformly scaled: exact
+        self.assertEqual((Translate([5, 0, 0]) * ScaleUniform(2) * Sphere(1)).sdf([[5, 0, 0], [8, 0, 0]]).tolist(), [-2, 1])
+        rotated = Transformed(RotateXyz(0, 0, 90), Cuboid(1, 2, 3)).sdf([[-1, 0.5, 1.5], [1, 0.5, 1.5]])
+        self.assertAlmostEqual(rotated[0], -0.5)
+        self.assertAlmostEqual(rotated[1], 1)
+
+        # Non-uniformly scaled: lower bound
+        stretched = (ScaleAxes(1, 1, 3) * Sphere(1)).sdf([[0, 0, 4], [2, 0, 0], [0, 0, 0]])
+        self.assertAlmostEqual(stretched[0], 1 / 3)
+        self.assertAlmostEqual(stretched[1], 1)
+        self.assertLess(stretched[2], 0)
+
+    def test_pruned(self):
+        cube = Cuboid(1, 1, 1)
+        self.assertEqual(Transformed(Translate([1, 2, 3]), cube - Sphere(1).up(5)).pruned(),
+            Transformed(Translate([1, 2, 3]), cube))
+
+        part = Transformed(Translate([1, 2, 3]), cube)
+        self.assertIs(part.pruned(), part)
+
+    def test_bounds(self):
+        cube = Cuboid(1, 2, 3)
+        self.assertEqual(Transformed(Translate([1, 2, 3]), cube).bounds, Bounds([1, 2, 3], [2, 4, 6]))
+        self.assertEqual((ScaleAxes(2, -1, 1) * Translate([1, 2, 3]) * cube).bounds, Bounds([2, -4, 3], [4, -2, 6]))
+
+        rotated = Transformed(RotateXyz(0, 0, 90), cube).bounds
+        self.assertAlmostEqual(rotated.minimum, Vector(-2, 0, 0))
+        self.assertAlmostEqual(rotated.maximum, Vector(0, 1, 3))
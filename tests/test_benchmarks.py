@@ -0,0 +1,92 @@
+import contextlib
+import io
+import json
+import os
+from tempfile import TemporaryDirectory
+
+from benchmarks import run
+from tests.unit_test import TestCase
+
+class TestBenchmarks(TestCase):
+    def setUp(self):
+        self.temporary_directory = TemporaryDirectory()
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def baseline(self, results):
+        file_name = os.path.join(self.temporary_directory.name, "baseline.json")
+        with open(file_name, "w") as file:
+            json.dump({"python": "3", "backend": "python", "results": results}, file)
+        return file_name
+
+    def main(self, *arguments):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(io.StringIO()):
+            status = run.main(["--cases", "vector_arithmetic", "--sizes", "10", "--repeat", "1", *arguments])
+        return status, output.getvalue()
+
+    def test_compare(self):
+        baseline = [
+            {"case": "a", "size": 10, "time": 1.0, "peak_memory": 102400},
+            {"case": "b", "size": 10, "time": 1.0},
+        ]
+        results = [
+            {"case": "a", "size": 10, "time": 1.1, "peak_memory": 153600},  # Memory regression
+            {"case": "b", "size": 10, "time": 0.5},                         # Faster
+            {"case": "c", "size": 10, "time": 9.0},                         # Not in the baseline
+            {"case": "a", "size": 20, "time": 9.0},                         # Size not in the baseline
+        ]
+
+        rows = run.compare(results, baseline, 0.2)
+        self.assertEqual([row[:3] + row[-1:] for row in rows], [
+            ("a", 10, "time", False),
+            ("a", 10, "peak_memory", True),
+            ("b", 10, "time", False),
+        ])
+        self.assertAlmostEqual(rows[0][5], 1.1)
+        self.assertEqual(rows[1][3:6], (102400, 153600, 1.5))
+
+        # The threshold is relative to the baseline
+        self.assertFalse(any(row[-1] for row in run.compare(results, baseline, 0.5)))
+
+        # A baseline value of 0 is not a regression
+        self.assertFalse(run.compare([{"case": "a", "size": 10, "time": 1}], [{"case": "a", "size": 10, "time": 0}], 0.2)[0][-1])
+
+        self.assertEqual(run.missing_cases(results, baseline), [("c", 10), ("a", 20)])
+        self.assertEqual(run.missing_cases(results[:2], baseline), [])
+
+        table = run.format_comparison(rows)
+        self.assertIn("REGRESSION", table)
+        self.assertIn("150.0 KiB", table)
+
+    def test_main_pass(self):
+        baseline = self.baseline([{"case": "vector_arithmetic", "size": 10, "time": 1e6, "peak_memory": 1e12}])
+        status, output = self.main("--baseline", baseline)
+        self.assertEqual(status, 0)
+        self.assertIn("vector_arithmetic", output)
+        self.assertNotIn("REGRESSION", output)
+
+    def test_main_fail(self):
+        baseline = self.baseline([{"case": "vector_arithmetic", "size": 10, "time": 1e-12, "peak_memory": 1e12}])
+        status, output = self.main("--baseline", baseline)
+        self.assertEqual(status, 1)
+        self.assertEqual(output.count("REGRESSION"), 1)
+
+    def test_main_missing(self):
+        # Cases that are not in the baseline are reported, but don't fail
+        baseline = self.baseline([{"case": "node_format", "size": 10, "time": 1e-12}])
+        status, output = self.main("--baseline", baseline, "--no-memory")
+        self.assertEqual(status, 0)
+        self.assertIn("Not in the baseline: vector_arithmetic (10)", output)
+
+    def test_main_output(self):
+        file_name = os.path.join(self.temporary_directory.name, "results.json")
+        status, _ = self.main("--output", file_name)
+        self.assertEqual(status, 0)
+
+        with open(file_name) as file:
+            results = json.load(file)["results"]
+        self.assertEqual([(result["case"], result["size"]) for result in results], [("vector_arithmetic", 10)])
+        self.assertIn("time", results[0])
+        self.assertIn("peak_memory", results[0])
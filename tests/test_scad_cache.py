@@ -0,0 +1,191 @@
+import os
+import pickle
+from tempfile import TemporaryDirectory
+
+from cadlib.scad import ScadCache, ScadFile, ScadObject
+from cadlib.scad import scad_cache
+from cadlib.object.primitives import Sphere, Cuboid
+from tests.unit_test import TestCase
+
+class TestScadCache(TestCase):
+    def setUp(self):
+        self.temporary_directory = TemporaryDirectory()
+        self.directory = self.temporary_directory.name
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def part(self, size):
+        bolt = Sphere(1) + Cuboid(1, 2, size)
+        return bolt.up(1) + bolt.up(2) - Sphere(3)
+
+    def test_get_put(self):
+        cache = ScadCache(self.directory)
+        scad = ScadObject("union", None, None, [ScadObject("sphere", [1], None, None)])
+
+        self.assertIsNone(cache.get("abc"))
+        self.assertNotIn("abc", cache)
+
+        cache.put("abc", scad)
+        self.assertIn("abc", cache)
+        self.assertEqual(cache.get("abc"), scad)
+        self.assertEqual(len(cache), 1)
+        self.assertGreater(cache.size, 0)
+
+        # Persistence
+        cache = ScadCache(self.directory)
+        self.assertEqual(cache.get("abc"), scad)
+
+        # Clear
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+        self.assertIsNone(ScadCache(self.directory).get("abc"))
+
+    def test_shared_children(self):
+        # Children that appear more than once are stored once and shared
+        # when the entry is loaded
+        cache = ScadCache(self.directory)
+        sphere = ScadObject("sphere", [1], None, None)
+        scad = ScadObject("union", None, None, [sphere, ScadObject("translate", [[1, 0, 0]], None, [sphere])])
+        cache.put("abc", scad)
+
+        loaded = ScadCache(self.directory).get("abc")
+        self.assertEqual(loaded, scad)
+        self.assertIs(loaded._children[0], loaded._children[1]._children[0])
+
+    def test_references(self):
+        cache = ScadCache(self.directory)
+        sphere = ScadObject("sphere", [1], None, None)
+        translated = ScadObject("translate", [[1, 0, 0]], None, [sphere])
+        union = ScadObject("union", None, None, [translated, ScadObject("cube", [1], None, None)])
+
+        # Stored sub-trees are referenced, not copied
+        cache.put("sphere", sphere)
+        cache.put("translated", translated, {"sphere": sphere})
+        cache.put("union", union, {"translated": translated})
+        with open(cache._path("union"), "rb") as file:
+            self.assertEqual(len(pickle.load(file)), 3)
+
+        # The references are resolved when reading
+        cache = ScadCache(self.directory)
+        self.assertEqual(cache.get("union"), union)
+        self.assertEqual(cache.get("translated"), translated)
+
+        # If a referenced entry is missing, the entry cannot be used
+        os.unlink(cache._path("sphere"))
+        self.assertIsNone(cache.get("union"))
+
+    def test_entry_size(self):
+        # The size of the cache is linear in the depth of the object
+        def chain(depth):
+            part = Sphere(1)
+            for _ in range(depth):
+                part = (part + Cuboid(1, 1, 1)).up(1)
+            return part
+
+        sizes = []
+        for depth in [50, 100]:
+            with TemporaryDirectory() as directory:
+                cache = ScadCache(directory, min_size = 1)
+                self.assertEqual(cache.to_scad(chain(depth)), chain(depth).to_scad())
+                self.assertEqual(ScadCache(directory).to_scad(chain(depth)), chain(depth).to_scad())
+                sizes.append(cache.size)
+        self.assertLess(sizes[1], 2.5 * sizes[0])
+
+    def test_missing_reference(self):
+        # If a referenced entry has been removed, the object is converted again
+        cache = ScadCache(self.directory, min_size = 3)
+        part = self.part(3)
+        cache.to_scad(part)
+
+        cache._remove(part.children[0].digest())
+        cache = ScadCache(self.directory, min_size = 3)
+        self.assertEqual(cache.to_scad(part), part.to_scad())
+        self.assertIn(part.children[0].digest(), cache)
+        self.assertEqual(ScadCache(self.directory).get(part.digest()), part.to_scad())
+
+    def test_code_version(self):
+        scad = ScadObject("sphere", [1], None, None)
+        ScadCache(self.directory).put("abc", scad)
+
+        # The digest of the code is stable
+        self.assertEqual(scad_cache.code_digest(), scad_cache.code_digest())
+        self.assertEqual(len(scad_cache.code_digest()), 64)
+
+        # Entries of other versions of the code are not used
+        self.assertIsNone(ScadCache(self.directory, version = "custom 2").get("abc"))
+        ScadCache(self.directory, version = "custom 2").put("abc", ScadObject("sphere", [2], None, None))
+        self.assertEqual(ScadCache(self.directory).get("abc"), scad)
+
+        original = scad_cache._code_digest
+        try:
+            scad_cache._code_digest = "0" * 64
+            self.assertIsNone(ScadCache(self.directory).get("abc"))
+        finally:
+            scad_cache._code_digest = original
+
+        self.assertEqual(ScadCache(self.directory).get("abc"), scad)
+
+    def test_corrupt_entry(self):
+        cache = ScadCache(self.directory)
+        cache.put("abc", ScadObject("sphere", [1], None, None))
+        with open(cache._path("abc"), "wb") as file:
+            file.write(b"not a pickle")
+
+        self.assertIsNone(cache.get("abc"))
+        self.assertNotIn("abc", cache)
+
+    def test_eviction(self):
+        scad = ScadObject("sphere", [1], None, None)
+        entry_size = len(pickle.dumps(scad, protocol = pickle.HIGHEST_PROTOCOL))
+
+        cache = ScadCache(self.directory, max_size = 4 * entry_size)
+        for index, digest in enumerate(["a", "b", "c", "d"]):
+            cache.put(digest, scad)
+            os.utime(cache._path(digest), (index, index))
+        self.assertEqual(len(cache), 4)
+
+        # Use "a", so "b" is the least recently used entry
+        cache.get("a")
+
+        # Exceeding the maximum size removes the least recently used entries
+        cache.put("e", scad)
+        self.assertLessEqual(cache.size, 4 * entry_size)
+        self.assertNotIn("b", cache)
+        self.assertIn("a", cache)
+        self.assertIn("e", cache)
+
+        with self.assertRaises(ValueError): ScadCache(self.directory, max_size = 0)
+
+    def test_to_scad(self):
+        cache = ScadCache(self.directory, min_size = 3)
+
+        # Converting with the cache gives the same result as without
+        part = self.part(3)
+        self.assertEqual(cache.to_scad(part), part.to_scad())
+
+        # The sub-trees with at least 3 objects have been stored
+        self.assertIn(part.digest(), cache)
+        self.assertIn(part.children[0].digest(), cache) # Translated bolt
+        self.assertNotIn(part.children[1].digest(), cache) # Sphere
+        stored = len(cache)
+
+        # A variant reuses the shared sub-trees
+        variant = part + Sphere(4)
+        self.assertEqual(ScadCache(self.directory, min_size = 3).to_scad(variant), variant.to_scad())
+        self.assertEqual(len(cache), stored)
+        self.assertEqual(len(ScadCache(self.directory)), stored + 1)
+
+        # Cached entries are actually used
+        fake = ScadObject("cached", None, None, None)
+        cache.put(part.digest(), fake)
+        self.assertEqual(cache.to_scad(part), fake)
+
+    def test_scad_file(self):
+        part = self.part(3)
+        cache = ScadCache(self.directory, min_size = 1)
+
+        self.assertEqual(ScadFile(part, cache = cache).to_code(), ScadFile(part).to_code())
+        self.assertEqual(ScadFile(part, cache = cache).to_code(), ScadFile(part).to_code())
+        self.assertIn(part.digest(), cache)
@@ -0,0 +1,95 @@
+from cadlib.scad import ScadObject, ScadFile
+from cadlib.scad.modules import extract_modules
+from cadlib.object.primitives import Sphere, Cuboid
+from tests.unit_test import TestCase
+
+class TestScadModules(TestCase):
+    def setUp(self):
+        self.sphere = ScadObject("sphere", [1], None, None)
+        self.cube   = ScadObject("cube", [[1, 2, 3]], None, None)
+        self.bolt   = ScadObject("union", None, None, [self.sphere, self.cube])
+
+    def test_no_repeats(self):
+        scad = ScadObject("difference", None, None, [self.bolt, self.sphere.comment("Different")])
+        modules, body = extract_modules(scad)
+        self.assertEqual(modules, [])
+        self.assertEqual(body, scad)
+
+    def test_repeats(self):
+        call = ScadObject("subtree_1", None, None, None)
+        scad = ScadObject("union", None, None, [
+            ScadObject("translate", [[1, 0, 0]], None, [self.bolt]),
+            ScadObject("translate", [[2, 0, 0]], None, [ScadObject("union", None, None, [self.sphere, self.cube])]),
+            self.sphere,
+        ])
+
+        modules, body = extract_modules(scad)
+        self.assertEqual(modules, [ScadObject("module subtree_1", None, None, [self.bolt])])
+        self.assertEqual(body, ScadObject("union", None, None, [
+            ScadObject("translate", [[1, 0, 0]], None, [call]),
+            ScadObject("translate", [[2, 0, 0]], None, [call]),
+            self.sphere, # Too small
+        ]))
+
+        # With a larger minimum size, nothing is extracted
+        self.assertEqual(extract_modules(scad, min_size = 4), ([], scad))
+
+        # With a smaller minimum size, the sphere is extracted as well
+        modules, body = extract_modules(scad, min_size = 1, prefix = "m")
+        self.assertEqual(modules, [
+            ScadObject("module m1", None, None, [self.sphere]),
+            ScadObject("module m2", None, None, [ScadObject("union", None, None, [ScadObject("m1", None, None, None), self.cube])]),
+        ])
+
+    def test_nested_repeats(self):
+        # The bolt appears four times in the code, but only once in the body of the module for the pair
+        pair = ScadObject("union", None, None, [
+            ScadObject("translate", [[1, 0, 0]], None, [self.bolt]),
+            ScadObject("translate", [[2, 0, 0]], None, [self.bolt]),
+        ])
+        scad = ScadObject("union", None, None, [pair, ScadObject("mirror", [[1, 0, 0]], None, [pair])])
+
+        modules, body = extract_modules(scad)
+        self.assertEqual(len(modules), 2)
+        self.assertEqual(modules[0], ScadObject("module subtree_1", None, None, [self.bolt]))
+        self.assertEqual(body, ScadObject("union", None, None, [
+            ScadObject("subtree_2", None, None, None),
+            ScadObject("mirror", [[1, 0, 0]], None, [ScadObject("subtree_2", None, None, None)]),
+        ]))
+
+        # A subtree that only appears within a single module is not extracted
+        scad = ScadObject("union", None, None, [pair, pair])
+        modules, body = extract_modules(scad)
+        self.assertEqual(len(modules), 2)
+
+        scad = ScadObject("union", None, None, [ScadObject("union", None, None, [self.bolt]), ScadObject("union", None, None, [self.bolt])])
+        modules, body = extract_modules(scad)
+        self.assertEqual(modules, [ScadObject("module subtree_1", None, None, [ScadObject("union", None, None, [self.bolt])])])
+
+    def test_scad_file(self):
+        bolt = Sphere(1) + Cuboid(1, 2, 3)
+        part = bolt.up(1) + bolt.up(2)
+
+        self.assertEqual(ScadFile(part, extract_modules = True).to_code(), "\n".join([
+            "// This file was auto-generated by cadlib",
+            "",
+            "module subtree_1() {",
+            "    union() {",
+            "        sphere(1);",
+            "        cube([1, 2, 3]);",
+            "    }",
+            "}",
+            "",
+            "union() {",
+            "    translate([0, 0, 1]) {",
+            "        subtree_1();",
+            "    }",
+            "    translate([0, 0, 2]) {",
+            "        subtree_1();",
+            "    }",
+            "}",
+            "",
+        ]))
+
+        # Without extracting modules
+        self.assertNotIn("module", ScadFile(part).to_code())
@@ -1,9 +1,11 @@
-from cadlib.scad import ScadObject, render_to_file
+from cadlib.scad import ScadObject, ScadExpression, ScadFile, render_to_file
 from tests.unit_test import TestCase
 from cadlib.util.tree import Node
 from cadlib.object.primitives import Sphere, Cuboid, Frustum
 from tempfile import mkstemp
+from io import StringIO
 import os
+import sys
 
 class TestScadObject(TestCase):
     def test_construction(self):
@@ -60,6 +62,13 @@ class TestScadObject(TestCase):
         self.assertEqual(ScadObject.render_value("Hello"        ), '"Hello"'  )
         self.assertEqual(ScadObject.render_value([1, 2, 3]      ), "[1, 2, 3]")
 
+        # Expressions are rendered verbatim
+        self.assertEqual(ScadObject.render_value(ScadExpression("i * [1, 2, 3]")), "i * [1, 2, 3]")
+        self.assertEqual(ScadObject.render_value([ScadExpression("i"), 1]), "[i, 1]")
+        self.assertEqual(ScadExpression("i"), ScadExpression("i"))
+        self.assertNotEqual(ScadExpression("i"), "i")
+        with self.assertRaises(TypeError): ScadExpression(1)
+
         # String escaping
         cr = "\r"
         lf = "\n"
@@ -126,6 +135,22 @@ class TestScadObject(TestCase):
             ScadObject("Dummy", [], None, [ScadObject("Child1", None, None, None)]),
             ScadObject("Dummy", [], None, [ScadObject("Child2", None, None, None)])) # Different children
 
+    def test_hash(self):
+        def scad(radius, comment = None):
+            return ScadObject("union", None, None, [
+                ScadObject("sphere", [radius], None, None),
+                ScadObject("cylinder", [4], [("r", 0.5), ("center", [1, 2, 3])], None),
+                ScadObject("multmatrix", [[[1, 0], [0, 1]]], None, None, comment),
+            ])
+
+        self.assertEqual(hash(scad(1)), hash(scad(1)))
+        self.assertEqual(len({scad(1), scad(1), scad(2), scad(1, "Comment")}), 3)
+
+        # The hash is cached
+        s = scad(1)
+        self.assertEqual(hash(s), hash(s))
+        self.assertEqual(s._hash, hash(s))
+
     def test_comment(self):
         o = ScadObject("dummy", [], [], [], "one")
 
@@ -274,6 +299,26 @@ class TestScadObject(TestCase):
         self.assertEqual(chain2.to_code(inline = True, simplify = True), "intersection() union() cube([1, 2, 3]);")
 
 
+    def test_write_to(self):
+        sphere  = ScadObject("sphere", [1], None, None, "A sphere!")
+        cuboid  = ScadObject("cube", [[1, 2, 3]], None, None)
+        union   = ScadObject("union", None, None, [sphere, cuboid], "A union!\nWith a multi-line comment.")
+        chain   = ScadObject("intersection", None, None, [ScadObject("difference", None, None, [union])])
+        empty   = ScadObject(None, None, None, [sphere, cuboid])
+
+        def written(scad, *args, **kwargs):
+            stream = StringIO()
+            scad.write_to(stream, *args, **kwargs)
+            return stream.getvalue()
+
+        # The written code is identical to to_code
+        for scad in [sphere, cuboid, union, chain, empty]:
+            self.assertEqual(written(scad), scad.to_code())
+            self.assertEqual(written(scad, "  ", "    "), scad.to_code("  ", "    "))
+            self.assertEqual(written(scad, inline = True), scad.to_code(inline = True))
+            self.assertEqual(written(scad, inline = True, simplify = True), scad.to_code(inline = True, simplify = True))
+            self.assertEqual(written(scad, simplify = True), scad.to_code(simplify = True))
+
     def test_to_code_empty(self):
         sphere   = ScadObject("sphere"  , [0.6]       , None, None)
         cuboid   = ScadObject("cube"    , [[1, 2, 3]] , None, None)
@@ -352,3 +397,81 @@ class TestScadObject(TestCase):
         finally:
             if os.path.exists(actual_file_name):
                 os.unlink(actual_file_name)
+
+    def test_render_to_file_collapse_transforms(self):
+        part = Cuboid(1, 2, 3).up(1).left(2)
+        file_handle, file_name = mkstemp(suffix = ".scad")
+        os.close(file_handle)
+
+        try:
+            render_to_file(part, file_name, collapse_transforms = True, tolerance = 1e-9)
+            with open(file_name) as file:
+                code = file.read()
+
+            self.assertIn("translate([-2, 0, 1])", code)
+            self.assertEqual(code.count("translate"), 1)
+
+            render_to_file(part, file_name, collapse_transforms = True, simplify_tree = False)
+            with open(file_name) as file:
+                code = file.read()
+
+            self.assertIn("multmatrix", code)
+            self.assertNotIn("translate", code)
+        finally:
+            os.unlink(file_name)
+
+    def test_render_to_file_prune(self):
+        part = Cuboid(1, 2, 3) - Sphere(1) - Sphere(1).right(10)
+        file_handle, file_name = mkstemp(suffix = ".scad")
+        os.close(file_handle)
+
+        try:
+            render_to_file(part, file_name)
+            with open(file_name) as file:
+                self.assertEqual(file.read().count("sphere"), 2)
+
+            render_to_file(part, file_name, prune = True)
+            with open(file_name) as file:
+                self.assertEqual(file.read().count("sphere"), 1)
+        finally:
+            os.unlink(file_name)
+
+    def test_render_to_file_simplify_tree(self):
+        part = Cuboid(1, 2, 3).up(1).left(2)
+        file_handle, file_name = mkstemp(suffix = ".scad")
+        os.close(file_handle)
+
+        try:
+            # Simplified by default
+            render_to_file(part, file_name)
+            with open(file_name) as file:
+                code = file.read()
+            self.assertIn("translate([-2, 0, 1])", code)
+            self.assertEqual(code.count("translate"), 1)
+
+            render_to_file(part, file_name, simplify_tree = False)
+            with open(file_name) as file:
+                code = file.read()
+            self.assertEqual(code.count("translate"), 2)
+        finally:
+            os.unlink(file_name)
+
+        # ScadFile does not simplify by default
+        self.assertEqual(ScadFile(part).to_code().count("translate"), 2)
+        self.assertEqual(ScadFile(part).to_code(), ScadFile(part, simplify_tree = False).to_code())
+        self.assertEqual(ScadFile(part, simplify_tree = True).to_code().count("translate"), 1)
+
+    def test_deep(self):
+        depth = 5 * sys.getrecursionlimit()
+
+        scad = ScadObject("sphere", [1], None, None)
+        for _ in range(depth):
+            scad = ScadObject("translate", [[1, 0, 0]], None, [scad, ScadObject("cube", [1], None, None)])
+
+        lines = scad.to_code(indent = " ").split("\n")
+        self.assertEqual(len(lines), 3 * depth + 1)
+        self.assertEqual(lines[depth - 1:depth + 3],
+            [" " * (depth - 1) + "translate([1, 0, 0]) {", " " * depth + "sphere(1);",
+             " " * depth + "cube(1);", " " * (depth - 1) + "}"])
+
+        self.assertEqual(len(scad.to_tree().lines("")), 2 * depth + 1)
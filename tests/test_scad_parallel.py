@@ -0,0 +1,54 @@
+import os
+from tempfile import TemporaryDirectory
+
+from cadlib.scad import ScadFile, render_to_file
+from cadlib.scad.parallel import ScadFragment, to_scad_parallel
+from cadlib.object.primitives import Sphere, Cuboid
+from cadlib.csg import Union
+from tests.unit_test import TestCase
+
+class TestScadParallel(TestCase):
+    def part(self):
+        spheres = Union([Sphere(1).right(i).rotate(frm = [0, 0, 1], to = [1, 1, 1]) for i in range(50)])
+        cuboids = Union([Cuboid(1, 1, 1).right(i).up(1) for i in range(20)])
+        return (spheres - cuboids).up(1) + Sphere(3)
+
+    def test_fragment(self):
+        fragment = ScadFragment(["sphere(r = 1);", "cube(size = [1, 1, 1]);"], "  ")
+        self.assertEqual(list(fragment._iter_lines("  ", "> ", False, True, 2)),
+            ["> " + "    sphere(r = 1);", "> " + "    cube(size = [1, 1, 1]);"])
+
+        with self.assertRaises(ValueError): list(fragment._iter_lines("    ", "", False, True))
+        with self.assertRaises(ValueError): list(fragment._iter_lines("  ", "", True, True))
+        with self.assertRaises(ValueError): list(fragment._iter_lines("  ", "", False, False))
+
+    def test_to_scad_parallel(self):
+        part = self.part()
+        expected = part.to_scad().to_code()
+
+        self.assertEqual(to_scad_parallel(part, 2, min_children = 10).to_code(), expected)
+        self.assertEqual(to_scad_parallel(part, 1, min_children = 10).to_code(), expected)
+        self.assertEqual(to_scad_parallel(part, 2, min_children = 30).to_code(), expected)
+
+        # No large nodes
+        self.assertEqual(to_scad_parallel(part, 2).to_code(), expected)
+        self.assertEqual(to_scad_parallel(part, 2), part.to_scad())
+
+        # Other indent
+        self.assertEqual(to_scad_parallel(part, 2, min_children = 10, indent = "\t").to_code(indent = "\t"),
+                         part.to_scad().to_code(indent = "\t"))
+
+    def test_scad_file(self):
+        part = Union([Sphere(1).right(i) for i in range(1500)])
+        self.assertEqual(ScadFile(part, processes = 2).to_code(), ScadFile(part).to_code())
+
+        with self.assertRaises(ValueError): ScadFile(part, processes = 2, extract_modules = True)
+
+        with TemporaryDirectory() as directory:
+            serial   = os.path.join(directory, "serial.scad")
+            parallel = os.path.join(directory, "parallel.scad")
+            render_to_file(part, serial)
+            render_to_file(part, parallel, processes = 2)
+
+            with open(serial) as file1, open(parallel) as file2:
+                self.assertEqual(file1.read(), file2.read())
@@ -1,6 +1,6 @@
 from tests.unit_test import TestCase
 from cadlib.transform.chained import Chained
-from cadlib.transform.primitives import ScaleAxes, RotateXyz, Translate, ScaleUniform
+from cadlib.transform.primitives import ScaleAxes, RotateXyz, Translate, ScaleUniform, MatrixTransform
 from cadlib.scad import ScadObject
 
 class TestChained(TestCase):
@@ -111,3 +111,69 @@ class TestChained(TestCase):
 
         # Empty
         self.assertIdentity(Chained([]).to_matrix())
+
+    def test_extension(self):
+        t = Translate([1, 2, 3])
+        r = RotateXyz(0, 0, 90)
+        s = ScaleAxes(1, 2, 3)
+
+        # Prepending and appending, with shared storage
+        base = Chained([r])
+        a = t * base * s
+        b = s * base * t
+        self.assertEqual(base.transforms, [r])
+        self.assertEqual(a.transforms, [t, r, s])
+        self.assertEqual(b.transforms, [s, r, t])
+        self.assertEqual((a * b).transforms, [t, r, s, s, r, t])
+
+        # The matrix is calculated from the matrix of the original chain
+        self.assertIsNotNone(a._matrix)
+        self.assertAlmostEqual(a.to_matrix(), t.to_matrix() * r.to_matrix() * s.to_matrix())
+        self.assertAlmostEqual((a * b).to_matrix(), Chained([t, r, s, s, r, t]).to_matrix())
+
+        # Long chains
+        chained = Chained([])
+        for _ in range(1000):
+            chained = t * chained
+        self.assertEqual(len(chained.transforms), 1000)
+        self.assertAlmostEqual(chained.to_matrix(), Translate([1000, 2000, 3000]).to_matrix())
+
+    def test_folded(self):
+        t = Translate([1, 2, 3])
+        r = RotateXyz(0, 0, 90)
+        s = ScaleAxes(1, 2, 3)
+
+        # Consecutive transforms are merged, nested chains are flattened
+        self.assertEqual(Chained([t, t, r, Chained([s, ScaleUniform(2)])]).folded(),
+            Chained([Translate([2, 4, 6]), r, ScaleAxes(2, 4, 6)]))
+
+        # Identity transforms are removed, possibly allowing further merges
+        self.assertEqual(Chained([t, ScaleUniform(2), ScaleUniform(0.5), t]).folded(), Translate([2, 4, 6]))
+        self.assertEqual(Chained([t, Chained([]), t.inverse()]).folded(), Chained([]))
+
+        # Non-mergeable chains are not changed
+        chained = Chained([t, r, s])
+        self.assertIs(chained.folded(), chained)
+        self.assertEqual(Chained([]).folded(), Chained([]))
+
+        # The matrix is the same
+        chained = Chained([r, t, t, r, s, s])
+        self.assertAlmostEqual(chained.folded().to_matrix(), chained.to_matrix())
+
+    def test_collapsed(self):
+        t = Translate([1, 2, 3])
+        r = RotateXyz(0, 0, 90)
+        s = ScaleAxes(1, 2, 3)
+
+        # Empty and single chains
+        self.assertEqual(Chained([]).collapsed(), Chained([]))
+        self.assertEqual(Chained([t]).collapsed(), t)
+
+        # Longer chains are replaced with a matrix
+        collapsed = Chained([t, r, s]).collapsed()
+        self.assertIsInstance(collapsed, MatrixTransform)
+        self.assertEqual(collapsed.to_matrix(), Chained([t, r, s]).to_matrix())
+
+        # With a tolerance, simple transforms are restored
+        self.assertEqual(Chained([t, t]).collapsed(1e-9), Translate([2, 4, 6]))
+        self.assertEqual(Chained([t, r, s]).collapsed(1e-9), Chained([t, r, s]))
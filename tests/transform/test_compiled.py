@@ -0,0 +1,70 @@
+from unittest import skipIf
+
+from tests.unit_test import TestCase
+from cadlib.transform.compiled import CompiledTransform
+from cadlib.transform.primitives import RotateYpr, ScaleAxes, Translate
+from cadlib.util import Matrix, Vector
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class TestCompiledTransform(TestCase):
+    def setUp(self):
+        self.transform = Translate([1, 2, 3]) * RotateYpr(30, 20, 10) * ScaleAxes(1, 2, -1)
+        self.points = [Vector(0, 0, 0), Vector(10, 20, 30), [1, -2, 3], (0.5, 0, -4)]
+
+    def test_construction(self):
+        compiled = self.transform.compile()
+        self.assertIsInstance(compiled, CompiledTransform)
+        self.assertEqual(compiled.matrix, self.transform.to_matrix())
+
+        with self.assertRaises(ValueError): CompiledTransform(Matrix.identity(3))
+
+    def test_apply(self):
+        compiled = self.transform.compile()
+
+        for point in self.points:
+            self.assertEqual(compiled.apply(point), self.transform * Vector(*point))
+
+    def test_apply_many(self):
+        expected = [self.transform * Vector(*point) for point in self.points]
+
+        self.assertEqual(self.transform.compile().apply_many(self.points), expected)
+        self.assertEqual(self.transform.apply_many(self.points), expected)
+        self.assertEqual(self.transform.apply_many(iter(self.points)), expected)
+        self.assertEqual(self.transform.apply_many([]), [])
+
+        with self.assertRaises(ValueError): self.transform.apply_many([[1, 2]])
+
+    def test_projective(self):
+        compiled = CompiledTransform(Matrix(rows = [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 2]]))
+        self.assertEqual(compiled.apply_many([[2, 4, 6]]), [Vector(1, 2, 3)])
+
+        compiled = CompiledTransform(Matrix(rows = [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 0]]))
+        with self.assertRaises(ValueError): compiled.apply_many([[2, 4, 6]])
+
+    @skipIf(numpy is None, "NumPy is not installed")
+    def test_apply_many_array(self):
+        points = numpy.array([list(point) for point in self.points])
+        expected = [self.transform * Vector(*point) for point in self.points]
+
+        actual = self.transform.apply_many(points)
+        self.assertIsInstance(actual, numpy.ndarray)
+        self.assertEqual(actual.shape, (4, 3))
+        self.assertAlmostEqual(actual.tolist(), [list(v) for v in expected])
+
+        # Empty and invalid arrays
+        self.assertEqual(self.transform.apply_many(numpy.zeros((0, 3))).shape, (0, 3))
+        with self.assertRaises(ValueError): self.transform.apply_many(numpy.zeros((4, 2)))
+        with self.assertRaises(ValueError): self.transform.apply_many(numpy.zeros(3))
+
+    @skipIf(numpy is None, "NumPy is not installed")
+    def test_projective_array(self):
+        compiled = CompiledTransform(Matrix(rows = [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 2]]))
+        self.assertEqual(compiled.apply_many(numpy.array([[2, 4, 6]])).tolist(), [[1, 2, 3]])
+
+    def test_repr(self):
+        self.assertRepr(Translate([1, 2, 3]).compile(),
+            "CompiledTransform(Matrix(rows=[[1, 0, 0, 1], [0, 1, 0, 2], [0, 0, 1, 3], [0, 0, 0, 1]]))")
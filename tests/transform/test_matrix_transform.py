@@ -0,0 +1,88 @@
+from tests.unit_test import TestCase
+from cadlib.transform import Chained
+from cadlib.transform.primitives import MatrixTransform, RotateXyz, ScaleAxes, Translate
+from cadlib.scad import ScadObject
+from cadlib.util import Matrix
+
+class TestMatrixTransform(TestCase):
+    def setUp(self):
+        self.matrix = Matrix(rows = [
+            [2, 0, 0, 1],
+            [0, 4, 0, 2],
+            [0, 0, 1, 3],
+            [0, 0, 0, 1],
+        ])
+
+    def test_construction(self):
+        # Valid
+        MatrixTransform(self.matrix)
+
+        # Invalid
+        with self.assertRaises(TypeError): MatrixTransform(None)
+        with self.assertRaises(TypeError): MatrixTransform(self.matrix.row_values)
+        with self.assertRaises(ValueError): MatrixTransform(Matrix.identity(3))
+        with self.assertRaises(ValueError): MatrixTransform(Matrix.zero(4))
+
+    def test_equality(self):
+        self.assertEqualToItself(MatrixTransform(self.matrix))
+        self.assertEqual(MatrixTransform(self.matrix), MatrixTransform(Matrix(rows = self.matrix.row_values)))
+        self.assertNotEqual(MatrixTransform(self.matrix), MatrixTransform(Matrix.identity(4)))
+        self.assertNotEqual(MatrixTransform(Matrix.identity(4)), Chained([]))
+
+    def test_inverse(self):
+        self.assertInverse(MatrixTransform(self.matrix), MatrixTransform(Matrix(rows = [
+            [0.5, 0   , 0, -0.5],
+            [0  , 0.25, 0, -0.5],
+            [0  , 0   , 1, -3  ],
+            [0  , 0   , 0,  1  ],
+        ])))
+
+        with self.assertRaises(ValueError):
+            MatrixTransform(Matrix(rows = [[0, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]])).inverse()
+
+    def test_to_scad(self):
+        self.assertScadObjectTarget(MatrixTransform(self.matrix), None, "multmatrix", [self.matrix.row_values], None, None)
+
+    def test_to_matrix(self):
+        self.assertEqual(MatrixTransform(self.matrix).to_matrix(), self.matrix)
+
+    def test_repr(self):
+        self.assertRepr(MatrixTransform(Matrix.identity(4)),
+            "MatrixTransform(Matrix(rows=[[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]))")
+
+    def test_str(self):
+        self.assertStr(MatrixTransform(self.matrix), "Multiply by matrix")
+
+    def test_simplified(self):
+        def simplified(transform):
+            return MatrixTransform(transform.to_matrix()).simplified(1e-9)
+
+        # Identity
+        self.assertEqual(MatrixTransform(Matrix.identity(4)).simplified(1e-9), Chained([]))
+
+        # Single transforms
+        self.assertEqual(simplified(Translate([1, 2, 3])), Translate([1, 2, 3]))
+        self.assertEqual(simplified(ScaleAxes(1, 2, 3)), ScaleAxes(1, 2, 3))
+        self.assertEqual(simplified(RotateXyz(30, 0, 0)), RotateXyz(30, 0, 0))
+        self.assertEqual(simplified(RotateXyz(0, 0, 90)), RotateXyz(0, 0, 90))
+
+        # Combinations; the rotation angles are rounded to integers
+        self.assertEqual(simplified(Translate([1, 2, 3]) * RotateXyz(10, 20, 30) * ScaleAxes(1, 2, 3)),
+            Chained([Translate([1, 2, 3]), RotateXyz(10, 20, 30), ScaleAxes(1, 2, 3)]))
+        self.assertEqual(simplified(Translate([1, 2, 3]) * RotateXyz(0, 90, 30)),
+            Chained([Translate([1, 2, 3]), RotateXyz(0, 90, 30)]))
+
+        # Not possible: shear, mirror
+        shear = MatrixTransform(Matrix(rows = [[1, 1, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]))
+        self.assertIs(shear.simplified(1e-9), shear)
+        mirror = MatrixTransform(Matrix(rows = [[-1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]))
+        self.assertIs(mirror.simplified(1e-9), mirror)
+
+        # Not within tolerance
+        almost = MatrixTransform(Translate([1, 2, 3.1]).to_matrix())
+        self.assertEqual(almost.simplified(1e-9), Translate([1, 2, 3.1]))
+        self.assertEqual(almost.simplified(0.2), Translate([1, 2, 3]))
+
+    def test_collapsed(self):
+        tf = MatrixTransform(self.matrix)
+        self.assertIs(tf.collapsed(), tf)
@@ -1,5 +1,5 @@
 from tests.unit_test import TestCase
-from cadlib.transform.primitives import RotateYpr
+from cadlib.transform.primitives import RotateYpr, RotateXyz
 from cadlib.scad import ScadObject
 from cadlib.util.geometry import affine_matrix
 from cadlib.util import X, Y, Z
@@ -102,3 +102,15 @@ class TestRotateYpr(TestCase):
 
         # 90 degrees each around all three axes
         self.assertAlmostEqual(RotateYpr(90, 90, 90).to_matrix(), affine_matrix(-X, Z, Y)) # Yaw left, pitch up, roll right
+
+    def test_collapsed(self):
+        # Single rotations are not changed
+        self.assertEqual(RotateYpr(10, 20, 0).collapsed(), RotateYpr(10, 20, 0))
+
+        # Two rotations are collapsed into a matrix
+        collapsed = RotateYpr(10, 20, 30).collapsed()
+        self.assertEqual(collapsed.to_scad(None)._id, "multmatrix")
+        self.assertAlmostEqual(collapsed.to_matrix(), RotateYpr(10, 20, 30).to_matrix())
+
+        # With a tolerance, the result is a single XYZ rotation
+        self.assertEqual(RotateYpr(90, 0, 90).collapsed(1e-9), RotateXyz(0, 90, 90))
@@ -90,3 +90,13 @@ class TestScaleAxisFactor(TestCase):
             [0  , 0  , 1, 0],
             [0  , 0  , 0, 1],
         ])
+
+    def test_collapsed(self):
+        # Scales along an axis are not changed
+        self.assertEqual(ScaleAxisFactor(Y, 2).collapsed(), ScaleAxisFactor(Y, 2))
+        self.assertEqual(ScaleAxisFactor(X+Y, 1).collapsed(), ScaleAxisFactor(X+Y, 1))
+
+        # Others are collapsed into a matrix
+        collapsed = ScaleAxisFactor(X+Y, 2).collapsed()
+        self.assertEqual(collapsed.to_scad(None)._id, "multmatrix")
+        self.assertAlmostEqual(collapsed.to_matrix(), ScaleAxisFactor(X+Y, 2).to_matrix())
@@ -29,6 +29,32 @@ class TestTransform(TestCase):
         with self.assertRaises(NotImplementedError): tf.inverse()
         with self.assertRaises(NotImplementedError): tf.to_scad(None)
         with self.assertRaises(NotImplementedError): tf.to_matrix()
+        with self.assertRaises(NotImplementedError): tf.digest()
+
+        # Transforms without a key are only equal to themselves
+        self.assertEqual(tf, tf)
+        self.assertNotEqual(tf, Transform())
+        self.assertEqual(len({tf, tf, Transform()}), 2)
+
+    def test_hash(self):
+        transforms = [
+            RotateAxisAngle(X, 30),
+            RotateFromTo(X, Y),
+            RotateXyz(10, 20, 30),
+            RotateYpr(10, 20, 30),
+            ScaleAxisFactor(X, 2),
+            ScaleUniform(2),
+            ScaleAxes (1, 2, 3),
+            Translate([1, 2, 3]),
+            Chained([Translate([1, 2, 3]), ScaleUniform(2)]),
+        ]
+
+        # Equal transforms have equal hashes
+        for tf in transforms:
+            self.assertEqual(hash(tf), hash(eval(repr(tf))))
+
+        # Transforms can be used in sets
+        self.assertEqual(len(set(transforms + [eval(repr(tf)) for tf in transforms])), len(transforms))
 
     def test_multiplication(self):
         # Create some transform
@@ -95,3 +121,60 @@ class TestTransform(TestCase):
             with self.assertRaises(TypeError): t - other
             with self.assertRaises(TypeError): other + t
             with self.assertRaises(TypeError): other - t
+
+    def test_matrix_caching(self):
+        transforms = [
+            RotateAxisAngle(X, 30),
+            RotateFromTo(X, Y),
+            RotateXyz(10, 20, 30),
+            RotateYpr(10, 20, 30),
+            ScaleAxisFactor([1, 2, 3], 2),
+            ScaleUniform(2),
+            ScaleAxes (1, 2, 3),
+            Translate([1, 2, 3]),
+            Translate([1, 2, 3]) * RotateYpr(10, 20, 30),
+        ]
+
+        for tf in transforms:
+            # The matrices are only calculated once
+            self.assertIs(tf.to_matrix(), tf.to_matrix())
+            self.assertIs(tf.inverse_matrix(), tf.inverse_matrix())
+
+            # The inverse matrix is the matrix of the inverse
+            self.assertEqual(tf.inverse_matrix(), tf.inverse().to_matrix())
+            self.assertIdentity(tf.to_matrix() * tf.inverse_matrix())
+
+        # Helper transforms are also cached
+        ypr = RotateYpr(10, 20, 30)
+        self.assertIs(ypr._equivalent(), ypr._equivalent())
+        saf = ScaleAxisFactor([1, 2, 3], 2)
+        self.assertIs(saf._equivalent(), saf._equivalent())
+
+    def test_is_identity(self):
+        self.assertTrue(Translate([0, 0, 0]).is_identity)
+        self.assertTrue(ScaleAxes(1, 1, 1).is_identity)
+        self.assertTrue(RotateFromTo(X, 2 * X).is_identity)
+        self.assertTrue(Chained([]).is_identity)
+        self.assertFalse(Translate([0, 0, 1]).is_identity)
+        self.assertFalse(RotateXyz(0, 0, 90).is_identity)
+
+    def test_folded(self):
+        # Identity transforms are replaced
+        self.assertEqual(RotateXyz(0, 0, 0).folded(), Chained([]))
+        self.assertEqual(RotateFromTo(X, X).folded(), Chained([]))
+
+        # Other transforms are not changed
+        t = RotateFromTo(X, Y)
+        self.assertIs(t.folded(), t)
+
+        # Merging
+        self.assertEqual(Translate([1, 2, 3])._fold(Translate([1, 0, 0])), Translate([2, 2, 3]))
+        self.assertEqual(ScaleUniform(2)._fold(ScaleAxes(1, 2, 3)), ScaleAxes(2, 4, 6))
+        self.assertEqual(ScaleAxes(1, 2, 3)._fold(ScaleUniform(2)), ScaleAxes(2, 4, 6))
+        self.assertEqual(RotateAxisAngle(Z, 30)._fold(RotateAxisAngle(2 * Z, 60)), RotateAxisAngle(Z, 90))
+        self.assertEqual(RotateAxisAngle(Z, 30)._fold(RotateAxisAngle(-Z, 60)), RotateAxisAngle(Z, -30))
+        self.assertEqual(RotateXyz(0, 30, 0)._fold(RotateXyz(0, 60, 0)), RotateXyz(0, 90, 0))
+        self.assertIsNone(RotateXyz(0, 30, 0)._fold(RotateXyz(0, 0, 60)))
+        self.assertIsNone(RotateXyz(10, 30, 0)._fold(RotateXyz(0, 60, 0)))
+        self.assertIsNone(RotateAxisAngle(Z, 30)._fold(RotateAxisAngle(X, 60)))
+        self.assertIsNone(Translate([1, 2, 3])._fold(ScaleUniform(2)))
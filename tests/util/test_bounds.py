@@ -0,0 +1,108 @@
+import math
+
+from cadlib.util import Bounds, Vector, X, Y, Z
+from cadlib.transform.primitives import Translate, ScaleAxes, RotateXyz
+from tests.unit_test import TestCase
+
+inf = math.inf
+
+class TestBounds(TestCase):
+    def test_construction(self):
+        bounds = Bounds([1, 2, 3], Vector(4, 5, 6))
+        self.assertEqual(bounds.minimum, Vector(1, 2, 3))
+        self.assertEqual(bounds.maximum, Vector(4, 5, 6))
+        self.assertFalse(bounds.is_empty)
+
+        # Degenerate and infinite
+        Bounds([1, 2, 3], [1, 2, 3])
+        Bounds([-inf, 2, 3], [inf, 2, 3])
+
+        # Invalid
+        with self.assertRaises(ValueError): Bounds([1, 2, 3], [4, 1, 6])
+        with self.assertRaises(ValueError): Bounds([1, 2], [4, 5])
+        with self.assertRaises(TypeError): Bounds(None, [4, 5, 6])
+
+        # Empty
+        self.assertTrue(Bounds.empty().is_empty)
+        self.assertIsNone(Bounds.empty().minimum)
+
+    def test_of_points(self):
+        self.assertEqual(Bounds.of_points([[1, 5, 3], [4, 2, 6], Vector(2, 3, 4)]), Bounds([1, 2, 3], [4, 5, 6]))
+        self.assertTrue(Bounds.of_points([]).is_empty)
+
+    def test_slab(self):
+        self.assertEqual(Bounds.slab(Z, 1, 2), Bounds([-inf, -inf, 1], [inf, inf, 2]))
+        self.assertEqual(Bounds.slab(-2 * Y, 1, 2), Bounds([-inf, -2, -inf], [inf, -1, inf]))
+        self.assertEqual(Bounds.slab(X, -inf, 2), Bounds([-inf, -inf, -inf], [2, inf, inf]))
+        self.assertEqual(Bounds.slab(X + Y, 1, 2), Bounds.infinite())
+        with self.assertRaises(ValueError): Bounds.slab([0, 0, 0], 1, 2)
+
+    def test_properties(self):
+        bounds = Bounds([1, 2, 3], [2, 4, 6])
+        self.assertEqual(bounds.size, Vector(1, 2, 3))
+        self.assertEqual(bounds.center, Vector(1.5, 3, 4.5))
+        self.assertEqual(bounds.volume, 6)
+        self.assertTrue(bounds.is_finite)
+
+        self.assertFalse(Bounds.infinite().is_finite)
+        self.assertEqual(Bounds.infinite().volume, inf)
+        self.assertEqual(Bounds([0, 0, 0], [inf, inf, 0]).volume, 0)
+
+        self.assertFalse(Bounds.empty().is_finite)
+        self.assertEqual(Bounds.empty().volume, 0)
+        self.assertIsNone(Bounds.empty().center)
+
+    def test_contains_intersects(self):
+        bounds = Bounds([0, 0, 0], [1, 1, 1])
+        self.assertTrue(bounds.contains([0.5, 0.5, 0.5]))
+        self.assertTrue(bounds.contains([1, 1, 1]))
+        self.assertFalse(bounds.contains([1, 1, 2]))
+        self.assertFalse(Bounds.empty().contains([0, 0, 0]))
+
+        self.assertTrue(bounds.intersects(Bounds([0.5, 0.5, 0.5], [2, 2, 2])))
+        self.assertTrue(bounds.intersects(Bounds([1, 1, 1], [2, 2, 2]))) # Touching
+        self.assertFalse(bounds.intersects(Bounds([1, 1, 2], [2, 2, 2])))
+        self.assertFalse(bounds.intersects(Bounds.empty()))
+
+    def test_equality(self):
+        self.assertEqual(Bounds([1, 2, 3], [4, 5, 6]), Bounds([1, 2, 3], [4, 5, 6]))
+        self.assertNotEqual(Bounds([1, 2, 3], [4, 5, 6]), Bounds([1, 2, 3], [4, 5, 7]))
+        self.assertNotEqual(Bounds([1, 2, 3], [4, 5, 6]), Bounds.empty())
+        self.assertEqual(Bounds.empty(), Bounds.empty())
+        self.assertEqual(len({Bounds([1, 2, 3], [4, 5, 6]), Bounds([1, 2, 3], [4, 5, 6]), Bounds.empty()}), 2)
+
+    def test_union_intersection(self):
+        a = Bounds([0, 0, 0], [2, 2, 2])
+        b = Bounds([1, 1, 1], [3, 3, 3])
+        c = Bounds([5, 5, 5], [6, 6, 6])
+
+        self.assertEqual(a | b, Bounds([0, 0, 0], [3, 3, 3]))
+        self.assertEqual(a | Bounds.empty(), a)
+        self.assertEqual(Bounds.empty() | a, a)
+
+        self.assertEqual(a & b, Bounds([1, 1, 1], [2, 2, 2]))
+        self.assertTrue((a & c).is_empty)
+        self.assertTrue((a & Bounds.empty()).is_empty)
+        self.assertEqual(a & Bounds.infinite(), a)
+
+    def test_transformed(self):
+        bounds = Bounds([0, 0, 0], [1, 2, 3])
+
+        self.assertEqual(bounds.transformed(Translate([1, 2, 3]).to_matrix()), Bounds([1, 2, 3], [2, 4, 6]))
+        self.assertEqual(bounds.transformed(ScaleAxes(-1, 2, 1).to_matrix()), Bounds([-1, 0, 0], [0, 4, 3]))
+
+        rotated = bounds.transformed(RotateXyz(0, 0, 90).to_matrix())
+        self.assertAlmostEqual(rotated.minimum, Vector(-2, 0, 0))
+        self.assertAlmostEqual(rotated.maximum, Vector(0, 1, 3))
+
+        # Rotating by 45° increases the size
+        rotated = Bounds([-1, -1, 0], [1, 1, 1]).transformed(RotateXyz(0, 0, 45).to_matrix())
+        self.assertAlmostEqual(rotated.maximum, Vector(math.sqrt(2), math.sqrt(2), 1))
+
+        # Infinite
+        half = Bounds([-inf, -inf, -inf], [inf, inf, 0])
+        self.assertEqual(half.transformed(Translate([1, 2, 3]).to_matrix()), Bounds([-inf, -inf, -inf], [inf, inf, 3]))
+        self.assertEqual(half.transformed(RotateXyz(0, 90, 0).to_matrix()).maximum[0], inf)
+
+        # Empty
+        self.assertTrue(Bounds.empty().transformed(Translate([1, 2, 3]).to_matrix()).is_empty)
@@ -0,0 +1,83 @@
+import math
+import random
+
+from cadlib.util import Bounds
+from cadlib.util.bvh import Bvh
+from tests.unit_test import TestCase
+
+inf = math.inf
+
+def random_bounds(rng, count):
+    result = []
+    for _ in range(count):
+        minimum = [rng.uniform(0, 100) for _ in range(3)]
+        size = [rng.uniform(0, 5) for _ in range(3)]
+        result.append(Bounds(minimum, [a + s for a, s in zip(minimum, size)]))
+    return result
+
+class TestBvh(TestCase):
+    def test_construction(self):
+        bvh = Bvh([Bounds([0, 0, 0], [1, 1, 1]), Bounds.empty(), Bounds([2, 0, 0], [3, 1, 1])])
+        self.assertEqual(len(bvh), 3)
+        self.assertEqual(bvh.bounds, Bounds([0, 0, 0], [3, 1, 1]))
+
+        self.assertEqual(len(Bvh([])), 0)
+        self.assertTrue(Bvh([]).bounds.is_empty)
+        self.assertEqual(Bvh([]).query_point([0, 0, 0]), [])
+        self.assertEqual(Bvh([]).pairs(), [])
+
+        with self.assertRaises(TypeError): Bvh([[0, 0, 0]])
+
+    def test_query_box(self):
+        bvh = Bvh([Bounds([0, 0, 0], [1, 1, 1]), Bounds.empty(), Bounds([2, 0, 0], [3, 1, 1])])
+        self.assertEqual(bvh.query_box(Bounds([0.5, 0.5, 0.5], [2.5, 0.5, 0.5])), [0, 2])
+        self.assertEqual(bvh.query_box(Bounds([1, 0, 0], [2, 0, 0])), [0, 2]) # Touching
+        self.assertEqual(bvh.query_box(Bounds([1.5, 0, 0], [1.6, 1, 1])), [])
+        self.assertEqual(bvh.query_box(Bounds.empty()), [])
+        self.assertEqual(bvh.query_box(Bounds.infinite()), [0, 2])
+
+    def test_query_point(self):
+        bvh = Bvh([Bounds([0, 0, 0], [2, 2, 2]), Bounds([1, 1, 1], [3, 3, 3]), Bounds.slab([0, 0, 1], -inf, 0)])
+        self.assertEqual(bvh.query_point([0.5, 0.5, 0.5]), [0])
+        self.assertEqual(bvh.query_point([1.5, 1.5, 1.5]), [0, 1])
+        self.assertEqual(bvh.query_point([100, -100, -5]), [2])
+        self.assertEqual(bvh.query_point([0, 0, 0]), [0, 2])
+        self.assertEqual(bvh.query_point([5, 5, 5]), [])
+
+    def test_query_ray(self):
+        bvh = Bvh([Bounds([4, 0, 0], [5, 1, 1]), Bounds([2, 0, 0], [3, 1, 1]), Bounds([-3, 0, 0], [-2, 1, 1])])
+
+        # Ordered by distance
+        self.assertEqual(bvh.query_ray([0, 0.5, 0.5], [1, 0, 0]), [1, 0])
+        self.assertEqual(bvh.query_ray([0, 0.5, 0.5], [-1, 0, 0]), [2])
+        self.assertEqual(bvh.query_ray([2.5, 0.5, 0.5], [1, 0, 0]), [1, 0]) # Starting inside
+        self.assertEqual(bvh.query_ray([0, 0.5, 0.5], [1, 0, 0], max_distance = 3), [1])
+        self.assertEqual(bvh.query_ray([0, 0.5, 0.5], [0, 1, 0]), [])
+        self.assertEqual(bvh.query_ray([0, 2, 0.5], [1, 0, 0]), [])
+
+        # Diagonal
+        self.assertEqual(bvh.query_ray([0, -2, 0.5], [1, 1, 0]), [1])
+
+        with self.assertRaises(ValueError): bvh.query_ray([0, 0, 0], [0, 0, 0])
+
+    def test_pairs(self):
+        bvh = Bvh([Bounds([0, 0, 0], [2, 2, 2]), Bounds([1, 1, 1], [3, 3, 3]),
+                   Bounds([5, 5, 5], [6, 6, 6]), Bounds([2, 2, 2], [4, 4, 4]), Bounds.empty()])
+        self.assertEqual(bvh.pairs(), [(0, 1), (0, 3), (1, 3)])
+
+    def test_random(self):
+        # Compare to a linear scan
+        rng = random.Random(0)
+        bounds = random_bounds(rng, 300)
+        bvh = Bvh(bounds)
+
+        for query in random_bounds(rng, 20):
+            self.assertEqual(bvh.query_box(query), [i for i, b in enumerate(bounds) if b.intersects(query)])
+
+        for _ in range(20):
+            point = [rng.uniform(0, 100) for _ in range(3)]
+            self.assertEqual(bvh.query_point(point), [i for i, b in enumerate(bounds) if b.contains(point)])
+
+        self.assertEqual(bvh.pairs(), [(i, j)
+            for i in range(len(bounds)) for j in range(i + 1, len(bounds))
+            if bounds[i].intersects(bounds[j])])
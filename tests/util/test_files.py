@@ -0,0 +1,52 @@
+import os
+import stat
+from tempfile import TemporaryDirectory
+
+from cadlib.util.files import replacing
+from tests.unit_test import TestCase
+
+class TestFiles(TestCase):
+    def setUp(self):
+        self.temporary_directory = TemporaryDirectory()
+        self.file_name = os.path.join(self.temporary_directory.name, "file.txt")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def read(self):
+        with open(self.file_name) as file:
+            return file.read()
+
+    def test_replacing(self):
+        # New file
+        with replacing(self.file_name) as file:
+            file.write("first")
+            self.assertFalse(os.path.exists(self.file_name))
+        self.assertEqual(self.read(), "first")
+
+        # Existing file, the permissions are kept
+        os.chmod(self.file_name, 0o640)
+        with replacing(self.file_name, "wb") as file:
+            file.write(b"second")
+        self.assertEqual(self.read(), "second")
+        self.assertEqual(stat.S_IMODE(os.stat(self.file_name).st_mode), 0o640)
+
+        self.assertEqual(os.listdir(self.temporary_directory.name), ["file.txt"])
+
+    def test_failure(self):
+        with open(self.file_name, "w") as file:
+            file.write("previous")
+
+        with self.assertRaises(ValueError):
+            with replacing(self.file_name) as file:
+                file.write("partial")
+                raise ValueError()
+
+        self.assertEqual(self.read(), "previous")
+        self.assertEqual(os.listdir(self.temporary_directory.name), ["file.txt"])
+
+    def test_special_file(self):
+        # Written directly rather than replaced
+        with replacing(os.devnull) as file:
+            file.write("data")
+        self.assertFalse(os.path.isfile(os.devnull))
@@ -1,4 +1,5 @@
-from cadlib.util.matrix import Matrix
+from cadlib.util.matrix import Matrix, Matrix4
+from cadlib.util import matrix
 from tests.unit_test import TestCase
 from cadlib.util.vector import Vector, X, Y, Z
 from cadlib.util.geometry import affine_matrix
@@ -147,6 +148,15 @@ class TestMatrix(TestCase):
         self.assertNotEqual(m1, "one")
         self.assertNotEqual(m1, [[1, 2], [3, 4]])
 
+    def test_hash(self):
+        m1 = Matrix(rows = [[1, 2], [3, 4]])
+        m2 = Matrix(rows = [[1, 2], [3, 4]])
+        m3 = Matrix(rows = [[1, 2], [3, 5]])
+
+        self.assertEqual(hash(m1), hash(m2))
+        self.assertEqual(hash(Matrix4.identity(4)), hash(Matrix.identity(4)))
+        self.assertEqual(len({m1, m2, m3}), 2)
+
     def test_dimensions(self):
         m = Matrix()
         self.assertEqual(m.row_count, 0)
@@ -354,3 +364,66 @@ class TestMatrix(TestCase):
             with self.assertRaises(TypeError): invalid * m
             with self.assertRaises(TypeError): m / invalid
             with self.assertRaises(TypeError): invalid / m
+
+
+class TestMatrixBackend(TestCase):
+    def tearDown(self):
+        matrix.set_backend("python")
+
+    def test_default_backend(self):
+        self.assertEqual(matrix.get_backend(), "python")
+        self.assertIs(type(matrix.create([[1, 2], [3, 4]])), Matrix)
+        self.assertIs(type(matrix.identity(3)), Matrix)
+        self.assertEqual(matrix.create([[1, 2], [3, 4]]), Matrix(rows = [[1, 2], [3, 4]]))
+        self.assertEqual(matrix.identity(3), Matrix.identity(3))
+
+    def test_invalid_backend(self):
+        with self.assertRaises(ValueError): matrix.set_backend("fortran")
+        self.assertEqual(matrix.get_backend(), "python")
+
+
+class TestMatrix4(TestCase):
+    def setUp(self):
+        self.m1 = Matrix4(rows = [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [0, 0, 0, 1]])
+        self.m2 = Matrix4(rows = [[2, 0, 1, 0], [0, 3, 0, 1], [1, 0, 2, 0], [0, 0, 0, 1]])
+
+    def test_construction(self):
+        self.assertIs(type(matrix.identity(4)), Matrix4)
+        self.assertIs(type(matrix.create([[1, 0, 0, 0]] * 4)), Matrix4)
+        self.assertEqual(Matrix4.identity(4), Matrix.identity(4))
+
+        with self.assertRaises(ValueError): Matrix4(rows = [[1, 2], [3, 4]])
+        with self.assertRaises(TypeError): Matrix4(rows = [["1", 0, 0, 0]] * 4)
+
+    def test_arithmetic(self):
+        p1 = Matrix(rows = self.m1.row_values)
+        p2 = Matrix(rows = self.m2.row_values)
+
+        # Same results as Matrix
+        for result, expected in [
+                (self.m1 * self.m2    , p1 * p2),
+                (self.m1 + self.m2    , p1 + p2),
+                (self.m1 - self.m2    , p1 - p2),
+                (-self.m1             , -p1),
+                (self.m1 * 2          , p1 * 2),
+                (2 * self.m1          , 2 * p1),
+                (self.m1.transpose()  , p1.transpose())]:
+            self.assertIs(type(result), Matrix4)
+            self.assertEqual(result, expected)
+
+        # Mixed with Matrix
+        self.assertEqual(self.m1 * p2, p1 * p2)
+        self.assertEqual(p1 * self.m2, p1 * p2)
+        with self.assertRaises(ValueError): self.m1 * Matrix.identity(3)
+
+    def test_homogeneous_multiplication(self):
+        p1 = Matrix(rows = self.m1.row_values)
+        v = Vector(1, -2, 3)
+        self.assertEqual(self.m1.homogeneous_mul(v), p1.homogeneous_mul(v))
+
+        # Projective
+        m = Matrix4(rows = [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 2]])
+        self.assertEqual(m.homogeneous_mul(Vector(2, 4, 6)), Vector(1, 2, 3))
+
+        m = Matrix4(rows = [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 0]])
+        with self.assertRaises(ValueError): m.homogeneous_mul(Vector(1, 2, 3))
@@ -0,0 +1,185 @@
+from unittest import skipIf
+
+from tests.unit_test import TestCase
+from cadlib.util.matrix import Matrix, Matrix4
+from cadlib.util import matrix
+from cadlib.util.vector import Vector, X, Y, Z
+from cadlib.transform.primitives import RotateAxisAngle, RotateYpr, ScaleAxisFactor, Translate
+
+try:
+    from cadlib.util.numpy_matrix import NumpyMatrix
+except ImportError:
+    NumpyMatrix = None
+
+@skipIf(NumpyMatrix is None, "NumPy is not installed")
+class TestNumpyMatrix(TestCase):
+    def test_construction(self):
+        self.assertEqual(NumpyMatrix().row_values, [])
+        self.assertEqual(NumpyMatrix(rows    = [[1, 2, 3], [4, 5, 6]]).row_values, [[1, 2, 3], [4, 5, 6]])
+        self.assertEqual(NumpyMatrix(columns = [[1, 2, 3], [4, 5, 6]]).row_values, [[1, 4], [2, 5], [3, 6]])
+        self.assertEqual(NumpyMatrix(rows = [Vector(1, 2), Vector(3, 4)]).row_values, [[1, 2], [3, 4]])
+
+        # Values are stored as float
+        self.assertIs(type(NumpyMatrix(rows = [[1]])[0, 0]), float)
+        self.assertIs(type(NumpyMatrix(rows = [[1]]).row_values[0][0]), float)
+
+        # Same checks as Matrix
+        with self.assertRaises(TypeError): NumpyMatrix(rows = [[1]], columns = [[1]])
+        with self.assertRaises(ValueError): NumpyMatrix(rows = [[1, 2], [3, 4, 5]])
+        with self.assertRaises(TypeError): NumpyMatrix(rows = [[1, 2], [3, "x"]])
+        with self.assertRaises(TypeError): NumpyMatrix(rows = [1])
+
+    def test_identity_and_zero(self):
+        self.assertEqual(NumpyMatrix.identity(2).row_values, [[1, 0], [0, 1]])
+        self.assertEqual(NumpyMatrix.zero(2).row_values, [[0, 0], [0, 0]])
+        self.assertIsInstance(NumpyMatrix.identity(2), NumpyMatrix)
+
+    def test_properties(self):
+        m = NumpyMatrix(rows = [[1, 2, 3], [4, 5, 6]])
+        self.assertEqual(m.dimensions, (2, 3))
+        self.assertEqual(m[1, 2], 6)
+        self.assertEqual(m[-1, -3], 4)
+        self.assertEqual(m.column_values, [[1, 4], [2, 5], [3, 6]])
+        with self.assertRaises(IndexError): m[2, 0]
+        with self.assertRaises(TypeError): m[0]
+
+    def test_immutability(self):
+        m = NumpyMatrix(rows = [[1, 2], [3, 4]])
+        m.row_values[0][0] = 0
+        self.assertEqual(m.row_values, [[1, 2], [3, 4]])
+
+    def test_equality(self):
+        m1 = NumpyMatrix(rows = [[1, 2], [3, 4]])
+
+        self.assertEqual(m1, NumpyMatrix(rows = [[1, 2], [3, 4]]))
+        self.assertNotEqual(m1, NumpyMatrix(rows = [[1, 2], [3, 5]]))
+        self.assertNotEqual(m1, NumpyMatrix(rows = [[1, 2, 3], [4, 5, 6]]))
+        self.assertNotEqual(m1, None)
+        self.assertNotEqual(m1, [[1, 2], [3, 4]])
+
+        # Mixed with Matrix, in both orders
+        self.assertEqual(m1, Matrix(rows = [[1, 2], [3, 4]]))
+        self.assertEqual(Matrix(rows = [[1, 2], [3, 4]]), m1)
+        self.assertNotEqual(Matrix(rows = [[1, 2], [3, 5]]), m1)
+
+    def test_hash(self):
+        # Consistent with Matrix
+        m1 = NumpyMatrix(rows = [[1, 2], [3, 4]])
+        self.assertEqual(hash(m1), hash(NumpyMatrix(rows = [[1, 2], [3, 4]])))
+        self.assertEqual(hash(m1), hash(Matrix(rows = [[1, 2], [3, 4]])))
+        self.assertEqual(len({m1, Matrix(rows = [[1, 2], [3, 4]])}), 1)
+
+    def test_arithmetic(self):
+        m1 = NumpyMatrix(rows = [[1, 2], [3, 4]])
+        m2 = NumpyMatrix(rows = [[5, 6], [7, 8]])
+        p2 = Matrix(rows = [[5, 6], [7, 8]])
+
+        self.assertEqual(m1.transpose(), Matrix(rows = [[1, 3], [2, 4]]))
+        self.assertEqual(-m1, Matrix(rows = [[-1, -2], [-3, -4]]))
+        self.assertEqual(m1 + m2, Matrix(rows = [[6, 8], [10, 12]]))
+        self.assertEqual(m1 - m2, Matrix(rows = [[-4, -4], [-4, -4]]))
+        self.assertEqual(m1 * m2, Matrix(rows = [[19, 22], [43, 50]]))
+        self.assertEqual(m1 * 2, Matrix(rows = [[2, 4], [6, 8]]))
+        self.assertEqual(2 * m1, Matrix(rows = [[2, 4], [6, 8]]))
+        self.assertEqual(m1 / 2, Matrix(rows = [[0.5, 1], [1.5, 2]]))
+
+        # Mixed with Matrix, in both orders; the result is a NumpyMatrix
+        for result, expected in [
+                (m1 + p2, [[6, 8], [10, 12]]),
+                (p2 + m1, [[6, 8], [10, 12]]),
+                (m1 - p2, [[-4, -4], [-4, -4]]),
+                (p2 - m1, [[4, 4], [4, 4]]),
+                (m1 * p2, [[19, 22], [43, 50]]),
+                (p2 * m1, [[23, 34], [31, 46]])]:
+            self.assertIsInstance(result, NumpyMatrix)
+            self.assertEqual(result.row_values, expected)
+
+        # Dimension mismatch
+        with self.assertRaises(ValueError): m1 + NumpyMatrix.identity(3)
+        with self.assertRaises(ValueError): m1 * NumpyMatrix.identity(3)
+        with self.assertRaises(ValueError): Matrix.identity(3) * m1
+
+        # Invalid
+        with self.assertRaises(ZeroDivisionError): m1 / 0
+        for invalid in [None, ""]:
+            with self.assertRaises(TypeError): m1 * invalid
+            with self.assertRaises(TypeError): invalid * m1
+            with self.assertRaises(TypeError): m1 + invalid
+
+    def test_vector_multiplication(self):
+        m = NumpyMatrix(rows = [[1, 2], [3, 4]])
+        self.assertEqual(m * Vector(1, 1), Vector(3, 7))
+        with self.assertRaises(TypeError): Vector(1, 1) * m
+
+    def test_homogeneous_multiplication(self):
+        # Swap X and Y axes and translate by <2, 3, 4>
+        m = NumpyMatrix(rows = [[0, 1, 0, 2], [1, 0, 0, 3], [0, 0, 1, 4], [0, 0, 0, 1]])
+
+        self.assertEqual(m.homogeneous_mul(Vector ( 0,  0,  0)), Vector ( 2,  3,  4))
+        self.assertEqual(m.homogeneous_mul(Vector (10, 20, 30)), Vector (22, 13, 34))
+        with self.assertRaises(ValueError): m.homogeneous_mul(Vector(1, 2))
+
+    def test_io(self):
+        m = NumpyMatrix(rows=[[1, 2], [-4, 0.5]])
+        self.assertRepr(m, "NumpyMatrix(rows=[[1.0, 2.0], [-4.0, 0.5]])")
+        self.assertLines(m.format(), [
+            " 1.0 2.0",
+            "-4.0 0.5",
+        ])
+
+
+@skipIf(NumpyMatrix is None, "NumPy is not installed")
+class TestNumpyBackend(TestCase):
+    def tearDown(self):
+        matrix.set_backend("python")
+
+    def test_set_backend(self):
+        matrix.set_backend("numpy")
+        self.assertEqual(matrix.get_backend(), "numpy")
+        self.assertIsInstance(matrix.create([[1, 2], [3, 4]]), NumpyMatrix)
+        self.assertIsInstance(matrix.identity(4), NumpyMatrix)
+
+    def test_transform_matrices(self):
+        # Transforms cache their matrices, so we need new transforms for each
+        # backend
+        def transforms():
+            return [
+                RotateAxisAngle(X + Y, 30),
+                RotateYpr(10, 20, 30),
+                ScaleAxisFactor([1, 2, 3], 2),
+                Translate([1, 2, 3]) * RotateYpr(10, 20, 30) * ScaleAxisFactor(Z, 3),
+            ]
+
+        expected = [tf.to_matrix() for tf in transforms()]
+        matrix.set_backend("numpy")
+        actual = [tf.to_matrix() for tf in transforms()]
+
+        for a, e in zip(actual, expected):
+            self.assertIsInstance(a, NumpyMatrix)
+            self.assertAlmostEqual(a, e)
+
+        # Transforming vectors
+        self.assertAlmostEqual(transforms()[3] * Vector(1, 2, 3), expected[3].homogeneous_mul(Vector(1, 2, 3)))
+
+    def test_mixed_matrix4(self):
+        # Matrix4 (created by the Python backend) and NumpyMatrix can be mixed
+        # in both orders
+        m4 = Translate([1, 2, 3]).to_matrix()
+        self.assertIsInstance(m4, Matrix4)
+        n4 = NumpyMatrix(rows = m4.row_values)
+
+        self.assertEqual(m4, n4)
+        self.assertEqual(n4, m4)
+        self.assertIsInstance(m4 * n4, NumpyMatrix)
+        self.assertEqual((m4 * n4).row_values, (m4 * m4).row_values)
+        self.assertEqual((n4 * m4).row_values, (m4 * m4).row_values)
+        self.assertEqual((m4 + n4).row_values, (m4 + m4).row_values)
+        self.assertEqual((m4 - n4).row_values, Matrix4.zero(4).row_values)
+
+        # A chained transform whose matrix was created before switching the
+        # backend is extended eagerly
+        chained = Translate([1, 0, 0]) * Translate([0, 1, 0])
+        chained.to_matrix()
+        matrix.set_backend("numpy")
+        extended = chained * Translate([0, 0, 1])
+        self.assertEqual(extended.to_matrix(), Translate([1, 1, 1]).to_matrix())
@@ -0,0 +1,108 @@
+import cadlib
+from cadlib.object.primitives import Sphere, Cuboid
+from cadlib.scad.scad_object import ScadObject
+from cadlib.transform.primitives import Translate
+from cadlib.util.profile import profile
+from tests.unit_test import TestCase
+
+class TestProfile(TestCase):
+    def part(self):
+        return (Translate([1, 2, 3]) * Sphere(2) + Cuboid(1, 2, 3) + Sphere(3)) - Sphere(1)
+
+    def test_entries(self):
+        part = self.part()
+        with profile() as report:
+            code = part.to_scad().to_code()
+
+        entries = report.entries
+        self.assertEqual(entries["Sphere.to_scad"].calls, 3)
+        self.assertEqual(entries["Cuboid.to_scad"].calls, 1)
+        self.assertEqual(entries["Difference.to_scad"].calls, 1)
+        self.assertEqual(entries["Union._combine_scad"].calls, 1)
+        self.assertEqual(entries["Translate.to_scad"].calls, 1)
+        self.assertEqual(entries["ScadObject[sphere]._head_lines"].calls, 3)
+        self.assertEqual(entries["ScadObject[difference]._lines"].calls, 1)
+
+        # Nested time is included in the total time
+        self.assertGreaterEqual(entries["Difference.to_scad"].total_time, entries["Sphere.to_scad"].total_time)
+        self.assertLess(entries["Difference.to_scad"].self_time, entries["Difference.to_scad"].total_time)
+
+        # Each line is attributed to the object that generated it
+        self.assertEqual(report.output_bytes, len(code) + 1)
+        self.assertEqual(entries["ScadObject[sphere]._head_lines"].output_bytes,
+                         sum(len(line) + 1 for line in code.split("\n") if "sphere" in line))
+
+    def test_subtrees(self):
+        with profile() as report:
+            (Sphere(1) + (Sphere(2) + Cuboid(1, 1, 1) - Sphere(1))).to_scad()
+
+        # All functions are within the subtree of the root, and the self times
+        # of the subtree add up to the time of the root
+        root = ("Union.to_scad", )
+        self.assertTrue(all(stack[:1] == root for stack in report.stacks))
+        self.assertAlmostEqual(sum(entry.self_time for entry in report.stacks.values()),
+                               report.entries["Union.to_scad"].total_time)
+
+        self.assertIn(("Union.to_scad", "Union._combine_scad", "Difference._combine_scad", "Union._combine_scad",
+                       "Cuboid._combine_scad", "Cuboid.to_scad"), report.stacks)
+
+    def test_stacks(self):
+        part = self.part()
+        with profile() as report:
+            part.to_scad()
+
+        # The operands are converted without recursion, but the stacks follow
+        # the tree
+        difference = ("Difference.to_scad", "Difference._combine_scad")
+        union = difference + ("Union._combine_scad", )
+        self.assertEqual(report.stacks[union + ("Transformed._combine_scad", "Translate.to_scad")].calls, 1)
+        self.assertEqual(report.stacks[union + ("Sphere._combine_scad", "Sphere.to_scad")].calls, 1)
+        self.assertEqual(report.stacks[difference + ("Sphere._combine_scad", "Sphere.to_scad")].calls, 1)
+
+        with profile() as report:
+            part.to_scad().to_code()
+        self.assertIn(("ScadObject[difference]._lines", "ScadObject[difference]._head_lines",
+                       "ScadObject[union]._head_lines", "ScadObject[translate]._head_lines",
+                       "ScadObject[sphere]._head_lines"), report.stacks)
+
+        for line in report.collapsed_stacks().split("\n"):
+            names, value = line.rsplit(" ", 1)
+            self.assertIn(tuple(names.split(";")), report.stacks)
+            self.assertGreater(int(value), 0)
+
+    def test_report(self):
+        with profile() as report:
+            self.part().to_scad().to_code()
+
+        data = report.to_dict()
+        self.assertEqual(len(data["functions"]), len(report.entries))
+        self.assertEqual(len(data["stacks"]), len(report.stacks))
+        times = [function["total_time"] for function in data["functions"]]
+        self.assertEqual(times, sorted(times, reverse = True))
+        self.assertEqual(set(data["functions"][0]),
+                         {"name", "calls", "total_time", "self_time", "output_bytes", "allocated_blocks"})
+
+        lines = report.format(limit = 3).split("\n")
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith("Function"))
+
+    def test_restore(self):
+        to_scad = Sphere.to_scad
+        iter_lines = ScadObject._iter_lines
+
+        with profile():
+            self.assertIsNot(Sphere.to_scad, to_scad)
+            with self.assertRaises(RuntimeError):
+                with profile(): pass
+
+        self.assertIs(Sphere.to_scad, to_scad)
+        self.assertIs(ScadObject._iter_lines, iter_lines)
+
+        # The results are unchanged
+        part = self.part()
+        with profile():
+            code = part.to_scad().to_code()
+        self.assertEqual(code, part.to_scad().to_code())
+
+    def test_package(self):
+        self.assertIs(cadlib.profile, profile)
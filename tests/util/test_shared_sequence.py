@@ -0,0 +1,80 @@
+import pickle
+import threading
+
+from cadlib.util import shared_sequence
+from cadlib.util.shared_sequence import SharedSequence
+from tests.unit_test import TestCase
+
+class TestSharedSequence(TestCase):
+    def test_construction(self):
+        self.assertEqual(SharedSequence([1, 2, 3]).to_list(), [1, 2, 3])
+        self.assertEqual(SharedSequence(x for x in range(3)).to_list(), [0, 1, 2])
+        self.assertEqual(len(SharedSequence()), 0)
+
+        # The items are copied
+        items = [1, 2]
+        sequence = SharedSequence(items)
+        items.append(3)
+        self.assertEqual(sequence.to_list(), [1, 2])
+
+    def test_extended(self):
+        a = SharedSequence([1, 2])
+        b = a.appended(3)
+        c = b.extended([4, 5])
+        self.assertEqual(a.to_list(), [1, 2])
+        self.assertEqual(b.to_list(), [1, 2, 3])
+        self.assertEqual(c.to_list(), [1, 2, 3, 4, 5])
+
+        # The storage is shared
+        self.assertIs(a._items, c._items)
+
+        # Extending an older sequence does not affect the newer ones
+        d = a.appended(6)
+        self.assertEqual(d.to_list(), [1, 2, 6])
+        self.assertEqual(b.to_list(), [1, 2, 3])
+        self.assertEqual(c.to_list(), [1, 2, 3, 4, 5])
+
+        # Extending with itself
+        self.assertEqual(c.extended(c).to_list(), [1, 2, 3, 4, 5] * 2)
+
+    def test_threads(self):
+        # The check-and-append is done while holding the lock, so threads that
+        # extend the same sequence don't see each other's items
+        parent = SharedSequence([0])
+        results = []
+        thread = threading.Thread(target = lambda: results.append(parent.appended(1)))
+
+        with shared_sequence._lock:
+            thread.start()
+            thread.join(0.1)
+            self.assertTrue(thread.is_alive())
+        thread.join()
+
+        self.assertEqual(results[0].to_list(), [0, 1])
+        self.assertEqual(parent.to_list(), [0])
+
+    def test_sequence(self):
+        a = SharedSequence([1, 2])
+        b = a.appended(3)
+
+        self.assertEqual(len(a), 2)
+        self.assertEqual(list(a), [1, 2])
+        self.assertEqual(a[1], 2)
+        self.assertEqual(a[-1], 2)
+        self.assertEqual(b[1:], [2, 3])
+        with self.assertRaises(IndexError): a[2]
+        with self.assertRaises(IndexError): a[-3]
+
+    def test_comparison(self):
+        a = SharedSequence([1, 2])
+        self.assertEqual(a, SharedSequence([1, 2]))
+        self.assertEqual(a.appended(3), SharedSequence([1, 2, 3]))
+        self.assertNotEqual(a, a.appended(3))
+        self.assertEqual(hash(a), hash(SharedSequence([1, 2])))
+
+    def test_pickle(self):
+        a = SharedSequence([1, 2])
+        a.appended(3)
+        b = pickle.loads(pickle.dumps(a))
+        self.assertEqual(b.to_list(), [1, 2])
+        self.assertEqual(b._items, [1, 2])
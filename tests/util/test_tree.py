@@ -1,6 +1,7 @@
+import sys
 import unittest
 
-from cadlib.util.tree import Node
+from cadlib.util.tree import Node, reduce_tree
 
 class TestTree(unittest.TestCase):
     def test_construction(self):
@@ -59,3 +60,41 @@ class TestTree(unittest.TestCase):
             "    '-- 5\n"
             "        '-- 6"
          )
+
+    def test_lines(self):
+        tree = Node(1, [Node(2, [Node(3)]), Node(4)])
+        self.assertEqual(tree.lines(), ["1", "|-- 2", "|   '-- 3", "'-- 4"])
+        self.assertEqual(list(tree.iter_lines("  ", "> ")), ["> 1", ">   2", ">     3", ">   4"])
+
+    def test_deep(self):
+        depth = 5 * sys.getrecursionlimit()
+
+        tree = Node(depth)
+        for data in reversed(range(depth)):
+            tree = Node(data, [tree, Node("leaf")])
+
+        lines = tree.lines("")
+        self.assertEqual(len(lines), 2 * depth + 1)
+        self.assertEqual(lines[:4], ["0", "1", "2", "3"])
+        self.assertEqual(lines[depth:depth + 2], [str(depth), "leaf"])
+
+        lines = tree.lines()
+        self.assertEqual(lines[depth], "|   " * (depth - 1) + "|-- " + str(depth))
+        self.assertEqual(lines[depth + 1], "|   " * (depth - 1) + "'-- leaf")
+        self.assertEqual(lines[-1], "'-- leaf")
+
+    def test_reduce_tree(self):
+        tree = Node(1, [Node(2, [Node(3), Node(4)]), Node(5)])
+        children = lambda node: node._children
+
+        # Post-order, with the values of the children in order
+        self.assertEqual(reduce_tree(tree, children, lambda node, values: [node._data, values]),
+                         [1, [[2, [[3, []], [4, []]]], [5, []]]])
+        self.assertEqual(reduce_tree(tree, children, lambda node, values: node._data + sum(values)), 15)
+
+        # Deep tree
+        depth = 5 * sys.getrecursionlimit()
+        tree = Node(0)
+        for _ in range(depth):
+            tree = Node(1, [tree])
+        self.assertEqual(reduce_tree(tree, children, lambda node, values: node._data + sum(values)), depth)
@@ -1,5 +1,5 @@
 from cadlib.util import degree
-from cadlib.util.vector import Vector, X, Y, Z
+from cadlib.util.vector import Vector, Vector3, X, Y, Z
 from cadlib.util.matrix import Matrix
 from tests.unit_test import TestCase
 
@@ -168,6 +168,11 @@ class TestVector(TestCase):
         self.assertNotEqual(v, (1, 2, 3))
         self.assertNotEqual(v, "one")
 
+    def test_hash(self):
+        self.assertEqual(hash(Vector(1, 2, 3)), hash(Vector(1.0, 2.0, 3.0)))
+        self.assertEqual(hash(Vector(1, 2)), hash(Vector(1, 2)))
+        self.assertEqual(len({Vector(1, 2, 3), Vector(1, 2, 3), Vector(1, 2, 4)}), 2)
+
     def test_negation(self):
         v = Vector(1, 2, 3)
         self.assertEqual(-v, Vector(-1, -2, -3))
@@ -519,3 +524,53 @@ class TestVector(TestCase):
         self.assertEqual(Vector(1, 2, 3, 1).inhomogeneous(), Vector(1, 2, 3))
         self.assertEqual(Vector(2, 4, 6, 2).inhomogeneous(), Vector(1, 2, 3))
         with self.assertRaises(ValueError): Vector(1, 2, 3, 0).inhomogeneous()
+
+
+class TestVector3(TestCase):
+    def test_construction(self):
+        # Vectors with 3 elements are Vector3
+        self.assertIs(type(Vector(1, 2, 3)), Vector3)
+        self.assertIs(type(Vector.convert([1, 2, 3], "dummy")), Vector3)
+        self.assertIs(type(Vector(1, 2)), Vector)
+        self.assertIs(type(Vector(1, 2, 3, 4)), Vector)
+        self.assertIs(type(X), Vector3)
+
+        # Values are still checked
+        with self.assertRaises(TypeError): Vector(1, 2, "3")
+        with self.assertRaises(TypeError): Vector3(1, 2, None)
+        with self.assertRaises(TypeError): Vector3(1, 2)
+
+        # Equal to other vectors with the same values
+        self.assertEqual(Vector3(1, 2, 3), Vector(1, 2, 3))
+        self.assertNotEqual(Vector3(1, 2, 3), Vector(1, 2, 3, 4))
+
+    def test_arithmetic(self):
+        a = Vector(1, 2, 3)
+        b = Vector(4, -5, 6)
+
+        for result, expected in [
+                (a + b      , [5, -3, 9]),
+                (a - b      , [-3, 7, -3]),
+                (-a         , [-1, -2, -3]),
+                (a * 2      , [2, 4, 6]),
+                (2 * a      , [2, 4, 6]),
+                (a / 2      , [0.5, 1, 1.5]),
+                (a.cross(b) , [27, 6, -13])]:
+            self.assertIs(type(result), Vector3)
+            self.assertEqual(list(result), expected)
+
+        self.assertEqual(a.dot(b), 12)
+        self.assertEqual(a.length_squared, 14)
+        self.assertFalse(a.is_zero)
+        self.assertTrue(Vector(0, 0, 0).is_zero)
+
+        # Results are new vectors
+        self.assertEqual(list(a), [1, 2, 3])
+
+        # Mixed with a different dimension
+        with self.assertRaises(ValueError): a + Vector(1, 2)
+        with self.assertRaises(ValueError): a - Vector(1, 2)
+        with self.assertRaises(ValueError): a.dot(Vector(1, 2))
+        with self.assertRaises(ValueError): a.cross(Vector(1, 2))
+        with self.assertRaises(TypeError): a + 1
+        with self.assertRaises(TypeError): a * "x"